@@ -12,10 +12,16 @@ setup(
     install_requires=[
         "mcp>=1.2.0",
     ],
+    extras_require={
+        "mixer": ["numpy>=1.20"],
+    },
     python_requires=">=3.10",
     entry_points={
         "console_scripts": [
             "mcp-sound-tool=sound_tool.server:main",
+            "mcp-sound-tool-bank=sound_tool.soundbank:main",
+            "mcp-sound-tool-bench=sound_tool.bench:main",
+            "mcp-sound-tool-daemon=sound_tool.daemon:main",
         ],
     },
     classifiers=[
@@ -4,6 +4,15 @@ Sound tool MCP server for Cursor and other MCP-compatible IDEs.
 This package provides sound effects to enhance the coding experience.
 """
 
-from .server import main
+# Imported first so startup timing includes every other import
+from . import startup
 
-__version__ = "0.1.0" 
\ No newline at end of file
+__version__ = "0.1.0"
+
+
+def __getattr__(name):
+    # Importing the server pulls in the whole MCP stack, so only do it when needed
+    if name == "main":
+        from .server import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
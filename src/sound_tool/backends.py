@@ -0,0 +1,132 @@
+"""
+Registry of command-line audio player backends for Linux.
+
+Players are probed once with shutil.which, and each file is handed to the
+fastest installed player that can decode its format. Third-party packages
+can add backends through the "mcp_sound_tool.backends" entry point group;
+each entry point should resolve to a Backend or a callable returning one or
+more Backends.
+"""
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+ENTRY_POINT_GROUP = "mcp_sound_tool.backends"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Backend:
+    """A command-line player and the formats it can play."""
+
+    name: str
+    command: Tuple[str, ...]
+    formats: FrozenSet[str]
+    # Lower values are preferred when several backends can play a file
+    priority: int = 50
+
+    def argv(self, sound_file: str) -> List[str]:
+        """Command line that plays the given file."""
+        return list(self.command) + [sound_file]
+
+    def supports(self, fmt: str) -> bool:
+        return fmt in self.formats
+
+
+DEFAULT_BACKENDS = (
+    Backend("paplay", ("paplay",), frozenset({"wav", "ogg", "flac"}), 10),
+    Backend("aplay", ("aplay", "-q"), frozenset({"wav"}), 20),
+    Backend("mpg123", ("mpg123", "-q"), frozenset({"mp3"}), 30),
+    Backend("mpg321", ("mpg321", "-q"), frozenset({"mp3"}), 40),
+    Backend("ffplay", ("ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"),
+            frozenset({"mp3", "wav", "ogg", "flac"}), 60),
+    # paplay reads MP3 only with libsndfile 1.1 or later, so it is the last resort
+    # for MP3, but on stock desktop installs it is often the only player there is
+    Backend("paplay-mp3", ("paplay",), frozenset({"mp3"}), 90),
+)
+
+
+def file_format(sound_file: str) -> str:
+    """Lower-case file extension without the dot."""
+    return os.path.splitext(sound_file)[1].lower().lstrip(".")
+
+
+def _entry_points(group: str):
+    from importlib import metadata
+    eps = metadata.entry_points()
+    if hasattr(eps, "select"):
+        return eps.select(group=group)
+    # Python < 3.10 returns a dict of group name to entry points
+    return eps.get(group, [])
+
+
+class BackendRegistry:
+    """Known backends and which of them are installed on this machine."""
+
+    def __init__(self, backends: Iterable[Backend] = DEFAULT_BACKENDS,
+                 entry_points: bool = False):
+        """
+        Create a registry of backends.
+
+        With entry_points, backends published by installed packages are
+        loaded on the first probe rather than up front, since scanning the
+        installed packages is slow.
+        """
+        self._backends = {}
+        self._available: Optional[List[Backend]] = None
+        self._entry_points_pending = entry_points
+        for backend in backends:
+            self.register(backend)
+
+    def register(self, backend: Backend) -> None:
+        """Add or replace a backend; forces a new probe."""
+        self._backends[backend.name] = backend
+        self._available = None
+
+    def load_entry_points(self) -> None:
+        """Register backends published by installed packages."""
+        try:
+            entry_points = list(_entry_points(ENTRY_POINT_GROUP))
+        except Exception as e:
+            logger.error("Error reading audio backend entry points: %s", e)
+            return
+        for entry_point in entry_points:
+            try:
+                loaded = entry_point.load()
+                if callable(loaded) and not isinstance(loaded, Backend):
+                    loaded = loaded()
+                for backend in (loaded if isinstance(loaded, (list, tuple)) else [loaded]):
+                    self.register(backend)
+            except Exception as e:
+                logger.error("Error loading audio backend %s: %s", entry_point.name, e)
+
+    def probe(self) -> List[Backend]:
+        """Find installed backends, fastest first."""
+        if self._entry_points_pending:
+            self._entry_points_pending = False
+            self.load_entry_points()
+        self._available = sorted(
+            (b for b in self._backends.values() if shutil.which(b.command[0])),
+            key=lambda b: b.priority,
+        )
+        return self._available
+
+    @property
+    def available(self) -> List[Backend]:
+        """Installed backends, probing on first use."""
+        if self._available is None:
+            self.probe()
+        return self._available
+
+    def candidates(self, sound_file: str) -> List[Backend]:
+        """Installed backends able to play a file, fastest first."""
+        fmt = file_format(sound_file)
+        return [b for b in self.available if b.supports(fmt)]
+
+    def select(self, sound_file: str) -> Optional[Backend]:
+        """The fastest installed backend able to play a file."""
+        candidates = self.candidates(sound_file)
+        return candidates[0] if candidates else None
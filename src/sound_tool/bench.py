@@ -0,0 +1,234 @@
+"""
+Benchmarks for the tool-call path.
+
+Each scenario starts a SoundToolServer with a recording sink instead of an
+audio device, connects an MCP client session to it over in-memory streams
+and times every tool call from the client's side, so the numbers include
+request parsing, validation and response encoding as a real client sees
+them. Sounds are generated WAV files, so no decoder or player is needed.
+
+    mcp-sound-tool-bench --calls 1000
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import shutil
+import struct
+import tempfile
+import time
+import wave
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import SoundToolConfig
+from .pcm import DEFAULT_FORMAT
+
+# The standard sound types, and the tone each generated sound gets
+SOUND_TONES = {"completion": 880.0, "error": 220.0, "notification": 660.0}
+
+# Extra sounds played by the custom path scenario
+CUSTOM_SOUNDS = 8
+
+Call = Tuple[str, dict]
+
+
+@dataclass
+class BenchResult:
+    """Latencies of one scenario's tool calls, in seconds."""
+
+    scenario: str
+    latencies: List[float]
+    seconds: float
+    errors: int = 0
+    played: int = 0
+
+    @property
+    def calls(self) -> int:
+        return len(self.latencies)
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile of the call latencies."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+    @property
+    def calls_per_second(self) -> float:
+        return self.calls / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "scenario": self.scenario,
+            "calls": self.calls,
+            "errors": self.errors,
+            "played": self.played,
+            "p50_ms": round(self.percentile(0.5) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+            "calls_per_second": round(self.calls_per_second, 1),
+        }
+
+    def __str__(self) -> str:
+        return (f"{self.scenario:<14} {self.calls:>6} calls  p50 {self.percentile(0.5) * 1000:8.3f} ms  "
+                f"p99 {self.percentile(0.99) * 1000:8.3f} ms  {self.calls_per_second:9.1f} calls/s  "
+                f"{self.played} played, {self.errors} errors")
+
+
+@dataclass
+class Scenario:
+    """A sequence of tool calls, and whether the catalog is dropped before each."""
+
+    name: str
+    description: str
+    calls: Callable[[int, str], List[Call]]
+    cold_catalog: bool = False
+    config: Dict[str, object] = field(default_factory=dict)
+
+
+def write_tone(path: str, frequency: float, seconds: float = 0.1) -> None:
+    """Write a short sine tone as a WAV file in the default sink format."""
+    fmt = DEFAULT_FORMAT
+    frames = int(fmt.rate * seconds)
+    samples = (int(12000 * math.sin(2 * math.pi * frequency * i / fmt.rate)) for i in range(frames))
+    data = b"".join(struct.pack("<h", sample) * fmt.channels for sample in samples)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(fmt.channels)
+        wav.setsampwidth(fmt.sample_width)
+        wav.setframerate(fmt.rate)
+        wav.writeframes(data)
+
+
+def make_sounds_dir(directory: str) -> str:
+    """Fill directory with the standard sounds and the custom path scenario's sounds."""
+    for sound_type, frequency in SOUND_TONES.items():
+        write_tone(os.path.join(directory, f"{sound_type}.wav"), frequency)
+    custom_dir = os.path.join(directory, "custom")
+    os.makedirs(custom_dir, exist_ok=True)
+    for i in range(CUSTOM_SOUNDS):
+        write_tone(os.path.join(custom_dir, f"custom-{i}.wav"), 300.0 + 50 * i)
+    return directory
+
+
+def _burst(count: int, sounds_dir: str) -> List[Call]:
+    return [("play_sound", {"sound_type": "completion"})] * count
+
+
+def _mixed(count: int, sounds_dir: str) -> List[Call]:
+    types = list(SOUND_TONES)
+    calls = []
+    for i in range(count):
+        if i % 10 == 9:
+            calls.append(("play_sequence", {"sounds": types, "gap": 0.05}))
+        else:
+            calls.append(("play_sound", {"sound_type": types[i % len(types)]}))
+    return calls
+
+
+def _lookups(count: int, sounds_dir: str) -> List[Call]:
+    types = list(SOUND_TONES)
+    return [("play_sound", {"sound_type": types[i % len(types)]}) for i in range(count)]
+
+
+def _custom(count: int, sounds_dir: str) -> List[Call]:
+    paths = [os.path.join(sounds_dir, "custom", f"custom-{i}.wav") for i in range(CUSTOM_SOUNDS)]
+    return [("play_sound", {"sound_type": "custom", "custom_sound_path": paths[i % len(paths)]})
+            for i in range(count)]
+
+
+# Coalescing and rate limiting are off unless a scenario turns them on, so
+# every call goes all the way to the queue
+SCENARIOS = {
+    scenario.name: scenario for scenario in (
+        Scenario("burst", "the same sound, as fast as possible", _burst),
+        Scenario("burst_limited", "the same sound with coalescing and rate limiting on", _burst,
+                 config={"coalesce_window": 0.5, "rate_limit": 2.0}),
+        Scenario("mixed", "every sound type, and a sequence every tenth call", _mixed),
+        Scenario("warm_catalog", "sound types looked up in an indexed catalog", _lookups),
+        Scenario("cold_catalog", "sound types looked up after rebuilding the catalog", _lookups,
+                 cold_catalog=True),
+        Scenario("custom_paths", "custom sounds given by path", _custom),
+    )
+}
+
+
+async def run_scenario(scenario: Scenario, calls: int, sounds_dir: str,
+                       record: Optional[str] = None, concurrency: int = 1) -> BenchResult:
+    """Run one scenario against a fresh server and time each call from the client."""
+    from mcp.shared.memory import create_connected_server_and_client_session
+    from .server import SoundToolServer
+
+    config = SoundToolConfig(record_sink=record or "null", coalesce_window=0, rate_limit=0,
+                             queue_size=max(16, calls), stale_after=0, wait=False)
+    server = SoundToolServer(replace(config, **scenario.config))
+    server.sounds_dir = sounds_dir
+    latencies: List[float] = []
+    errors = 0
+    try:
+        async with create_connected_server_and_client_session(server.mcp._mcp_server) as client:
+            # Warm up the catalog, the sample cache and the client session
+            await client.call_tool("play_sound", {"sound_type": "completion"})
+            await server.scheduler.join()
+            server.metrics.reset()
+
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+
+            async def call(tool: str, arguments: dict) -> None:
+                nonlocal errors
+                async with semaphore:
+                    if scenario.cold_catalog:
+                        server._catalog = None
+                    started = time.perf_counter()
+                    result = await client.call_tool(tool, arguments)
+                    latencies.append(time.perf_counter() - started)
+                    if result.isError or result.content[0].text.startswith("Error"):
+                        errors += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(call(tool, arguments)
+                                   for tool, arguments in scenario.calls(calls, sounds_dir)))
+            seconds = time.perf_counter() - started
+            await server.scheduler.join()
+    finally:
+        server.close()
+    played = server.metrics.counter("tickets", status="done")
+    return BenchResult(scenario.name, latencies, seconds, errors, played)
+
+
+def run(names: List[str], calls: int, record: Optional[str] = None,
+        concurrency: int = 1) -> List[BenchResult]:
+    """Run the named scenarios one after another, with sounds in a temporary directory."""
+    directory = tempfile.mkdtemp(prefix="mcp-sound-tool-bench-")
+    try:
+        sounds_dir = make_sounds_dir(directory)
+        return [asyncio.run(run_scenario(SCENARIOS[name], calls, sounds_dir, record, concurrency))
+                for name in names]
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmarks and print one line (or JSON object) per scenario."""
+    parser = argparse.ArgumentParser(prog="mcp-sound-tool-bench",
+                                     description="Measure tool call latency and throughput.",
+                                     epilog="scenarios: " + "; ".join(
+                                         f"{s.name}: {s.description}" for s in SCENARIOS.values()))
+    parser.add_argument("scenarios", nargs="*", metavar="scenario",
+                        help=f"Scenarios to run: {', '.join(SCENARIOS)} (default all)")
+    parser.add_argument("--calls", type=int, default=1000, help="Tool calls per scenario (default 1000)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Tool calls in flight at once (default 1)")
+    parser.add_argument("--record", help="Write the played audio to this WAV file instead of discarding it")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+
+    for result in run(args.scenarios or list(SCENARIOS), args.calls, args.record, args.concurrency):
+        print(json.dumps(result.as_dict()) if args.json else result)
+
+
+if __name__ == "__main__":
+    main()
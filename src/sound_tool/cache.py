@@ -0,0 +1,111 @@
+"""
+In-memory cache of decoded PCM buffers.
+
+Buffers are keyed by the content hash of the source file, so identical files
+share one buffer, and are evicted least-recently-used once the cache grows
+past its byte budget.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+from .pcm import PCMBuffer, PCMFormat, DEFAULT_FORMAT, decode_file
+
+if TYPE_CHECKING:
+    from .metrics import PlaybackMetrics
+
+
+def file_hash(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SampleCache:
+    """Byte-bounded LRU cache of decoded sound files."""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024,
+                 decoder: Callable[[str, PCMFormat], PCMBuffer] = decode_file,
+                 metrics: Optional["PlaybackMetrics"] = None):
+        self.max_bytes = max_bytes
+        self.decoder = decoder
+        # Records how long each decode on a cache miss takes
+        self.metrics = metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._buffers = OrderedDict()
+        # path -> (mtime_ns, size, hash) so unchanged files are hashed only once
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def content_hash(self, path: str) -> str:
+        """Return the content hash of a file, reusing it while the file is unchanged."""
+        stat = os.stat(path)
+        known = self._hashes.get(path)
+        if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+        digest = file_hash(path)
+        self._hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def load(self, path: str, fmt: PCMFormat = DEFAULT_FORMAT) -> PCMBuffer:
+        """Return the decoded buffer for a file, decoding it on a cache miss."""
+        key = (self.content_hash(path), fmt)
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is not None:
+                self._buffers.move_to_end(key)
+                self.hits += 1
+                return buffer
+            self.misses += 1
+
+        started = time.perf_counter()
+        buffer = self.decoder(path, fmt)
+        if self.metrics is not None:
+            self.metrics.observe("decode_seconds", time.perf_counter() - started)
+        self.put(key, buffer)
+        return buffer
+
+    def put(self, key, buffer: PCMBuffer) -> None:
+        """Store a buffer, evicting least recently used entries to stay in budget."""
+        nbytes = len(buffer.data)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._buffers.pop(key, None)
+            if old is not None:
+                self.size -= len(old.data)
+            self._buffers[key] = buffer
+            self.size += nbytes
+            while self.size > self.max_bytes:
+                _, evicted = self._buffers.popitem(last=False)
+                self.size -= len(evicted.data)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached buffer."""
+        with self._lock:
+            self._buffers.clear()
+            self._hashes.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        """Return cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._buffers),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
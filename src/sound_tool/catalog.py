@@ -0,0 +1,163 @@
+"""
+In-memory index of the sounds directory.
+
+The catalog scans the sounds directory once and serves lookups from memory.
+It rescans only when the directory's mtime changes (files added, removed or
+renamed) or a known file's mtime or size does (a file overwritten in
+place), and even then reuses entries for files whose mtime and size are
+unchanged, so slow or network-mounted home directories are touched as
+little as possible.
+
+With a VariantCache, entries also point at the transcoded WAV variant of
+their file, if one has been made, and that variant is what gets played.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from .cache import file_hash
+from .pcm import probe_duration
+
+if TYPE_CHECKING:
+    from .transcode import VariantCache
+
+SOUND_EXTENSIONS = (".mp3", ".wav")
+
+
+@dataclass(frozen=True)
+class SoundEntry:
+    """A sound file known to the catalog."""
+
+    name: str
+    path: str
+    format: str
+    size: int
+    mtime_ns: int
+    duration: Optional[float]
+    hash: str
+    # Transcoded copy that the installed players handle better, if any
+    variant: Optional[str] = None
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def playable_path(self) -> str:
+        """The variant if there is one, otherwise the original file."""
+        return self.variant or self.path
+
+
+class SoundCatalog:
+    """Name-indexed view of the sound files in a directory."""
+
+    def __init__(self, sounds_dir: str, refresh_interval: float = 2.0,
+                 variants: Optional["VariantCache"] = None):
+        """
+        Create a catalog for a directory.
+
+        The directory and its files are checked at most once per
+        refresh_interval seconds; use refresh(force=True) to rescan
+        immediately, e.g. after new variants have been made.
+        """
+        self.sounds_dir = sounds_dir
+        self.refresh_interval = refresh_interval
+        self.variants = variants
+        self.scans = 0
+        self._dir_mtime_ns = None
+        self._checked_at = None
+        self._files: Dict[str, SoundEntry] = {}
+        self._by_name: Dict[str, SoundEntry] = {}
+        self._lock = threading.Lock()
+
+    def _dir_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.sounds_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _files_changed(self) -> bool:
+        """Whether a known file was modified or removed since the last scan."""
+        for entry in self._files.values():
+            try:
+                stat = os.stat(entry.path)
+            except OSError:
+                return True
+            if (stat.st_mtime_ns, stat.st_size) != (entry.mtime_ns, entry.size):
+                return True
+        return False
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rescan the directory if it changed. Returns True if a scan happened."""
+        with self._lock:
+            now = time.monotonic()
+            if (not force and self._checked_at is not None
+                    and now - self._checked_at < self.refresh_interval):
+                return False
+            self._checked_at = now
+
+            mtime = self._dir_mtime()
+            if (not force and self.scans and mtime == self._dir_mtime_ns
+                    and not self._files_changed()):
+                return False
+            self._dir_mtime_ns = mtime
+            self._scan()
+            return True
+
+    def _scan(self) -> None:
+        files = {}
+        try:
+            with os.scandir(self.sounds_dir) as it:
+                for dir_entry in it:
+                    name, ext = os.path.splitext(dir_entry.name)
+                    if ext.lower() not in SOUND_EXTENSIONS or not dir_entry.is_file():
+                        continue
+                    try:
+                        stat = dir_entry.stat()
+                        old = self._files.get(dir_entry.name)
+                        if old is not None and (old.mtime_ns, old.size) == (stat.st_mtime_ns, stat.st_size):
+                            files[dir_entry.name] = self._with_variant(old)
+                            continue
+                        files[dir_entry.name] = self._with_variant(SoundEntry(
+                            name=name,
+                            path=dir_entry.path,
+                            format=ext.lower().lstrip("."),
+                            size=stat.st_size,
+                            mtime_ns=stat.st_mtime_ns,
+                            duration=probe_duration(dir_entry.path),
+                            hash=file_hash(dir_entry.path),
+                        ))
+                    except OSError:
+                        # File vanished or is unreadable; leave it out of the index
+                        continue
+        except OSError:
+            pass
+
+        by_name = {}
+        # MP3 wins over WAV when both exist, matching the original lookup order
+        for entry in sorted(files.values(), key=lambda e: SOUND_EXTENSIONS.index("." + e.format),
+                            reverse=True):
+            by_name[entry.name] = entry
+        self._files = files
+        self._by_name = by_name
+        self.scans += 1
+
+    def _with_variant(self, entry: SoundEntry) -> SoundEntry:
+        variant = self.variants.lookup(entry.hash) if self.variants is not None else None
+        return entry if variant == entry.variant else replace(entry, variant=variant)
+
+    def lookup(self, name: str) -> Optional[SoundEntry]:
+        """Find a sound by name (the filename without extension)."""
+        self.refresh()
+        return self._by_name.get(name)
+
+    def entries(self) -> List[SoundEntry]:
+        """All indexed sound files, sorted by filename."""
+        self.refresh()
+        return sorted(self._files.values(), key=lambda e: e.filename)
+
+    def filenames(self) -> List[str]:
+        """Filenames of all indexed sound files."""
+        return [entry.filename for entry in self.entries()]
@@ -0,0 +1,62 @@
+"""
+Client identity and concurrency limits for the network transport.
+
+Over stdio a server has exactly one client. Over SSE one process serves
+many clients at once, so tool calls take a slot from a shared limit, and
+each call is tagged with the client that made it so the playback scheduler
+can queue clients fairly.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+
+def client_key(ctx: Any) -> Optional[str]:
+    """
+    Identify the client behind a FastMCP request context.
+
+    The client ID from the request is used when the client sends one,
+    otherwise the session, which is unique per connection.
+    """
+    if ctx is None:
+        return None
+    try:
+        client_id = ctx.client_id
+        if client_id:
+            return str(client_id)
+        return f"session-{id(ctx.session):x}"
+    except (AttributeError, LookupError, ValueError):
+        # Called outside of a request
+        return None
+
+
+class ClientLimiter:
+    """Bound the number of tool calls running at once across all clients."""
+
+    def __init__(self, max_concurrent: int = 16):
+        """Create a limiter; max_concurrent of 0 means no limit."""
+        self.max_concurrent = max_concurrent
+        self.active = 0
+        self._semaphore = None
+        self._loop = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Semaphores are bound to the loop they are first used on
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    @asynccontextmanager
+    async def slot(self, ctx: Any = None) -> AsyncIterator[Optional[str]]:
+        """Wait for a free slot and yield the calling client's key."""
+        if self.max_concurrent <= 0:
+            yield client_key(ctx)
+            return
+        async with self._get_semaphore():
+            self.active += 1
+            try:
+                yield client_key(ctx)
+            finally:
+                self.active -= 1
@@ -0,0 +1,133 @@
+"""
+Coalescing and rate limiting of play requests.
+
+Agents can fire many identical play_sound calls in a short burst. The
+coalescer merges repeats of the same sound inside a time window into the
+request that is already playing or queued, and a token bucket per sound
+type caps how many requests of that type reach the player.
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+# Verdicts returned by EventCoalescer.admit
+ADMITTED = "admitted"
+COALESCED = "coalesced"
+RATE_LIMITED = "rate_limited"
+
+
+class TokenBucket:
+    """Classic token bucket: rate tokens per second, up to burst tokens."""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = burst
+        self.updated = clock()
+
+    def take(self) -> bool:
+        """Take a token if one is available."""
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class EventCoalescer:
+    """Decide whether a play request should be played, merged or dropped."""
+
+    def __init__(self, window: float = 0.5, rate: float = 2.0, burst: float = 4,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Create a coalescer.
+
+        Identical requests within window seconds of the last admitted one are
+        merged into it. Each sound type may then play at most rate times per
+        second on average, with bursts of up to burst sounds. A window or
+        rate of 0 disables that stage.
+        """
+        self.window = window
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.admitted = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+        self.per_type: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {ADMITTED: 0, COALESCED: 0, RATE_LIMITED: 0})
+        # key -> (time admitted, token of the admitted request, merges since)
+        self._recent: Dict[Hashable, Tuple[float, object, int]] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def admit(self, sound_type: str, key: Hashable) -> Tuple[str, Optional[object], int]:
+        """
+        Classify a request for sound_type identified by key (e.g. its path).
+
+        Returns (verdict, token, merged): for COALESCED, token is whatever was
+        attached to the request it was merged into and merged is how many
+        requests have been merged into it so far.
+        """
+        with self._lock:
+            now = self.clock()
+            recent = self._recent.get(key)
+            if self.window > 0 and recent is not None and now - recent[0] < self.window:
+                merged = recent[2] + 1
+                self._recent[key] = (recent[0], recent[1], merged)
+                self._count(sound_type, COALESCED)
+                return COALESCED, recent[1], merged
+
+            if self.rate > 0:
+                bucket = self._buckets.get(sound_type)
+                if bucket is None:
+                    bucket = self._buckets[sound_type] = TokenBucket(self.rate, self.burst, self.clock)
+                if not bucket.take():
+                    self._count(sound_type, RATE_LIMITED)
+                    return RATE_LIMITED, None, 0
+
+            self._recent[key] = (now, None, 0)
+            self._prune(now)
+            self._count(sound_type, ADMITTED)
+            return ADMITTED, None, 0
+
+    def attach(self, key: Hashable, token: object) -> None:
+        """Attach a token (such as its ticket) to the last admitted request for key."""
+        with self._lock:
+            recent = self._recent.get(key)
+            if recent is not None:
+                self._recent[key] = (recent[0], token, recent[2])
+
+    def forget(self, key: Hashable) -> None:
+        """Forget the last admitted request for key, e.g. because it was dropped."""
+        with self._lock:
+            self._recent.pop(key, None)
+
+    def _count(self, sound_type: str, verdict: str) -> None:
+        if verdict == ADMITTED:
+            self.admitted += 1
+        elif verdict == COALESCED:
+            self.coalesced += 1
+        else:
+            self.rate_limited += 1
+        self.per_type[sound_type][verdict] += 1
+
+    def _prune(self, now: float) -> None:
+        """Forget requests whose coalescing window has passed."""
+        if len(self._recent) < 64:
+            return
+        for key in [k for k, v in self._recent.items() if now - v[0] >= self.window]:
+            del self._recent[key]
+
+    def stats(self) -> dict:
+        """Return counts of admitted, merged and dropped requests."""
+        return {
+            "admitted": self.admitted,
+            "coalesced": self.coalesced,
+            "rate_limited": self.rate_limited,
+            "per_type": {k: dict(v) for k, v in self.per_type.items()},
+        }
@@ -0,0 +1,117 @@
+"""
+Runtime configuration for the sound tool server.
+
+Settings can be passed directly to SoundToolServer or read from
+MCP_SOUND_TOOL_* environment variables, which is the easiest way to tune
+the server from an IDE's mcp.json.
+"""
+import os
+from dataclasses import dataclass, fields
+from typing import Mapping, Optional
+
+ENV_PREFIX = "MCP_SOUND_TOOL_"
+
+_TRUE_VALUES = ("1", "true", "yes", "on")
+
+TRANSPORTS = ("stdio", "sse")
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+def cache_dir(sub: str) -> str:
+    """Directory sub of the tool's directory under the user's cache directory."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "mcp-sound-tool", sub)
+
+
+@dataclass
+class SoundToolConfig:
+    """Tunable settings for the sound tool server."""
+
+    # Maximum number of sounds waiting to be played
+    queue_size: int = 16
+    # What to do when the queue is full: drop_oldest, drop_newest or block
+    drop_policy: str = "drop_oldest"
+    # Priority overrides as "type=priority,..." (lower plays first), e.g. "error=0,completion=2"
+    priorities: str = ""
+    # Whether a higher-priority sound stops a lower-priority one that is playing
+    preempt: bool = True
+    # Queued sounds below the top priority are dropped after waiting this long, in seconds (0 disables)
+    stale_after: float = 5.0
+    # Whether play_sound waits for playback to finish by default
+    wait: bool = False
+    # Keep one raw PCM player process open on Linux instead of one per sound
+    use_sink: bool = True
+    # Write sounds to this WAV file instead of playing them, or discard them with "null"
+    record_sink: str = ""
+    # Measure each sound's loudness when it is indexed and play it at loudness_target (needs numpy)
+    normalize_loudness: bool = False
+    # Level sounds are normalized to, in dBFS (gated RMS)
+    loudness_target: float = -20.0
+    # Upload sounds to the PulseAudio sample cache and play them with pactl play-sample (Linux)
+    pulse_samples: bool = False
+    # Mix overlapping sounds into the sink in-process instead of playing them one by one (needs numpy)
+    mix: bool = False
+    # Most sounds mixed at the same time; adding another stops the oldest
+    max_voices: int = 8
+    # Memory budget for decoded sound buffers, in bytes
+    cache_bytes: int = 32 * 1024 * 1024
+    # Packed sound bank to memory-map (default: sounds.bank in the sounds directory, if present)
+    sound_bank: str = ""
+    # stdio serves one client; sse serves many over HTTP
+    transport: str = "stdio"
+    # Address and port the sse transport listens on
+    host: str = "127.0.0.1"
+    port: int = 8000
+    # Most tool calls handled at once across all clients (0 for no limit)
+    max_concurrent: int = 16
+    # Send one-line tool descriptions and minimal parameter schemas to save context
+    compact_tools: bool = False
+    # Least severe log messages to write: DEBUG, INFO, WARNING, ERROR or CRITICAL
+    log_level: str = "INFO"
+    # Write log messages to this file instead of stderr
+    log_file: str = ""
+    # Log record format: text or json (one object per line)
+    log_format: str = "text"
+    # Report how long each startup phase takes on stderr
+    startup_profile: bool = False
+    # Trace every tool call and keep cProfile profiles of the slowest ones
+    profile: bool = False
+    # Where trace files are written (default: ~/.cache/mcp-sound-tool/traces)
+    profile_dir: str = ""
+    # Number of slowest calls whose profiles are kept (0 traces without cProfile)
+    profile_slowest: int = 5
+    # Forward sounds to a shared mcp-sound-tool-daemon, playing in-process if it isn't running
+    daemon: bool = False
+    # Socket of the shared daemon (default: $XDG_RUNTIME_DIR/mcp-sound-tool.sock)
+    daemon_socket: str = ""
+    # Where WAV variants of sounds are stored (default: ~/.cache/mcp-sound-tool/variants)
+    variants_dir: str = ""
+    # Longest a single sound may play before it is cut off, in seconds (0 for no limit)
+    max_duration: float = 30.0
+    # Repeats of the same sound within this many seconds are merged (0 disables)
+    coalesce_window: float = 0.5
+    # Average sounds per second allowed for each sound type (0 disables)
+    rate_limit: float = 2.0
+    # Number of sounds of one type that may play back to back before rate limiting
+    rate_burst: int = 4
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "SoundToolConfig":
+        """Build a config from MCP_SOUND_TOOL_* environment variables."""
+        environ = os.environ if environ is None else environ
+        values = {}
+        for field in fields(cls):
+            raw = environ.get(ENV_PREFIX + field.name.upper())
+            if raw is None:
+                continue
+            default = field.default
+            if isinstance(default, bool):
+                values[field.name] = raw.strip().lower() in _TRUE_VALUES
+            elif isinstance(default, int):
+                values[field.name] = int(raw)
+            elif isinstance(default, float):
+                values[field.name] = float(raw)
+            else:
+                values[field.name] = raw
+        return cls(**values)
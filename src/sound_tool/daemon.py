@@ -0,0 +1,318 @@
+"""
+Shared playback daemon.
+
+Every IDE window starts its own mcp-sound-tool process. In daemon mode one
+long-running process (mcp-sound-tool-daemon) owns the playback queue, the
+sample cache and the sink, and the MCP servers forward play requests to it
+over a Unix domain socket, so cues from different windows are queued and
+prioritised together instead of colliding on the audio device. When the
+daemon is not running, the servers play sounds in-process as usual.
+
+Protocol: every request is a fixed header followed by a payload, and every
+request gets exactly one response.
+
+    request:  op (u8), flags (u8), priority (i8), payload length (u16)
+    response: status (u8), ticket ID (u32), message length (u16), message
+
+For OP_PLAY the payload is the sound type and path, separated by a NUL
+byte. Sound bank entries ("bank:<name>") are resolved by name against the
+daemon's own catalog and bank; a sound the daemon cannot find is answered
+with STATUS_ERROR. For OP_STOP the payload is the ticket ID as u32 (0 for
+the current sound). For OP_WAIT it is the ticket ID too, and the response
+comes once that ticket has finished.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import stat
+import struct
+import tempfile
+from typing import TYPE_CHECKING, List, Optional
+
+from .playback import (
+    PlaybackTicket, QUEUED, PLAYING, DONE, FAILED, DROPPED, CANCELLED, PREEMPTED,
+)
+from .soundbank import BANK_PREFIX
+
+if TYPE_CHECKING:
+    from .server import SoundToolServer
+
+REQUEST = struct.Struct("!BBbH")
+RESPONSE = struct.Struct("!BIH")
+TICKET_ID = struct.Struct("!I")
+
+# Operations
+OP_PING = 1
+OP_PLAY = 2
+OP_STOP = 3
+OP_WAIT = 4
+
+# Request flags
+FLAG_WAIT = 0x01
+FLAG_PRIORITY = 0x02
+FLAG_CLEAR_QUEUE = 0x04
+
+# Response status codes: ticket states, then STATUS_OK for replies without a
+# ticket and STATUS_ERROR for requests the daemon could not handle
+STATUSES = (QUEUED, PLAYING, DONE, FAILED, DROPPED, CANCELLED, PREEMPTED)
+STATUS_OK = 100
+STATUS_ERROR = 255
+
+MAX_MESSAGE = 0xFFFF
+
+logger = logging.getLogger(__name__)
+
+
+def default_socket_path() -> str:
+    """Per-user socket path in the runtime directory (or the temp directory)."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "mcp-sound-tool.sock")
+    return os.path.join(tempfile.gettempdir(), f"mcp-sound-tool-{os.getuid()}.sock")
+
+
+def encode_response(status: int, ticket_id: int = 0, message: str = "") -> bytes:
+    data = message.encode("utf-8")[:MAX_MESSAGE]
+    return RESPONSE.pack(status, ticket_id, len(data)) + data
+
+
+async def read_response(reader: asyncio.StreamReader):
+    status, ticket_id, length = RESPONSE.unpack(await reader.readexactly(RESPONSE.size))
+    message = (await reader.readexactly(length)).decode("utf-8", "replace")
+    return status, ticket_id, message
+
+
+class PlaybackDaemon:
+    """Serve play and stop requests for a SoundToolServer over a Unix socket."""
+
+    def __init__(self, server: "SoundToolServer", path: Optional[str] = None):
+        self.server = server
+        self.path = path or default_socket_path()
+        self._server = None
+
+    async def start(self) -> None:
+        """Listen on the socket, replacing a stale socket file left by a crash."""
+        if os.path.exists(self.path):
+            client = DaemonClient(self.path)
+            running = await client.ping()
+            client.close()
+            if running:
+                raise RuntimeError(f"A sound daemon is already listening on {self.path}")
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        # Only the user who started the daemon may queue sounds
+        os.chmod(self.path, stat.S_IRUSR | stat.S_IWUSR)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop listening and remove the socket file."""
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Each connection is queued fairly against the others
+        client = f"connection-{id(writer):x}"
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(REQUEST.size)
+                except asyncio.IncompleteReadError:
+                    break
+                op, flags, priority, length = REQUEST.unpack(header)
+                payload = await reader.readexactly(length)
+                try:
+                    response = await self._dispatch(op, flags, priority, payload, client)
+                except (ValueError, struct.error) as e:
+                    response = encode_response(STATUS_ERROR, 0, f"Bad request: {e}")
+                writer.write(response)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def resolve(self, path: str) -> Optional[str]:
+        """
+        The daemon's own path for a sound a client resolved, or None if it
+        has no such sound.
+
+        The client's sound bank is not the daemon's, so bank entries are
+        looked up again by name.
+        """
+        if path.startswith(BANK_PREFIX):
+            return self.server.resolve_sound(path[len(BANK_PREFIX):])
+        return path if os.path.isfile(path) else None
+
+    async def _dispatch(self, op: int, flags: int, priority: int, payload: bytes,
+                        client: Optional[str] = None) -> bytes:
+        if op == OP_PING:
+            return encode_response(STATUS_OK)
+        if op == OP_PLAY:
+            sound_type, _, requested = payload.decode("utf-8").partition("\0")
+            path = self.resolve(requested)
+            if path is None:
+                return encode_response(STATUS_ERROR, 0, f"Sound file not found: {requested}")
+            ticket = await self.server.scheduler.submit(
+                sound_type, path, priority if flags & FLAG_PRIORITY else None, client)
+            if flags & FLAG_WAIT:
+                await self.server.scheduler.wait(ticket)
+            return encode_response(STATUSES.index(ticket.status), ticket.id, ticket.error or "")
+        if op == OP_STOP:
+            (ticket_id,) = TICKET_ID.unpack(payload)
+            message = self.server.stop(ticket_id or None, bool(flags & FLAG_CLEAR_QUEUE))
+            return encode_response(STATUS_OK, 0, message)
+        if op == OP_WAIT:
+            (ticket_id,) = TICKET_ID.unpack(payload)
+            ticket = self.server.scheduler.get(ticket_id)
+            if ticket is None:
+                return encode_response(STATUS_ERROR, 0, f"Unknown ticket {ticket_id}")
+            await self.server.scheduler.wait(ticket)
+            return encode_response(STATUSES.index(ticket.status), ticket.id, ticket.error or "")
+        return encode_response(STATUS_ERROR, 0, f"Unknown operation {op}")
+
+
+class DaemonClient:
+    """Forward requests to a PlaybackDaemon; every method returns None if it is unreachable."""
+
+    def __init__(self, path: Optional[str] = None, timeout: float = 0.5):
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+        self._idle: List[tuple] = []
+        self._loop = None
+
+    async def _connect(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Streams belong to the loop that opened them
+            self._loop, self._idle = loop, []
+        if self._idle:
+            return self._idle.pop() + (True,)
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(self.path),
+                                                self.timeout)
+        return reader, writer, False
+
+    async def request(self, op: int, flags: int = 0, priority: int = 0, payload: bytes = b"",
+                      timeout: Optional[float] = None):
+        """Send one request; returns (status, ticket ID, message) or None on failure."""
+        message = REQUEST.pack(op, flags, priority, len(payload)) + payload
+        while True:
+            try:
+                reader, writer, reused = await self._connect()
+            except (OSError, asyncio.TimeoutError):
+                return None
+            try:
+                writer.write(message)
+                await writer.drain()
+                response = await asyncio.wait_for(read_response(reader), timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused:
+                    # The daemon may have restarted since this connection was opened
+                    continue
+                return None
+            # Keep the connection for the next request; concurrent requests open more
+            self._idle.append((reader, writer))
+            return response
+
+    async def ping(self) -> bool:
+        return await self.request(OP_PING, timeout=self.timeout) is not None
+
+    async def play(self, sound_type: str, path: str, priority: Optional[int] = None,
+                   wait: bool = False) -> Optional[PlaybackTicket]:
+        """
+        Queue a sound on the daemon and return a snapshot of its ticket.
+
+        The snapshot is marked finished straight away: with wait it holds the
+        final state, otherwise the state right after queueing. Requests the
+        daemon rejects, e.g. for a sound it can't find, come back as failed.
+        """
+        flags = FLAG_WAIT if wait else 0
+        if priority is not None:
+            flags |= FLAG_PRIORITY
+        payload = f"{sound_type}\0{path}".encode("utf-8")
+        response = await self.request(OP_PLAY, flags, max(-128, min(127, priority or 0)), payload,
+                                      timeout=None if wait else self.timeout)
+        if response is None:
+            return None
+        return self._snapshot(response, sound_type, path, priority or 0)
+
+    async def wait(self, ticket: PlaybackTicket) -> Optional[PlaybackTicket]:
+        """Wait until a ticket queued on the daemon has finished and return its final snapshot."""
+        response = await self.request(OP_WAIT, 0, 0, TICKET_ID.pack(ticket.id))
+        if response is None:
+            return None
+        return self._snapshot(response, ticket.sound_type, ticket.path, ticket.priority, ticket.id)
+
+    @staticmethod
+    def _snapshot(response, sound_type: str, path: str, priority: int,
+                  known_id: int = 0) -> PlaybackTicket:
+        status, ticket_id, message = response
+        finished = asyncio.Event()
+        finished.set()
+        return PlaybackTicket(id=ticket_id or known_id, sound_type=sound_type, path=path, priority=priority,
+                              status=STATUSES[status] if status < len(STATUSES) else FAILED,
+                              error=message or None, finished=finished)
+
+    async def stop(self, ticket_id: Optional[int] = None, clear_queue: bool = False) -> Optional[str]:
+        """Stop a sound on the daemon; returns its reply."""
+        response = await self.request(OP_STOP, FLAG_CLEAR_QUEUE if clear_queue else 0, 0,
+                                      TICKET_ID.pack(ticket_id or 0), timeout=self.timeout)
+        return response[2] if response is not None else None
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        for _, writer in self._idle:
+            try:
+                writer.close()
+            except RuntimeError:
+                # The loop the connection belonged to is already closed
+                pass
+        self._idle = []
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the shared playback daemon."""
+    from dataclasses import replace
+    from .config import SoundToolConfig
+    from .log import configure_logging, shutdown_logging
+    from .server import SoundToolServer
+
+    parser = argparse.ArgumentParser(prog="mcp-sound-tool-daemon",
+                                     description="Play sounds for every mcp-sound-tool server.")
+    parser.add_argument("--socket", help=f"Socket path (default {default_socket_path()})")
+    args = parser.parse_args(argv)
+
+    config = SoundToolConfig.from_env()
+    configure_logging(config.log_level, config.log_file, config.log_format)
+    # The daemon plays sounds itself rather than forwarding them to itself
+    server = SoundToolServer(replace(config, daemon=False))
+    daemon = PlaybackDaemon(server, args.socket or config.daemon_socket or None)
+    logger.info("Sound daemon listening on %s - press Ctrl+C to exit", daemon.path)
+    try:
+        asyncio.run(daemon.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        logger.error("%s", e)
+    finally:
+        server.close()
+    logger.info("Sound daemon stopped.")
+    shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Incremental installation of sound files.
+
+Installing compares every source file with the file already in the target
+directory (size and mtime first, content hash if those disagree) and only
+copies what changed. Copies run on a small thread pool, so large sound packs
+install quickly, and each file is written under a temporary name and then
+renamed into place, so a sound that is playing never reads a half-written
+file.
+"""
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from importlib import resources
+from typing import Iterable, List
+
+from .cache import file_hash
+from .catalog import SOUND_EXTENSIONS
+
+# Outcomes of syncing a single file
+COPIED = "copied"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+@dataclass
+class InstallSummary:
+    """What an installation did."""
+
+    target: str
+    copied: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes_copied: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        text = f"{self.copied} copied, {self.skipped} unchanged, {self.bytes_copied} bytes written"
+        if self.failed:
+            text += f", {self.failed} failed ({'; '.join(self.errors)})"
+        return text
+
+
+def bundled_sounds() -> List[str]:
+    """Paths of the sound files shipped with the package."""
+    try:
+        # Python 3.9+
+        sounds_dir = resources.files("sound_tool").joinpath("sounds")
+        names = [entry.name for entry in sounds_dir.iterdir()]
+        sounds_dir = str(sounds_dir)
+    except (AttributeError, ImportError, OSError):
+        sounds_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sounds")
+        names = os.listdir(sounds_dir) if os.path.exists(sounds_dir) else []
+    return [os.path.join(sounds_dir, name) for name in sorted(names)
+            if name.lower().endswith(SOUND_EXTENSIONS)]
+
+
+def sound_files(directory: str) -> List[str]:
+    """Paths of the sound files in a directory."""
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.lower().endswith(SOUND_EXTENSIONS)
+            and os.path.isfile(os.path.join(directory, name))]
+
+
+def is_current(source: str, target: str) -> bool:
+    """Whether target already holds the same content as source."""
+    try:
+        source_stat = os.stat(source)
+        target_stat = os.stat(target)
+    except OSError:
+        return False
+    if source_stat.st_size != target_stat.st_size:
+        return False
+    # Installed copies keep the source mtime, so equal mtimes mean nothing changed
+    if source_stat.st_mtime_ns == target_stat.st_mtime_ns:
+        return True
+    return file_hash(source) == file_hash(target)
+
+
+def copy_atomic(source: str, target: str) -> int:
+    """Copy source to target through a temporary file and return the bytes copied."""
+    directory, name = os.path.split(target)
+    fd, partial = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".part")
+    os.close(fd)
+    try:
+        shutil.copy2(source, partial)
+        os.replace(partial, target)
+    except BaseException:
+        try:
+            os.unlink(partial)
+        except OSError:
+            pass
+        raise
+    return os.path.getsize(target)
+
+
+def sync_files(sources: Iterable[str], target_dir: str, max_workers: int = 4) -> InstallSummary:
+    """Copy the sources that are missing or changed in target_dir."""
+    os.makedirs(target_dir, exist_ok=True)
+    summary = InstallSummary(target=target_dir)
+
+    def sync(source):
+        target = os.path.join(target_dir, os.path.basename(source))
+        try:
+            if is_current(source, target):
+                return SKIPPED, 0, None
+            return COPIED, copy_atomic(source, target), None
+        except OSError as e:
+            return FAILED, 0, f"{os.path.basename(source)}: {e}"
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for outcome, size, error in pool.map(sync, list(sources)):
+            if outcome == COPIED:
+                summary.copied += 1
+                summary.bytes_copied += size
+            elif outcome == SKIPPED:
+                summary.skipped += 1
+            else:
+                summary.failed += 1
+                summary.errors.append(error)
+    return summary
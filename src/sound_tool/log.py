@@ -0,0 +1,117 @@
+"""
+Non-blocking logging for the sound tool.
+
+With the stdio transport stdout is the protocol channel, so nothing may be
+printed there. Log records are put on a queue by the calling thread and
+written to stderr or a file by a background listener thread. Formatting
+happens on the listener, so logging from the playback path costs no more
+than creating a record and enqueueing it.
+
+Records are written as text with any extra fields appended as key=value
+pairs, or as one JSON object per line.
+"""
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from typing import Optional
+
+LOG_FORMATS = ("text", "json")
+
+# Name of the package logger whose level is controlled by configure_logging
+PACKAGE_LOGGER = __name__.rpartition(".")[0]
+
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+
+
+def extra_fields(record: logging.LogRecord) -> dict:
+    """Fields passed to a log call through extra=."""
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+class TextFormatter(logging.Formatter):
+    """Plain text with extra fields appended as key=value pairs."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = extra_fields(record)
+        if fields:
+            text += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return text
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created))
+                    + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(extra_fields(record))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class EnqueueHandler(logging.handlers.QueueHandler):
+    """Queue records as they are; the listener thread does all formatting."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, so the record needs no pickling
+        return record
+
+
+def configure_logging(level: str = "INFO", log_file: str = "", log_format: str = "text") -> None:
+    """
+    Send log records to stderr (or log_file) through a background thread.
+
+    The handler is installed on the root logger, so records from the MCP
+    library go the same way; level applies to the sound tool's own loggers.
+    """
+    global _listener, _queue_handler
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format: {log_format}")
+    shutdown_logging()
+
+    if log_file:
+        target = logging.FileHandler(log_file, encoding="utf-8")
+    else:
+        target = logging.StreamHandler(sys.stderr)
+    target.setFormatter(JSONFormatter() if log_format == "json" else TextFormatter())
+
+    records = queue.SimpleQueue()
+    _queue_handler = EnqueueHandler(records)
+    _listener = logging.handlers.QueueListener(records, target, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    if root.level == logging.NOTSET or root.level > logging.WARNING:
+        root.setLevel(logging.WARNING)
+    logging.getLogger(PACKAGE_LOGGER).setLevel(level.upper())
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -0,0 +1,94 @@
+"""
+Loudness analysis and gain normalization.
+
+Sound packs vary a lot in loudness. The loudness of every sound is
+measured once, in the background after the catalog is scanned, as gated
+RMS over 100 ms blocks (the same idea as LUFS without the frequency
+weighting: blocks of near silence are left out so short cues with trailing
+silence are not measured as quiet). Decoded playback then scales the cached
+PCM buffer by the precomputed gain that brings it to the target level, in a
+single vectorized multiply; player processes and the PulseAudio sample
+cache get a WAV variant with the gain already applied.
+"""
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from .numpy_support import np, numpy_available
+from .pcm import PCMBuffer
+
+# Default loudness sounds are brought to, in dB relative to full scale
+TARGET_DBFS = -20.0
+
+# Loudest a quiet sound is made, in dB
+MAX_GAIN_DB = 12.0
+
+# Blocks quieter than this are left out of the measurement, in dBFS
+GATE_DBFS = -70.0
+
+BLOCK_SECONDS = 0.1
+
+FULL_SCALE = 32768.0
+
+
+def loudness_available() -> bool:
+    """Whether NumPy is installed so loudness can be measured."""
+    return numpy_available()
+
+
+@dataclass(frozen=True)
+class Loudness:
+    """Measured level of a clip."""
+
+    # Gated RMS level in dBFS
+    dbfs: float
+    # Largest absolute sample, as a fraction of full scale
+    peak: float
+
+
+def measure(buffer: PCMBuffer) -> Optional[Loudness]:
+    """Measure a 16-bit buffer; None if it is silent or can't be measured."""
+    if buffer.format.sample_width != 2 or not numpy_available():
+        return None
+    samples = np.frombuffer(buffer.data, dtype="<i2").astype(np.float32) / FULL_SCALE
+    if not samples.size:
+        return None
+    block = max(1, int(BLOCK_SECONDS * buffer.format.rate)) * buffer.format.channels
+    whole = samples.size // block * block
+    blocks = samples[:whole].reshape(-1, block) if whole else samples.reshape(1, -1)
+    power = np.square(blocks).mean(axis=1)
+    gated = power[power > 10 ** (GATE_DBFS / 10)]
+    if not gated.size:
+        return None
+    return Loudness(dbfs=round(10 * math.log10(float(gated.mean())), 2),
+                    peak=round(float(np.abs(samples).max()), 4))
+
+
+def gain_for(loudness: Optional[Loudness], target_dbfs: float = TARGET_DBFS,
+             max_gain_db: float = MAX_GAIN_DB) -> float:
+    """
+    Linear gain that brings a clip to target_dbfs.
+
+    Quiet clips are raised by at most max_gain_db and never so far that
+    their peaks would clip.
+    """
+    if loudness is None:
+        return 1.0
+    gain = 10 ** (min(target_dbfs - loudness.dbfs, max_gain_db) / 20)
+    if gain > 1.0 and loudness.peak > 0:
+        gain = max(1.0, min(gain, 1.0 / loudness.peak))
+    return gain
+
+
+def needs_gain(gain: float) -> bool:
+    """Whether a gain changes the samples audibly."""
+    return abs(gain - 1.0) >= 1e-3
+
+
+def apply_gain(buffer: PCMBuffer, gain: float) -> PCMBuffer:
+    """Scale a 16-bit buffer by gain; the buffer itself if there is nothing to do."""
+    if not needs_gain(gain) or buffer.format.sample_width != 2 or not numpy_available():
+        return buffer
+    scaled = np.multiply(np.frombuffer(buffer.data, dtype="<i2"), gain, dtype=np.float32)
+    np.clip(scaled, -FULL_SCALE, FULL_SCALE - 1, out=scaled)
+    return PCMBuffer(scaled.astype("<i2").tobytes(), buffer.format)
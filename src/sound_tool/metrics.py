@@ -0,0 +1,203 @@
+"""
+Playback metrics.
+
+Latency histograms and counters for the stages a sound goes through: the
+tool call, the sound lookup, the wait in the queue, decoding, starting a
+player process and playback itself, labelled by backend where one is
+involved. Metrics are kept in memory and reported by the get_playback_stats
+tool, as JSON or in the Prometheus text exposition format.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .profiling import Tracer
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Prefix of every metric name in the Prometheus output
+METRIC_PREFIX = "mcp_sound_tool_"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Counts of observations per bucket, plus their count, sum and maximum."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket and a last one for values above every bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile by interpolating inside its bucket, as
+        Prometheus' histogram_quantile does.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.max
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = min(self.buckets[i], self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def summary(self) -> dict:
+        """Count, mean, p50, p99 and maximum, in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+def _labels(labels: Mapping[str, str]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{key}="{value}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class PlaybackMetrics:
+    """Thread-safe latency histograms and counters, keyed by name and labels."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], int] = {}
+        self._lock = threading.Lock()
+        # Also records every observation as a trace event when profiling is on
+        self.tracer: Optional["Tracer"] = None
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """Record a duration, e.g. observe("playback_seconds", 0.4, backend="sink")."""
+        key = (name, _labels(labels))
+        if self.tracer is not None:
+            self.tracer.complete(name, time.perf_counter() - seconds, **labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Record how long the enclosed block takes, whether or not it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def count(self, name: str, amount: int = 1, **labels: str) -> None:
+        """Add to a counter, e.g. count("backend_failures", backend="aplay")."""
+        key = (name, _labels(labels))
+        if self.tracer is not None:
+            self.tracer.instant(name, **labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        """The histogram for name and labels, if anything was recorded."""
+        return self._histograms.get((name, _labels(labels)))
+
+    def counter(self, name: str, **labels: str) -> int:
+        return self._counters.get((name, _labels(labels)), 0)
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def stats(self) -> dict:
+        """Latency summaries and counters, keyed like "playback_seconds{backend=sink}"."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        return {
+            "latency": {_stat_key(name, labels): h.summary() for (name, labels), h in histograms},
+            "counters": {_stat_key(name, labels): value for (name, labels), value in counters},
+        }
+
+    def prometheus(self, gauges: Optional[Mapping[str, float]] = None,
+                   counters: Optional[Mapping[str, float]] = None) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        gauges and counters are extra unlabelled values kept elsewhere, such
+        as the queue depth or the sample cache's hit count.
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            own_counters = sorted(self._counters.items())
+        lines: List[str] = []
+        for name, value in sorted((gauges or {}).items()):
+            lines += [f"# TYPE {METRIC_PREFIX}{name} gauge", f"{METRIC_PREFIX}{name} {_format_value(value)}"]
+        for name, value in sorted((counters or {}).items()):
+            lines += [f"# TYPE {METRIC_PREFIX}{name}_total counter",
+                      f"{METRIC_PREFIX}{name}_total {_format_value(value)}"]
+
+        typed = set()
+        for (name, labels), value in own_counters:
+            metric = f"{METRIC_PREFIX}{name}_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+        for (name, labels), histogram in histograms:
+            metric = METRIC_PREFIX + name
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (math.inf,), histogram.counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{metric}_bucket{_format_labels(labels, le)} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum!r}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _stat_key(name: str, labels: Labels) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{key}={value}" for key, value in labels) + "}"
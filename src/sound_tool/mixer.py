@@ -0,0 +1,175 @@
+"""
+In-process mixing of overlapping sounds.
+
+The mixer keeps active clips as NumPy arrays, sums them block by block with
+per-voice gain, limits the result so it never clips, and writes it to a
+single PCM sink. However many sounds overlap, there is one output stream and
+one player process.
+"""
+import itertools
+import logging
+import threading
+import time
+from typing import List
+
+from .numpy_support import INSTALL_HINT, np, numpy_available
+from .pcm import PCMBuffer
+from .sink import PCMSink, SinkError
+
+INT16_MAX = 32767
+
+logger = logging.getLogger(__name__)
+
+
+def mixer_available() -> bool:
+    """Whether NumPy is installed so the mixer can be used."""
+    return numpy_available()
+
+
+def to_array(buffer: PCMBuffer):
+    """View a 16-bit PCM buffer as a (frames, channels) int16 array without copying."""
+    return np.frombuffer(buffer.data, dtype="<i2").reshape(-1, buffer.format.channels)
+
+
+class Voice:
+    """A clip being mixed into the output."""
+
+    def __init__(self, voice_id: int, samples, gain: float = 1.0):
+        self.id = voice_id
+        self.samples = samples
+        self.gain = gain
+        self.position = 0
+        self.done = threading.Event()
+
+    @property
+    def remaining(self) -> int:
+        return len(self.samples) - self.position
+
+    def stop(self) -> None:
+        """Stop mixing this clip; the mixer drops it before the next block."""
+        self.done.set()
+
+
+class Mixer:
+    """Sum active voices into fixed-size blocks and feed them to a sink."""
+
+    def __init__(self, sink: PCMSink, block_frames: int = 1024, max_voices: int = 8,
+                 max_lead: float = 0.1):
+        """
+        Create a mixer writing to sink.
+
+        At most max_voices clips play at once; adding another stops the
+        oldest. The mixer stays at most max_lead seconds ahead of real time
+        so newly added sounds start promptly.
+        """
+        if not numpy_available():
+            raise RuntimeError(f"The mixer requires numpy: {INSTALL_HINT}")
+        if sink.format.sample_width != 2:
+            raise ValueError("The mixer only supports 16-bit PCM")
+        self.sink = sink
+        self.format = sink.format
+        self.block_frames = block_frames
+        self.max_voices = max_voices
+        self.max_lead = max_lead
+        self.blocks = 0
+        self.limited_blocks = 0
+        self._voices: List[Voice] = []
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    @property
+    def active(self) -> int:
+        """Number of voices currently playing."""
+        return sum(1 for voice in self._voices if not voice.done.is_set())
+
+    def add(self, buffer: PCMBuffer, gain: float = 1.0) -> Voice:
+        """Start mixing a clip into the output and return its voice."""
+        if buffer.format != self.format:
+            raise SinkError(f"Buffer format {buffer.format} does not match mixer format {self.format}")
+        voice = Voice(next(self._ids), to_array(buffer), gain)
+        with self._cond:
+            if self._closed:
+                raise SinkError("Mixer is closed")
+            self._voices.append(voice)
+            while len(self._voices) > self.max_voices:
+                self._voices.pop(0).done.set()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sound-mixer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return voice
+
+    def stop_all(self) -> int:
+        """Stop every voice. Returns how many were stopped."""
+        with self._cond:
+            voices, self._voices = self._voices, []
+        for voice in voices:
+            voice.done.set()
+        return len(voices)
+
+    def mix_block(self):
+        """Mix the next block of all active voices; None when nothing is playing."""
+        with self._cond:
+            self._voices = [voice for voice in self._voices if not voice.done.is_set()]
+            voices = list(self._voices)
+        if not voices:
+            return None
+
+        frames = min(self.block_frames, max(v.remaining for v in voices))
+        out = np.zeros((frames, self.format.channels), dtype=np.float32)
+        for voice in voices:
+            chunk = voice.samples[voice.position:voice.position + frames]
+            out[:len(chunk)] += chunk * voice.gain
+            voice.position += len(chunk)
+
+        # Limit instead of hard clipping: scale the block down if it overshoots
+        peak = float(np.abs(out).max()) if frames else 0.0
+        if peak > INT16_MAX:
+            out *= INT16_MAX / peak
+            self.limited_blocks += 1
+        self.blocks += 1
+
+        with self._cond:
+            for voice in voices:
+                if voice.remaining <= 0 and voice in self._voices:
+                    self._voices.remove(voice)
+                    voice.done.set()
+        return out.astype("<i2")
+
+    def _run(self) -> None:
+        """Mixing thread: write blocks to the sink, paced to real time."""
+        started = None
+        written = 0
+        while True:
+            with self._cond:
+                while not self._voices and not self._closed:
+                    started = None
+                    self._cond.wait()
+                if self._closed:
+                    return
+            block = self.mix_block()
+            if block is None:
+                continue
+            if started is None:
+                started, written = time.monotonic(), 0
+            try:
+                self.sink.write(PCMBuffer(block.tobytes(), self.format))
+            except SinkError as e:
+                logger.error("Mixer could not write to sink: %s", e)
+                self.stop_all()
+                continue
+            written += len(block)
+            lead = written / self.format.rate - (time.monotonic() - started)
+            if lead > self.max_lead:
+                time.sleep(lead - self.max_lead)
+
+    def close(self) -> None:
+        """Stop mixing and end the mixing thread."""
+        self.stop_all()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
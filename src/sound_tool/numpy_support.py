@@ -0,0 +1,46 @@
+"""
+Lazy access to NumPy.
+
+Mixing, tone synthesis and loudness normalization need NumPy, which is an
+optional dependency. It takes tens of milliseconds to import, so the
+modules that use it share one stand-in `np` that imports it on first use
+rather than when the server starts.
+"""
+import importlib.util
+from types import ModuleType
+from typing import Any, Optional
+
+# How to install NumPy along with this package, for messages to the user
+INSTALL_HINT = 'pip install "mcp-sound-tool[mixer]"'
+
+_numpy: Optional[ModuleType] = None
+
+
+def numpy_available() -> bool:
+    """Whether NumPy is installed; doesn't import it."""
+    return _numpy is not None or importlib.util.find_spec("numpy") is not None
+
+
+def load_numpy() -> Optional[ModuleType]:
+    """Import NumPy if it is installed and return it."""
+    global _numpy
+    if _numpy is None and numpy_available():
+        import numpy
+        _numpy = numpy
+    return _numpy
+
+
+class _LazyNumPy:
+    """Stands in for the numpy module, importing it on first attribute access."""
+
+    def __getattr__(self, name: str) -> Any:
+        module = load_numpy()
+        if module is None:
+            raise ImportError(f"NumPy is not installed: {INSTALL_HINT}")
+        value = getattr(module, name)
+        # Later lookups of the same name are plain attribute lookups
+        setattr(self, name, value)
+        return value
+
+
+np: Any = _LazyNumPy()
@@ -0,0 +1,166 @@
+"""
+Decoding of sound files to raw PCM sample buffers.
+
+WAV files are read with the standard library. Other formats (MP3) are decoded
+by an external decoder (ffmpeg or mpg123) into the requested sample format.
+"""
+import shutil
+import subprocess
+import wave
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+class DecodeError(Exception):
+    """Raised when a sound file cannot be decoded to PCM."""
+
+
+@dataclass(frozen=True)
+class PCMFormat:
+    """Signed little-endian PCM sample format."""
+
+    rate: int = 44100
+    channels: int = 2
+    sample_width: int = 2
+
+    @property
+    def frame_size(self) -> int:
+        return self.channels * self.sample_width
+
+
+DEFAULT_FORMAT = PCMFormat()
+
+
+@dataclass
+class PCMBuffer:
+    """Decoded audio samples together with their format."""
+
+    data: bytes
+    format: PCMFormat = DEFAULT_FORMAT
+
+    @property
+    def frames(self) -> int:
+        return len(self.data) // self.format.frame_size
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.format.rate
+
+    def trimmed(self, seconds: float) -> "PCMBuffer":
+        """Return the buffer cut to at most the given number of seconds."""
+        max_bytes = int(seconds * self.format.rate) * self.format.frame_size
+        if len(self.data) <= max_bytes:
+            return self
+        return PCMBuffer(self.data[:max_bytes], self.format)
+
+
+def _read_wav(path: str, fmt: PCMFormat) -> Optional[PCMBuffer]:
+    """Read a WAV file directly if it is already in the requested format."""
+    try:
+        with wave.open(path, "rb") as wav:
+            if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (
+                    fmt.rate, fmt.channels, fmt.sample_width):
+                return None
+            return PCMBuffer(wav.readframes(wav.getnframes()), fmt)
+    except (wave.Error, EOFError) as e:
+        raise DecodeError(f"Invalid WAV file {path}: {e}")
+
+
+def _decoder_command(path: str, fmt: PCMFormat) -> Optional[List[str]]:
+    """Build a command line that writes the file as raw PCM to stdout."""
+    if fmt.sample_width != 2:
+        return None
+    if shutil.which("ffmpeg"):
+        return ["ffmpeg", "-v", "quiet", "-i", path,
+                "-f", "s16le", "-ac", str(fmt.channels), "-ar", str(fmt.rate), "-"]
+    if shutil.which("mpg123") and path.lower().endswith(".mp3"):
+        channels = "--mono" if fmt.channels == 1 else "--stereo"
+        return ["mpg123", "-q", "-s", "-e", "s16", "-r", str(fmt.rate), channels, path]
+    return None
+
+
+def decode_file(path: str, fmt: PCMFormat = DEFAULT_FORMAT) -> PCMBuffer:
+    """Decode a sound file into a PCM buffer in the given format."""
+    if path.lower().endswith(".wav"):
+        buffer = _read_wav(path, fmt)
+        if buffer is not None:
+            return buffer
+
+    command = _decoder_command(path, fmt)
+    if command is None:
+        raise DecodeError(f"No decoder available for {path}")
+    try:
+        result = subprocess.run(command, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, check=True)
+    except (subprocess.SubprocessError, OSError) as e:
+        raise DecodeError(f"Failed to decode {path}: {e}")
+    if not result.stdout:
+        raise DecodeError(f"Decoder produced no audio for {path}")
+    return PCMBuffer(result.stdout, fmt)
+
+
+# Layer III bitrates in kbit/s, indexed by the header's bitrate field
+_MPEG1_L3_BITRATES = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_MPEG2_L3_BITRATES = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+_MPEG1_SAMPLE_RATES = (44100, 48000, 32000)
+
+
+def _mp3_duration(path: str) -> Optional[float]:
+    """Estimate an MP3's duration from its first frame header (and Xing tag)."""
+    with open(path, "rb") as f:
+        data = f.read(4096)
+        f.seek(0, 2)
+        size = f.tell()
+
+    offset = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        # Skip the ID3v2 tag; its size is a 28-bit syncsafe integer
+        offset = 10 + ((data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9])
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read(4096)
+        size -= offset
+        offset = 0
+
+    while offset + 4 <= len(data):
+        if data[offset] == 0xFF and data[offset + 1] & 0xE0 == 0xE0:
+            break
+        offset += 1
+    else:
+        return None
+
+    header = int.from_bytes(data[offset:offset + 4], "big")
+    version = (header >> 19) & 0x3  # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+    layer = (header >> 17) & 0x3  # 1 = Layer III
+    bitrate_index = (header >> 12) & 0xF
+    rate_index = (header >> 10) & 0x3
+    mono = (header >> 6) & 0x3 == 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    rate = _MPEG1_SAMPLE_RATES[rate_index] >> (0 if mpeg1 else 1 if version == 2 else 2)
+    samples_per_frame = 1152 if mpeg1 else 576
+
+    # A Xing/Info tag after the side information gives the exact frame count
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    tag = offset + 4 + side_info
+    if data[tag:tag + 4] in (b"Xing", b"Info") and data[tag + 7] & 0x1:
+        frames = int.from_bytes(data[tag + 8:tag + 12], "big")
+        return frames * samples_per_frame / rate
+
+    bitrates = _MPEG1_L3_BITRATES if mpeg1 else _MPEG2_L3_BITRATES
+    return (size - offset) * 8 / (bitrates[bitrate_index] * 1000)
+
+
+def probe_duration(path: str) -> Optional[float]:
+    """Return a sound file's duration in seconds without decoding it, if known."""
+    try:
+        if path.lower().endswith(".wav"):
+            with wave.open(path, "rb") as wav:
+                return wav.getnframes() / wav.getframerate()
+        if path.lower().endswith(".mp3"):
+            return _mp3_duration(path)
+    except (OSError, wave.Error, EOFError, IndexError):
+        pass
+    return None
@@ -0,0 +1,420 @@
+"""
+Asynchronous playback scheduling for the sound tool.
+
+The scheduler accepts play requests from the MCP tools, queues them and plays
+them one at a time on a background worker task, so a tool call never has to
+wait for a clip to finish unless it asks to.
+
+Requests are ordered by priority (lower values first, by default
+error > notification > completion > custom). A higher-priority request
+preempts whatever lower-priority sound is playing, and lower-priority
+requests that wait too long are dropped instead of being played late.
+Requests of the same priority from different clients are taken in turn, so
+one busy client cannot starve the others.
+
+Sounds handed to the mixer keep playing after the player returns, so the
+next request can start over them; their tickets stay playing until the
+mixer has finished them and can be stopped or preempted one by one.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Set
+
+if TYPE_CHECKING:
+    from .metrics import PlaybackMetrics
+
+DROP_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+DEFAULT_PRIORITIES = {"error": 0, "notification": 1, "completion": 2, "custom": 3}
+
+# Ticket states
+QUEUED = "queued"
+PLAYING = "playing"
+DONE = "done"
+FAILED = "failed"
+DROPPED = "dropped"
+CANCELLED = "cancelled"
+PREEMPTED = "preempted"
+
+FINISHED_STATES = (DONE, FAILED, DROPPED, CANCELLED, PREEMPTED)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_priorities(spec: str) -> Dict[str, int]:
+    """
+    Parse a "type=priority,type=priority" string into a priority mapping.
+
+    Malformed entries are skipped with a warning.
+    """
+    priorities = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        try:
+            priority = int(value)
+        except ValueError:
+            priority = None
+        if not name.strip() or priority is None:
+            logger.warning("Ignoring invalid sound priority %r: expected type=integer", item.strip())
+            continue
+        priorities[name.strip()] = priority
+    return priorities
+
+
+@dataclass
+class PlaybackTicket:
+    """A single play request and its current state."""
+
+    id: int
+    sound_type: str
+    path: str
+    priority: int = 0
+    submitted: float = 0.0
+    status: str = QUEUED
+    error: Optional[str] = None
+    # Who asked for the sound, for fair queuing between clients
+    client: Optional[str] = None
+    finished: Optional[asyncio.Event] = field(default=None, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+
+class PlaybackScheduler:
+    """Queue play requests by priority and play them on a background worker task."""
+
+    def __init__(self, play_func: Callable[[str], Any], max_queue: int = 16,
+                 drop_policy: str = "drop_oldest", history_size: int = 256,
+                 stop_func: Optional[Callable[[], None]] = None,
+                 priorities: Optional[Mapping[str, int]] = None,
+                 preempt: bool = True, stale_after: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 metrics: Optional["PlaybackMetrics"] = None):
+        """
+        Create a scheduler.
+
+        play_func is a blocking callable that plays a single file; it is run
+        in the default executor so the event loop stays responsive. It may
+        instead start the sound and return a handle while it plays on (a
+        mixer voice): an object with a `done` threading.Event and a `stop()`
+        method. stop_func, if given, interrupts whatever play_func is playing
+        and is needed for cancellation and preemption.
+
+        Sound types missing from priorities get the lowest priority. If
+        stale_after is set, requests other than the top priority are dropped
+        once they have waited that many seconds. metrics, if given, records
+        how long tickets wait in the queue and how they end.
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.play_func = play_func
+        self.stop_func = stop_func
+        self.max_queue = max(1, max_queue)
+        self.drop_policy = drop_policy
+        self.history_size = history_size
+        self.priorities = dict(DEFAULT_PRIORITIES if priorities is None else priorities)
+        self.preempt = preempt
+        self.stale_after = stale_after
+        self.clock = clock
+        self.metrics = metrics
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._tickets = OrderedDict()
+        # (priority, fair-queuing tag, sequence number, ticket)
+        self._heap = []
+        self._client_tags: Dict[Optional[str], int] = {}
+        self._virtual_time = 0
+        self._cond = None
+        self._worker = None
+        self._loop = None
+        self._current: Optional[PlaybackTicket] = None
+        # Tickets whose sound plays on after play_func returned, with its handle
+        self._handles: Dict[int, Any] = {}
+        self._watchers: Set[asyncio.Task] = set()
+
+    def _ensure_worker(self) -> None:
+        """Start the worker task on the running loop if it isn't running yet."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # asyncio primitives are bound to a loop, so start fresh on a new one
+            self._loop = loop
+            self._cond = asyncio.Condition()
+            self._heap = []
+            self._client_tags = {}
+            self._virtual_time = 0
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+
+    def priority_of(self, sound_type: str) -> int:
+        """Priority of a sound type; lower values play first."""
+        lowest = max(self.priorities.values(), default=0)
+        return self.priorities.get(sound_type, lowest)
+
+    @property
+    def playing(self) -> List[PlaybackTicket]:
+        """The tickets that are playing right now, in the order they started."""
+        tickets = [self._tickets[ticket_id] for ticket_id in list(self._handles)
+                   if ticket_id in self._tickets]
+        if self._current is not None:
+            tickets.append(self._current)
+        return [ticket for ticket in tickets if not ticket.is_finished]
+
+    @property
+    def current(self) -> Optional[PlaybackTicket]:
+        """The ticket that started playing last, if any is playing."""
+        playing = self.playing
+        return playing[-1] if playing else None
+
+    @property
+    def depth(self) -> int:
+        """Number of requests waiting to be played."""
+        # Cancelled tickets stay in the heap until they are popped
+        return sum(1 for item in self._heap if not item[3].is_finished)
+
+    def _purge(self) -> None:
+        """Remove cancelled tickets from the heap."""
+        live = [item for item in self._heap if not item[3].is_finished]
+        if len(live) != len(self._heap):
+            heapq.heapify(live)
+            self._heap = live
+
+    def get(self, ticket_id: int) -> Optional[PlaybackTicket]:
+        """Look up a ticket by ID."""
+        return self._tickets.get(ticket_id)
+
+    def is_pending(self, path: str) -> bool:
+        """Whether a queued or playing ticket plays path."""
+        return any(ticket.path == path and not ticket.is_finished
+                   for ticket in list(self._tickets.values()))
+
+    def _remember(self, ticket: PlaybackTicket) -> None:
+        self._tickets[ticket.id] = ticket
+        while len(self._tickets) > self.history_size:
+            oldest_id = next(iter(self._tickets))
+            if not self._tickets[oldest_id].is_finished:
+                break
+            del self._tickets[oldest_id]
+
+    def _finish(self, ticket: PlaybackTicket, status: str, error: Optional[str] = None) -> None:
+        if ticket.is_finished:
+            return
+        ticket.status = status
+        ticket.error = error
+        ticket.finished.set()
+        if self.metrics is not None:
+            self.metrics.count("tickets", status=status)
+
+    def _evict(self, newest_first: bool) -> PlaybackTicket:
+        """Remove the lowest-priority queued ticket (oldest or newest among equals)."""
+        if newest_first:
+            victim = max(self._heap, key=lambda item: (item[0], item[2]))
+        else:
+            victim = max(self._heap, key=lambda item: (item[0], -item[2]))
+        self._heap.remove(victim)
+        heapq.heapify(self._heap)
+        return victim[3]
+
+    def _fair_tag(self, client: Optional[str]) -> int:
+        """
+        Virtual finish time of a client's next request.
+
+        Each client's requests get consecutive tags starting from the current
+        virtual time, so equal-priority requests from different clients
+        interleave instead of queueing behind each other.
+        """
+        tag = max(self._virtual_time, self._client_tags.get(client, 0)) + 1
+        self._client_tags[client] = tag
+        return tag
+
+    async def submit(self, sound_type: str, path: str, priority: Optional[int] = None,
+                     client: Optional[str] = None) -> PlaybackTicket:
+        """
+        Queue a sound for playback and return its ticket straight away.
+
+        The priority defaults to that of sound_type. client identifies who
+        asked for the sound, for fair queuing between clients.
+        """
+        self._ensure_worker()
+        if priority is None:
+            priority = self.priority_of(sound_type)
+        ticket = PlaybackTicket(id=next(self._ids), sound_type=sound_type, path=path,
+                                priority=priority, submitted=self.clock(), client=client,
+                                finished=asyncio.Event())
+        self._remember(ticket)
+
+        async with self._cond:
+            self._purge()
+            if len(self._heap) >= self.max_queue:
+                if self.drop_policy == "block":
+                    await self._cond.wait_for(lambda: self.depth < self.max_queue)
+                    self._purge()
+                else:
+                    # The lowest-priority sound makes room; a new sound only
+                    # loses against queued sounds of the same or higher priority
+                    newest = self.drop_policy == "drop_newest"
+                    worst = max(item[0] for item in self._heap)
+                    if ticket.priority > worst or (newest and ticket.priority == worst):
+                        self._finish(ticket, DROPPED, "playback queue is full")
+                        return ticket
+                    victim = self._evict(newest_first=newest)
+                    self._finish(victim, DROPPED, "superseded by a newer sound")
+
+            heapq.heappush(self._heap, (ticket.priority, self._fair_tag(client),
+                                        next(self._seq), ticket))
+            self._cond.notify_all()
+
+        if self.preempt:
+            for current in self.playing:
+                if ticket.priority < current.priority and self._interrupt(current):
+                    self._finish(current, PREEMPTED,
+                                 f"preempted by {sound_type} sound (ticket {ticket.id})")
+        return ticket
+
+    def _interrupt(self, ticket: PlaybackTicket) -> bool:
+        """Stop the sound of a playing ticket. Returns False if it can't be stopped."""
+        handle = self._handles.get(ticket.id)
+        if handle is not None:
+            handle.stop()
+        elif self.stop_func is not None:
+            self.stop_func()
+        else:
+            return False
+        return True
+
+    async def wait(self, ticket: PlaybackTicket) -> PlaybackTicket:
+        """Wait until a ticket has been played, failed or dropped."""
+        await ticket.finished.wait()
+        return ticket
+
+    def _is_stale(self, ticket: PlaybackTicket) -> bool:
+        if self.stale_after is None:
+            return False
+        if ticket.priority <= min(self.priorities.values(), default=0):
+            return False
+        return self.clock() - ticket.submitted > self.stale_after
+
+    async def _next(self) -> PlaybackTicket:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._heap)
+            _, tag, _, ticket = heapq.heappop(self._heap)
+            # Skip past cancelled tickets without waking the worker for each
+            while ticket.is_finished and self._heap:
+                _, tag, _, ticket = heapq.heappop(self._heap)
+            self._virtual_time = max(self._virtual_time, tag)
+            if not self._heap:
+                # Nothing is waiting, so no client is owed a turn
+                self._client_tags.clear()
+            self._cond.notify_all()
+            return ticket
+
+    async def _run(self) -> None:
+        """Worker loop: play queued tickets one at a time, highest priority first."""
+        loop = asyncio.get_running_loop()
+        while True:
+            ticket = await self._next()
+            if ticket.is_finished:
+                continue
+            if self._is_stale(ticket):
+                self._finish(ticket, DROPPED, f"stale after waiting {self.stale_after:g}s")
+                continue
+            if self.metrics is not None:
+                self.metrics.observe("queue_wait_seconds", self.clock() - ticket.submitted)
+            try:
+                ticket.status = PLAYING
+                self._current = ticket
+                handle = await loop.run_in_executor(None, self.play_func, ticket.path)
+                if not isinstance(getattr(handle, "done", None), threading.Event):
+                    self._finish(ticket, DONE)
+                elif ticket.is_finished:
+                    # Stopped or preempted while it was starting
+                    handle.stop()
+                else:
+                    self._handles[ticket.id] = handle
+                    watcher = loop.create_task(self._watch(ticket, handle))
+                    self._watchers.add(watcher)
+                    watcher.add_done_callback(self._watchers.discard)
+            except asyncio.CancelledError:
+                self._finish(ticket, DROPPED, "scheduler shut down")
+                if self.stop_func is not None:
+                    self.stop_func()
+                raise
+            except Exception as e:
+                self._finish(ticket, FAILED, str(e))
+            finally:
+                self._current = None
+                async with self._cond:
+                    self._cond.notify_all()
+
+    async def _watch(self, ticket: PlaybackTicket, handle: Any) -> None:
+        """Finish a ticket once the sound it handed off has played."""
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, handle.done.wait)
+            self._finish(ticket, DONE)
+        finally:
+            self._handles.pop(ticket.id, None)
+            async with self._cond:
+                self._cond.notify_all()
+
+    def cancel(self, ticket_id: Optional[int] = None) -> Optional[PlaybackTicket]:
+        """
+        Cancel a queued or playing ticket; without an ID, stop every sound
+        that is playing.
+
+        Returns the cancelled ticket (without an ID, the one that started
+        last), or None if there was nothing to cancel.
+        """
+        if ticket_id is None:
+            cancelled = None
+            for ticket in self.playing:
+                cancelled = self.cancel(ticket.id) or cancelled
+            return cancelled
+        ticket = self.get(ticket_id)
+        if ticket is None or ticket.is_finished:
+            return None
+        if ticket.status == PLAYING:
+            self._interrupt(ticket)
+        self._finish(ticket, CANCELLED, "stopped by request")
+        return ticket
+
+    def cancel_all(self) -> int:
+        """Cancel the current ticket and everything queued. Returns how many."""
+        pending = [t for t in self._tickets.values() if not t.is_finished]
+        for ticket in pending:
+            self.cancel(ticket.id)
+        return len(pending)
+
+    async def join(self) -> None:
+        """Wait until every queued request has been handled."""
+        if self._cond is None:
+            return
+        async with self._cond:
+            await self._cond.wait_for(lambda: not self.depth and self._current is None
+                                      and not self._handles)
+
+    async def shutdown(self) -> None:
+        """Stop the worker and drop anything still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._heap:
+            ticket = heapq.heappop(self._heap)[3]
+            self._finish(ticket, DROPPED, "scheduler shut down")
+        for ticket in self.playing:
+            self._interrupt(ticket)
+            self._finish(ticket, DROPPED, "scheduler shut down")
+        if self._watchers:
+            await asyncio.gather(*self._watchers, return_exceptions=True)
@@ -0,0 +1,231 @@
+"""
+Opt-in per-call profiling and tracing.
+
+With profiling on, every tool call is recorded as a span, and so is every
+stage the playback metrics time (lookup, queue wait, decoding, player
+start-up, playback per backend). Counted events such as a player failing
+in the Linux fallback loop are recorded as instant events. The spans are
+written in the Chrome trace event format, which chrome://tracing and
+Perfetto open, to a trace directory.
+
+Tool calls are also run under cProfile, one at a time; the profiles of
+the slowest calls are kept and summarized by the dump_profile tool. Only
+the thread the call runs on is profiled, so playback on the scheduler
+thread shows up in the trace but not in the hot spots.
+
+With profiling off no tool is wrapped, and recording a metric costs one
+attribute check.
+"""
+import cProfile
+import functools
+import heapq
+import inspect
+import itertools
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config import cache_dir
+
+# Most trace events kept in memory; older ones are dropped
+MAX_EVENTS = 100_000
+
+logger = logging.getLogger(__name__)
+
+
+def default_trace_dir() -> str:
+    """Trace directory under the user's cache directory."""
+    return cache_dir("traces")
+
+
+def _trace_arg(value: Any) -> Any:
+    """A tool argument as it is shown in the trace."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+class Tracer:
+    """Trace events of tool calls and playback stages, and profiles of the slowest calls."""
+
+    def __init__(self, trace_dir: Optional[str] = None, slowest: int = 5,
+                 max_events: int = MAX_EVENTS):
+        """
+        Create a tracer that writes its trace to trace_dir.
+
+        The cProfile profiles of the slowest calls are kept; 0 turns
+        cProfile off and only records spans.
+        """
+        self.trace_dir = trace_dir or default_trace_dir()
+        self.slowest = slowest
+        self.origin = time.perf_counter()
+        self.trace_file: Optional[str] = None
+        self._events = deque(maxlen=max_events)
+        self._threads: Dict[int, str] = {}
+        # Min-heap of (duration, sequence, tool, profile), so the fastest is dropped first
+        self._profiles: List[Tuple[float, int, str, cProfile.Profile]] = []
+        self._ids = itertools.count()
+        self._profiling = False
+        self._lock = threading.Lock()
+
+    def _event(self, name: str, phase: str, started: float, **fields: Any) -> None:
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self._events.append({"name": name, "ph": phase, "ts": (started - self.origin) * 1e6,
+                             "pid": os.getpid(), "tid": tid, **fields})
+
+    def complete(self, name: str, started: float, ended: Optional[float] = None,
+                 category: str = "metric", **args: Any) -> None:
+        """Record a span that ran from started to ended (perf_counter values)."""
+        ended = ended if ended is not None else time.perf_counter()
+        self._event(name, "X", started, cat=category, dur=(ended - started) * 1e6, args=args)
+
+    def instant(self, name: str, category: str = "metric", **args: Any) -> None:
+        """Record a point in time, e.g. a player failing."""
+        self._event(name, "i", time.perf_counter(), cat=category, s="t", args=args)
+
+    def _start_profile(self) -> Optional[cProfile.Profile]:
+        if not self.slowest:
+            return None
+        with self._lock:
+            # Only one profiler can be active; concurrent calls are traced only
+            if self._profiling:
+                return None
+            self._profiling = True
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler, e.g. a debugger's, is already active
+            with self._lock:
+                self._profiling = False
+            return None
+        return profile
+
+    def _finish_call(self, name: str, started: float, profile: Optional[cProfile.Profile],
+                     args: Dict[str, Any]) -> None:
+        ended = time.perf_counter()
+        if profile is not None:
+            profile.disable()
+        self.complete(name, started, ended, category="tool", **args)
+        if profile is None:
+            return
+        with self._lock:
+            self._profiling = False
+            entry = (ended - started, next(self._ids), name, profile)
+            if len(self._profiles) < self.slowest:
+                heapq.heappush(self._profiles, entry)
+            elif entry[0] > self._profiles[0][0]:
+                heapq.heapreplace(self._profiles, entry)
+
+    def wrap(self, name: str, fn: Callable, skip: Tuple[Optional[str], ...] = ()) -> Callable:
+        """
+        Wrap a tool function so every call is traced and profiled.
+
+        Arguments named in skip, such as the MCP context, are left out of
+        the trace.
+        """
+        def call_args(kwargs):
+            return {key: _trace_arg(value) for key, value in kwargs.items() if key not in skip}
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                profile = self._start_profile()
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    self._finish_call(name, started, profile, call_args(kwargs))
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                profile = self._start_profile()
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self._finish_call(name, started, profile, call_args(kwargs))
+        return wrapper
+
+    def slowest_calls(self) -> List[Tuple[str, float]]:
+        """Tool and duration in seconds of each profiled call kept, slowest first."""
+        with self._lock:
+            profiles = sorted(self._profiles, reverse=True)
+        return [(name, duration) for duration, _, name, _ in profiles]
+
+    def hot_spots(self, limit: int = 20) -> List[Tuple[str, int, float, float]]:
+        """
+        Functions that took the most time across the slowest calls, as
+        (function, calls, own seconds, cumulative seconds), by own time.
+        """
+        with self._lock:
+            profiles = [profile for _, _, _, profile in self._profiles]
+        if not profiles:
+            return []
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        rows = []
+        for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+            where = f"{function} ({os.path.basename(filename)}:{line})" if line else function
+            rows.append((where, calls, own, cumulative))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:limit]
+
+    def dump(self, limit: int = 20) -> str:
+        """Report the slowest calls and their hot spots, and write the trace file."""
+        lines = []
+        calls = self.slowest_calls()
+        if calls:
+            lines.append("Slowest calls:")
+            lines.extend(f"  {name:<24} {duration * 1000:9.2f} ms" for name, duration in calls)
+            lines.append("Hot spots (own time, cumulative time, calls):")
+            lines.extend(f"  {own * 1000:9.2f} ms {cumulative * 1000:9.2f} ms {count:7d}  {where}"
+                         for where, count, own, cumulative in self.hot_spots(limit))
+        elif self.slowest:
+            lines.append("No tool calls profiled yet.")
+        path = self.write_trace()
+        if path is not None:
+            lines.append(f"Trace written to {path}")
+        return "\n".join(lines)
+
+    def trace(self) -> dict:
+        """The events recorded so far as a Chrome trace."""
+        events = list(self._events)
+        metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                     "args": {"name": name}} for tid, name in list(self._threads.items())]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def write_trace(self) -> Optional[str]:
+        """
+        Write the events recorded so far to this process's trace file,
+        replacing what was written before. Returns its path, or None if
+        it could not be written.
+        """
+        if self.trace_file is None:
+            name = f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json"
+            self.trace_file = os.path.join(self.trace_dir, name)
+        temp = self.trace_file + ".tmp"
+        try:
+            os.makedirs(self.trace_dir, exist_ok=True)
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(self.trace(), f, separators=(",", ":"))
+            os.replace(temp, self.trace_file)
+        except OSError as e:
+            logger.warning("Could not write trace to %s: %s", self.trace_file, e)
+            return None
+        return self.trace_file
+
+    def close(self) -> None:
+        """Write the trace, if anything was recorded."""
+        if self._events:
+            path = self.write_trace()
+            if path is not None:
+                logger.info("Trace written to %s", path)
@@ -0,0 +1,176 @@
+"""
+PulseAudio sample cache.
+
+paplay opens and decodes a file and streams its samples to the sound server
+every time a sound plays. PulseAudio (and PipeWire's PulseAudio server) can
+keep samples itself instead: each catalog sound is uploaded once with
+`pactl upload-sample`, and `pactl play-sample` then only sends the sample's
+name over the socket.
+
+Samples are named after the content hash of their file, so a changed file
+is uploaded under a new name and the old sample is removed. Sounds can be
+uploaded from another file instead, e.g. a loudness-normalized variant.
+
+`pactl play-sample` returns as soon as the sample starts, so playing waits
+out the sound's duration to keep cues from overlapping; only sounds of
+known duration are played this way. Stopping ends the wait, but the sound
+server plays the sample to its end.
+"""
+import hashlib
+import logging
+import shutil
+import subprocess
+import threading
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .catalog import SoundEntry
+    from .transcode import VariantCache
+
+# Prefix of every sample this tool uploads
+SAMPLE_PREFIX = "mcp-sound-tool-"
+
+# Formats pactl can upload on every version (it reads files with libsndfile)
+UPLOAD_FORMATS = ("wav", "flac", "ogg")
+
+logger = logging.getLogger(__name__)
+
+
+def sample_name(entry: "SoundEntry", source: Optional[str] = None) -> str:
+    """Name of the sample for a catalog entry, or for a copy of it uploaded from source."""
+    name = SAMPLE_PREFIX + entry.hash[:16]
+    if source is not None:
+        name += "-" + hashlib.sha256(source.encode("utf-8")).hexdigest()[:8]
+    return name
+
+
+class PulseSampleCache:
+    """Catalog sounds uploaded to the sound server, played by name."""
+
+    def __init__(self, pactl: str = "pactl", variants: Optional["VariantCache"] = None,
+                 timeout: float = 5.0):
+        """
+        Create a sample cache that runs the given pactl.
+
+        Sounds in formats pactl may not read (MP3) are uploaded as their WAV
+        variant, which is made with variants if it doesn't exist yet.
+        """
+        self.pactl = pactl
+        self.variants = variants
+        self.timeout = timeout
+        self.uploads = 0
+        # Passed to the last sync; reset when the samples need uploading again
+        self.generation: Optional[Hashable] = None
+        self._available: Optional[bool] = None
+        # Sample names on the server, and the sample and its duration for each playable path
+        self._uploaded = set()
+        self._samples: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _run(self, *args: str) -> bool:
+        try:
+            subprocess.run([self.pactl, *args], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=self.timeout, check=True)
+            return True
+        except (subprocess.SubprocessError, OSError):
+            return False
+
+    @property
+    def available(self) -> bool:
+        """Whether pactl is installed and a sound server answers; checked once."""
+        if self._available is None:
+            self._available = shutil.which(self.pactl) is not None and self._run("stat")
+        return self._available
+
+    def _upload_source(self, entry: "SoundEntry") -> Optional[str]:
+        """The file to upload for an entry: the original, or a WAV variant."""
+        if entry.format in UPLOAD_FORMATS:
+            return entry.path
+        if entry.variant is not None:
+            return entry.variant
+        if self.variants is not None:
+            return self.variants.ensure(entry.path, entry.hash)
+        return None
+
+    def sync(self, entries: Iterable["SoundEntry"], generation: Optional[Hashable] = None,
+             sources: Optional[Mapping[str, str]] = None) -> int:
+        """
+        Upload the entries of known duration that aren't on the server yet
+        and remove samples of files that are gone.
+
+        Nothing is done if generation equals the one of the last sync, so
+        callers can pass a value that changes whenever the catalog does.
+        sources maps an entry's path to a file to upload in its place.
+        Returns how many sounds were uploaded.
+        """
+        if not self.available:
+            # Recorded anyway, so callers don't keep retrying an unchanged catalog
+            self.generation = generation
+            return 0
+        with self._lock:
+            if generation is not None and generation == self.generation:
+                return 0
+            uploaded = 0
+            samples = {}
+            for entry in entries:
+                if entry.duration is None:
+                    continue
+                source = sources.get(entry.path) if sources else None
+                name = sample_name(entry, source)
+                if name not in self._uploaded:
+                    source = source or self._upload_source(entry)
+                    if source is None or not self._run("upload-sample", source, name):
+                        logger.warning("Could not upload %s to the sound server", entry.path)
+                        continue
+                    self._uploaded.add(name)
+                    uploaded += 1
+                samples[entry.path] = samples[entry.playable_path] = (name, entry.duration)
+            for name in self._uploaded - {name for name, _ in samples.values()}:
+                self._run("remove-sample", name)
+                self._uploaded.discard(name)
+            self._samples = samples
+            self.generation = generation
+            self.uploads += uploaded
+        if uploaded:
+            logger.info("Uploaded %d sound(s) to the sound server's sample cache", uploaded)
+        return uploaded
+
+    def play(self, sound_file: str, stop: Optional[threading.Event] = None,
+             max_duration: Optional[float] = None) -> bool:
+        """
+        Play the sample uploaded for sound_file and wait until it has played
+        or stop is set.
+
+        Returns False if there is none, if it is longer than max_duration (so
+        it is played in a way that can cut it off), or if the server doesn't
+        know it any more, in which case the next sync uploads everything again.
+        """
+        sample = self._samples.get(sound_file)
+        if sample is None:
+            return False
+        name, duration = sample
+        if max_duration and duration > max_duration:
+            return False
+        if self._run("play-sample", name):
+            (stop or threading.Event()).wait(duration)
+            return True
+        with self._lock:
+            # The sound server may have restarted and lost its samples
+            self._uploaded.clear()
+            self._samples = {}
+            self.generation = None
+        return False
+
+    @property
+    def samples(self) -> List[str]:
+        """Names of the samples this cache has uploaded."""
+        return sorted(self._uploaded)
+
+    def close(self) -> None:
+        """Remove the uploaded samples from the sound server."""
+        with self._lock:
+            for name in self._uploaded:
+                self._run("remove-sample", name)
+            self._uploaded.clear()
+            self._samples = {}
+            self.generation = None
@@ -0,0 +1,144 @@
+"""
+Rendering of sound sequences into a single clip.
+
+play_sequence concatenates several decoded sounds, separated by silent gaps
+and optionally repeated, into one WAV file. Every backend can play WAV, so
+the whole sequence needs a single player invocation (or a single sink write).
+Rendered files are memoized by the content of their parts.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from .cache import SampleCache
+from .pcm import PCMBuffer, PCMFormat, DEFAULT_FORMAT
+
+
+def concatenate(buffers: List[PCMBuffer], gap: float = 0.0, repeat: int = 1,
+                fmt: PCMFormat = DEFAULT_FORMAT) -> PCMBuffer:
+    """Join buffers with gap seconds of silence between them, repeat times over."""
+    silence = b"\x00" * (int(gap * fmt.rate) * fmt.frame_size)
+    parts = []
+    for buffer in buffers * max(1, repeat):
+        if buffer.format != fmt:
+            raise ValueError(f"Buffer format {buffer.format} does not match {fmt}")
+        if parts and silence:
+            parts.append(silence)
+        parts.append(buffer.data)
+    return PCMBuffer(b"".join(parts), fmt)
+
+
+def write_wav(path: str, buffer: PCMBuffer) -> None:
+    """Write a PCM buffer to a WAV file."""
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(buffer.format.channels)
+        wav.setsampwidth(buffer.format.sample_width)
+        wav.setframerate(buffer.format.rate)
+        wav.writeframes(buffer.data)
+
+
+class SequenceRenderer:
+    """Render sequences of sound files to WAV files, memoizing the results."""
+
+    def __init__(self, cache: SampleCache, fmt: PCMFormat = DEFAULT_FORMAT,
+                 directory: Optional[str] = None, max_files: int = 32,
+                 in_use: Optional[Callable[[str], bool]] = None):
+        """
+        Create a renderer that keeps at most max_files rendered files.
+
+        in_use, if given, tells whether a rendered file is still waiting to
+        be played; such files are kept even beyond max_files.
+        """
+        self.cache = cache
+        self.format = fmt
+        self.max_files = max_files
+        self.in_use = in_use
+        self._directory = directory
+        self._owns_directory = directory is None
+        self._rendered = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="mcp-sound-tool-")
+        return self._directory
+
+    def render(self, paths: List[str], gap: float = 0.2, repeat: int = 1) -> str:
+        """Render the files at paths into one WAV file and return its path."""
+        key_source = "|".join(self.cache.content_hash(path) for path in paths)
+        return self.render_with(
+            f"sequence|{key_source}|{gap}|{repeat}",
+            lambda: concatenate([self.cache.load(path, self.format) for path in paths],
+                                gap, repeat, self.format),
+        )
+
+    def render_with(self, key_source: str, build: Callable[[], PCMBuffer]) -> str:
+        """
+        Return the WAV file for key_source, calling build to create it if needed.
+
+        Anything that can be described by a string key (a sequence, a tone)
+        can be rendered and memoized this way.
+        """
+        key = hashlib.sha256(f"{key_source}|{self.format}".encode()).hexdigest()[:16]
+        with self._lock:
+            rendered = self._rendered.get(key)
+            if rendered is not None and os.path.exists(rendered):
+                self._rendered.move_to_end(key)
+                return rendered
+
+        buffer = build()
+        target = os.path.join(self.directory, f"render-{key}.wav")
+        # Write to a unique temporary name first so a player never sees a
+        # partial file, even when the same sound is rendered twice at once
+        fd, partial = tempfile.mkstemp(dir=self.directory, prefix=f".render-{key}.", suffix=".part")
+        os.close(fd)
+        try:
+            write_wav(partial, buffer)
+            os.replace(partial, target)
+        except BaseException:
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            self._rendered[key] = target
+            self._rendered.move_to_end(key)
+            self._evict(keep=key)
+        return target
+
+    def _evict(self, keep: str) -> None:
+        """Remove the least recently used files beyond max_files, except those in use."""
+        excess = len(self._rendered) - self.max_files
+        for key, path in list(self._rendered.items()):
+            if excess <= 0:
+                break
+            if key == keep or (self.in_use is not None and self.in_use(path)):
+                continue
+            del self._rendered[key]
+            excess -= 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Remove rendered files (and the temporary directory if we created it)."""
+        with self._lock:
+            rendered, self._rendered = list(self._rendered.values()), OrderedDict()
+        if self._owns_directory and self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+            return
+        for path in rendered:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
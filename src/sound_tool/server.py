@@ -1,68 +1,372 @@
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+import argparse
+import asyncio
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import logging
+import math
 import os
 import platform
 import subprocess
+import threading
 import time
-import shutil
-from typing import Optional, Literal
+from dataclasses import replace
+from typing import Dict, List, Optional, Literal, Tuple
 from importlib import resources
 import importlib.resources as pkg_resources
 
+from .backends import BackendRegistry
+from .cache import SampleCache
+from .catalog import SoundCatalog, SoundEntry
+from .daemon import DaemonClient
+from .log import configure_logging, shutdown_logging
+from .install import InstallSummary, bundled_sounds, sound_files, sync_files
+from .clients import ClientLimiter
+from .coalesce import EventCoalescer, COALESCED, RATE_LIMITED
+from .config import SoundToolConfig, LOG_LEVELS, TRANSPORTS
+from .loudness import Loudness, apply_gain, gain_for, loudness_available, measure, needs_gain
+from .metrics import PlaybackMetrics
+from .mixer import Mixer, Voice, mixer_available
+from .numpy_support import INSTALL_HINT
+from .pcm import DecodeError, DEFAULT_FORMAT
+from .profiling import Tracer
+from .pulse import PulseSampleCache
+from .playback import (
+    PlaybackScheduler, PlaybackTicket, parse_priorities, DEFAULT_PRIORITIES,
+    DONE, DROPPED, CANCELLED, FAILED, PREEMPTED,
+)
+from .sequence import SequenceRenderer
+from .sink import PCMSink, RecordingSink, SinkError
+from .soundbank import BANK_FILENAME, BANK_PREFIX, SoundBank, SoundBankError
+from .synth import PRESETS, ToneSpec, render_notes, synth_available
+from .tool_definition import TOOLS, describe, schema_size, server_description, tool_schema
+from .transcode import VariantCache, transcode_entries
+from .startup import IMPORT_STARTED, PROFILE
+from .supervisor import PlaybackCancelled, PlaybackSupervisor, PlaybackTimeout
+
+PROFILE.record("import modules", IMPORT_STARTED)
+
+logger = logging.getLogger(__name__)
+
 
 class SoundPlayer:
     """Class to handle sound playback on different platforms."""
     
-    @staticmethod
-    def play_sound(sound_file: str) -> None:
+    def __init__(self, sink: Optional[PCMSink] = None, cache: Optional[SampleCache] = None,
+                 registry: Optional[BackendRegistry] = None, max_duration: Optional[float] = 30.0,
+                 mixer: Optional[Mixer] = None, bank: Optional[SoundBank] = None,
+                 metrics: Optional[PlaybackMetrics] = None,
+                 samples: Optional[PulseSampleCache] = None):
+        """
+        Create a player, optionally backed by a persistent PCM sink and sample cache.
+
+        With a mixer, sounds are handed to it and play() returns their voice
+        at once so overlapping sounds are mixed into one stream. Sounds are cut off after
+        max_duration seconds (None for no limit). Paths starting with "bank:"
+        are played from the memory-mapped sound bank. With samples, sounds
+        uploaded to the PulseAudio sample cache are played from there first.
+        Playback time per backend and failed backends are recorded in metrics.
+        """
+        self.sink = sink
+        self.samples = samples
+        # Loudness normalization gain per playable path (and "bank:" name), for
+        # decoded playback, and the normalized variant played by player processes
+        self.gains: Dict[str, float] = {}
+        self.normalized: Dict[str, str] = {}
+        self.mixer = mixer
+        self.bank = bank
+        self.metrics = metrics if metrics is not None else PlaybackMetrics()
+        self.cache = cache if cache is not None else SampleCache()
+        if self.cache.metrics is None:
+            self.cache.metrics = self.metrics
+        self.registry = registry if registry is not None else BackendRegistry()
+        self.supervisor = PlaybackSupervisor(self.metrics)
+        self.max_duration = max_duration
+        self._stop = threading.Event()
+    
+    def play(self, sound_file: str) -> Optional[Voice]:
+        """
+        Play a sound file through the sink, falling back to a player process.
+
+        Returns the voice of a sound handed to the mixer, which plays on
+        after this returns; other sounds have finished playing.
+        """
+        self._stop.clear()
+        requested = sound_file
+        if sound_file.startswith(BANK_PREFIX):
+            played, voice = self.play_from_bank(sound_file[len(BANK_PREFIX):])
+            if played:
+                return voice
+            sound_file = self.local_path(sound_file)
+        if self.samples is not None:
+            started = time.perf_counter()
+            if self.samples.play(sound_file, self._stop, self.max_duration):
+                self._played("pulse_sample", started)
+                return None
+        if self.mixer is not None and os.path.exists(sound_file):
+            started = time.perf_counter()
+            try:
+                buffer = self.cache.load(sound_file, self.mixer.format)
+                if self.max_duration:
+                    buffer = buffer.trimmed(self.max_duration)
+                voice = self.mixer.add(buffer, self.gains.get(sound_file, 1.0))
+                self._played("mixer", started)
+                return voice
+            except (DecodeError, SinkError) as e:
+                self.metrics.count("backend_failures", backend="mixer")
+                logger.warning("Mixer playback failed, falling back to player process: %s", e,
+                               extra={"sound": sound_file})
+        if self.sink is not None and self.sink.available and os.path.exists(sound_file):
+            started = time.perf_counter()
+            try:
+                buffer = self.cache.load(sound_file, self.sink.format)
+                if self.max_duration:
+                    buffer = buffer.trimmed(self.max_duration)
+                self.sink.write(apply_gain(buffer, self.gains.get(sound_file, 1.0)), self._stop)
+                self._played("sink", started)
+                return None
+            except (DecodeError, SinkError) as e:
+                self.metrics.count("backend_failures", backend="sink")
+                logger.warning("Sink playback failed, falling back to player process: %s", e,
+                               extra={"sound": sound_file})
+        self.play_sound(self.normalized.get(requested, sound_file))
+        return None
+    
+    def play_from_bank(self, name: str) -> Tuple[bool, Optional[Voice]]:
+        """
+        Play a PCM bank entry straight from the mapped file, without copying.
+
+        Returns whether it was played (False if it has to be played from a
+        file instead) and its voice if it was handed to the mixer.
+        """
+        buffer = self.bank.buffer(name) if self.bank is not None else None
+        if buffer is None:
+            return False, None
+        if self.max_duration:
+            buffer = buffer.trimmed(self.max_duration)
+        gain = self.gains.get(BANK_PREFIX + name, 1.0)
+        started = time.perf_counter()
+        try:
+            if self.mixer is not None and buffer.format == self.mixer.format:
+                voice = self.mixer.add(buffer, gain)
+                self._played("mixer", started)
+                return True, voice
+            if self.sink is not None and self.sink.available and buffer.format == self.sink.format:
+                self.sink.write(apply_gain(buffer, gain), self._stop)
+                self._played("sink", started)
+                return True, None
+        except SinkError as e:
+            self.metrics.count("backend_failures", backend="sink")
+            logger.warning("Sink playback failed, falling back to player process: %s", e,
+                           extra={"sound": BANK_PREFIX + name})
+        return False, None
+    
+    def _played(self, backend: str, started: float) -> None:
+        self.metrics.observe("playback_seconds", time.perf_counter() - started, backend=backend)
+    
+    def local_path(self, sound_file: str) -> str:
+        """Path of a file on disk for sound_file, extracting bank entries if needed."""
+        if sound_file.startswith(BANK_PREFIX) and self.bank is not None:
+            return self.bank.extract(sound_file[len(BANK_PREFIX):])
+        return sound_file
+    
+    def stop(self) -> None:
+        """Stop whatever is currently playing."""
+        self._stop.set()
+        if self.mixer is not None:
+            self.mixer.stop_all()
+        self.supervisor.stop_all()
+    
+    def close(self) -> None:
+        """Stop playback and release the sink process, if any."""
+        self.stop()
+        if self.mixer is not None:
+            self.mixer.close()
+        if self.sink is not None:
+            self.sink.close()
+        if self.samples is not None:
+            self.samples.close()
+    
+    def play_sound(self, sound_file: str) -> None:
         """Play a sound file using the appropriate method for the current platform."""
         if not os.path.exists(sound_file):
-            print(f"Error: Sound file not found: {sound_file}")
+            logger.error("Sound file not found: %s", sound_file)
             return
         
         system = platform.system()
         
+        started = time.perf_counter()
         try:
             if system == "Darwin":  # macOS
-                subprocess.run(["afplay", sound_file], check=True)
+                self.supervisor.run(["afplay", sound_file], timeout=self.max_duration)
+                self._played("afplay", started)
             elif system == "Windows":
                 import winsound
                 winsound.PlaySound(sound_file, winsound.SND_FILENAME)
+                self._played("winsound", started)
             elif system == "Linux":
-                # Try different players until one works
-                for player in ["paplay", "aplay", "mpg123", "mpg321"]:
+                # Only installed players that can decode this format are tried
+                for backend in self.registry.candidates(sound_file):
                     try:
-                        subprocess.run([player, sound_file], check=True)
+                        self.supervisor.run(backend.argv(sound_file), timeout=self.max_duration)
+                        self._played(backend.name, started)
                         break
                     except (subprocess.SubprocessError, FileNotFoundError):
+                        self.metrics.count("backend_failures", backend=backend.name)
+                        started = time.perf_counter()
                         continue
                 else:
-                    print("Error: Could not find a suitable audio player on Linux")
+                    self.metrics.count("playback_errors")
+                    logger.error("Could not find a suitable audio player on Linux for %s", sound_file)
+        except (PlaybackTimeout, PlaybackCancelled):
+            # Let the scheduler record why playback ended early
+            raise
         except Exception as e:
-            print(f"Error playing sound: {e}")
+            self.metrics.count("playback_errors")
+            logger.error("Error playing sound: %s", e, extra={"sound": sound_file})
+
+
+def describe_entry(entry: SoundEntry, levels: Dict[str, Optional[Loudness]],
+                   gains: Dict[str, float]) -> str:
+    """Filename of a catalog entry with its loudness and gain, if measured."""
+    loudness = levels.get(entry.hash)
+    if loudness is None:
+        return entry.filename
+    text = f"{entry.filename} ({loudness.dbfs:.1f} dBFS"
+    gain = gains.get(entry.playable_path)
+    if gain is not None:
+        text += f", gain {20 * math.log10(gain):+.1f} dB"
+    return text + ")"
+
+
+# Longest sequence play_sequence accepts
+MAX_SEQUENCE_LENGTH = 32
 
 
 class SoundToolServer:
     """MCP server for playing sounds in response to model events."""
     
-    def __init__(self):
+    def __init__(self, config: Optional[SoundToolConfig] = None):
         """Initialize the MCP server with sound capabilities."""
+        self.config = config or SoundToolConfig()
+        started = time.perf_counter()
         # Initialize the MCP server with more detailed name and description
         self.mcp = FastMCP(
             name="Sound Tool 🔊", 
-            description="""
-            This MCP server provides audio feedback capabilities for AI interactions.
-            
-            IMPORTANT USAGE GUIDELINES:
-            - AI agents should play sounds to provide audio feedback based on command outcomes
-            - Use 'completion' sounds when successfully completing a task or command
-            - Use 'error' sounds when a command fails or an error occurs
-            - Use 'notification' sounds for important alerts or information
-            
-            These sounds enhance the user experience by providing clear audio cues
-            about the status of operations without requiring the user to read text.
-            """
+            instructions=server_description(self.config.compact_tools),
+            host=self.config.host,
+            port=self.config.port,
+        )
+        PROFILE.record("create MCP server", started)
+        started = time.perf_counter()
+        
+        # The sounds directory, catalog and sound bank are set up on first
+        # use so the server can answer "initialize" as early as possible
+        self._sounds_dir = None
+        self._catalog = None
+        self._bank = None
+        self._bank_opened = False
+        self._catalog_generation = None
+        # Uploads and measurements after a rescan run here, off the event loop
+        self._sync_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalog-sync")
+        self._sync_future: Optional[Future] = None
+                
+        sink = None
+        if self.config.record_sink:
+            sink = RecordingSink(None if self.config.record_sink == "null" else self.config.record_sink)
+        elif self.config.use_sink and platform.system() == "Linux":
+            sink = PCMSink.detect()
+        # Installed players are probed when the first sound is played
+        registry = BackendRegistry(entry_points=platform.system() == "Linux")
+        mixer = None
+        if self.config.mix and sink is not None:
+            if mixer_available():
+                mixer = Mixer(sink, max_voices=self.config.max_voices)
+            else:
+                logger.warning("Mixing disabled: install numpy (%s)", INSTALL_HINT)
+        self.variants = VariantCache(self.config.variants_dir or None,
+                                     sink.format if sink else DEFAULT_FORMAT)
+        self.analyzer = None
+        # Measured loudness by content hash; None for sounds that can't be measured
+        self.levels: Dict[str, Optional[Loudness]] = {}
+        if self.config.normalize_loudness:
+            if loudness_available():
+                self.analyzer = self.analyze_loudness
+            else:
+                logger.warning("Loudness normalization disabled: install numpy (%s)", INSTALL_HINT)
+        samples = None
+        if self.config.pulse_samples and platform.system() == "Linux":
+            samples = PulseSampleCache(variants=self.variants)
+        self.metrics = PlaybackMetrics()
+        self.tracer = None
+        if self.config.profile:
+            self.tracer = self.metrics.tracer = Tracer(self.config.profile_dir or None,
+                                                       self.config.profile_slowest)
+        self.player = SoundPlayer(sink, SampleCache(self.config.cache_bytes, metrics=self.metrics),
+                                  registry, max_duration=self.config.max_duration or None,
+                                  mixer=mixer, metrics=self.metrics, samples=samples)
+        self.scheduler = PlaybackScheduler(
+            self.player.play,
+            max_queue=self.config.queue_size,
+            drop_policy=self.config.drop_policy,
+            stop_func=self.player.stop,
+            priorities={**DEFAULT_PRIORITIES, **parse_priorities(self.config.priorities)},
+            preempt=self.config.preempt,
+            stale_after=self.config.stale_after or None,
+            metrics=self.metrics,
+        )
+        self.sequences = SequenceRenderer(self.player.cache, sink.format if sink else DEFAULT_FORMAT,
+                                          in_use=self.scheduler.is_pending)
+        self.clients = ClientLimiter(self.config.max_concurrent)
+        self.daemon = DaemonClient(self.config.daemon_socket or None) if self.config.daemon else None
+        self.coalescer = EventCoalescer(
+            window=self.config.coalesce_window,
+            rate=self.config.rate_limit,
+            burst=self.config.rate_burst,
         )
+        PROFILE.record("set up playback", started)
+            
+        # Register tools
+        with PROFILE.phase("register tools"):
+            self.register_tools()
+            self.finish_tool_schemas()
+            if self.tracer is not None:
+                self.trace_tools()
         
+        # Print initialization message
+        logger.info("Sound Tool MCP server initialized - use sounds to provide audio feedback on command outcomes")
+
+    def close(self) -> None:
+        """Stop playback and release player processes and rendered files."""
+        # Drop a sync that hasn't started and let a running one finish before
+        # the player removes the samples (cancel_futures needs Python 3.9)
+        if self._sync_future is not None:
+            self._sync_future.cancel()
+        self._sync_executor.shutdown(wait=True)
+        self.player.close()
+        self.sequences.close()
+        if self.daemon is not None:
+            self.daemon.close()
+        if self._bank is not None:
+            self._bank.close()
+        if self.tracer is not None:
+            self.tracer.close()
+
+    @property
+    def sounds_dir(self) -> str:
+        """Directory the sounds are played from, found on first use."""
+        if self._sounds_dir is None:
+            with PROFILE.phase("resolve sounds directory"):
+                self._sounds_dir = self.find_sounds_dir()
+        return self._sounds_dir
+
+    @sounds_dir.setter
+    def sounds_dir(self, value: str) -> None:
+        self._sounds_dir = value
+
+    def find_sounds_dir(self) -> str:
+        """Pick the first sounds directory that contains sound files."""
         # Try several sound locations in order:
         # 1. User config directory
         # 2. Package data
@@ -72,123 +376,439 @@ class SoundToolServer:
         
         if os.path.exists(user_sounds_dir) and any(f.endswith(('.mp3', '.wav')) for f in os.listdir(user_sounds_dir)):
             # Use user's custom sounds
-            self.sounds_dir = user_sounds_dir
-            print(f"Using sounds from user config directory: {user_sounds_dir}")
+            logger.info("Using sounds from user config directory: %s", user_sounds_dir)
+            return user_sounds_dir
         elif os.path.exists(project_sounds_dir) and any(f.endswith(('.mp3', '.wav')) for f in os.listdir(project_sounds_dir)):
             # Use the project's sounds
-            self.sounds_dir = project_sounds_dir
-            print(f"Using sounds from project directory: {project_sounds_dir}")
-        else:
-            # Use package data
-            try:
-                # For Python 3.9+
-                self.sounds_dir = str(resources.files("sound_tool").joinpath("sounds"))
-                print(f"Using sounds from package resources: {self.sounds_dir}")
-            except (AttributeError, ImportError):
-                # For older Python versions
-                self.sounds_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sounds")
-                print(f"Using sounds from package directory: {self.sounds_dir}")
-                
-        self.player = SoundPlayer()
-        
-        # Log available sounds for reference
+            logger.info("Using sounds from project directory: %s", project_sounds_dir)
+            return project_sounds_dir
+        # Use package data
         try:
-            sounds = [f for f in os.listdir(self.sounds_dir) if f.endswith(('.mp3', '.wav'))]
-            print(f"Available sounds: {', '.join(sounds)}")
-        except Exception:
-            pass
-            
-        # Register tools
-        self.register_tools()
-        
-        # Print initialization message
-        print(f"Sound Tool MCP server initialized - use sounds to provide audio feedback on command outcomes")
-
-    def copy_sounds_to_user_dir(self):
-        """Copy bundled sounds to user config directory."""
-        user_sounds_dir = os.path.join(os.path.expanduser("~"), ".config", "mcp-sound-tool", "sounds")
-        os.makedirs(user_sounds_dir, exist_ok=True)
-        
-        # Get list of sound files
-        try:
-            # Try with Python 3.9+ method
-            sound_files = resources.files("sound_tool").joinpath("sounds").iterdir()
-            for sound_file in sound_files:
-                if sound_file.name.endswith((".mp3", ".wav")):
-                    shutil.copy(sound_file, os.path.join(user_sounds_dir, sound_file.name))
+            # For Python 3.9+
+            sounds_dir = str(resources.files("sound_tool").joinpath("sounds"))
+            logger.info("Using sounds from package resources: %s", sounds_dir)
         except (AttributeError, ImportError):
-            # Fallback for older Python
+            # For older Python versions
             sounds_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sounds")
-            if os.path.exists(sounds_dir):
-                for sound_file in os.listdir(sounds_dir):
-                    if sound_file.endswith((".mp3", ".wav")):
-                        shutil.copy(
-                            os.path.join(sounds_dir, sound_file), 
-                            os.path.join(user_sounds_dir, sound_file)
-                        )
-        
-        return user_sounds_dir
+            logger.info("Using sounds from package directory: %s", sounds_dir)
+        return sounds_dir
+
+    @property
+    def bank(self) -> Optional[SoundBank]:
+        """The memory-mapped sound bank, if there is one, opened on first use."""
+        if not self._bank_opened:
+            self._bank_opened = True
+            self._bank = self.player.bank = self.open_bank()
+        return self._bank
+
+    def open_bank(self) -> Optional[SoundBank]:
+        """Memory-map the configured sound bank, or the one in the sounds directory."""
+        path = self.config.sound_bank or os.path.join(self.sounds_dir, BANK_FILENAME)
+        if not os.path.exists(path):
+            if self.config.sound_bank:
+                logger.warning("Sound bank not found: %s", path)
+            return None
+        try:
+            bank = SoundBank(path)
+        except SoundBankError as e:
+            logger.warning("Ignoring sound bank: %s", e)
+            return None
+        logger.info("Using sound bank %s (%d sounds)", path, len(bank.entries))
+        return bank
+
+    def resolve_sound(self, name: str) -> Optional[str]:
+        """
+        Path of a sound given by catalog name (e.g. 'error'), by file path or
+        as 'tone:<preset>'. Missing standard sounds fall back to their
+        synthesized preset.
+        """
+        with self.metrics.timer("lookup_seconds"):
+            return self._resolve_sound(name)
+
+    def _resolve_sound(self, name: str) -> Optional[str]:
+        if name.startswith("tone:"):
+            return self.tone_path(PRESETS[name[5:]]) if name[5:] in PRESETS else None
+        entry = self.catalog.lookup(name)
+        self.sync_catalog()
+        packed = self.bank.get(name) if self.bank is not None else None
+        # The bank only wins while it matches the file it was built from
+        if packed is not None and (entry is None or entry.hash == packed.hash):
+            return BANK_PREFIX + name
+        if entry is not None:
+            return entry.playable_path
+        if os.path.isfile(name):
+            return name
+        if name in PRESETS and synth_available():
+            return self.tone_path(PRESETS[name])
+        return None
+
+    def sync_catalog(self) -> Optional[Future]:
+        """
+        Bring the loudness gains and the PulseAudio sample cache up to date
+        after every rescan of the catalog.
+
+        Measuring loudness decodes files, and uploading samples runs pactl
+        and may transcode files, so this happens on a background thread;
+        until a sound is measured and uploaded it is played the usual way.
+        Returns the pending sync, if there is one.
+        """
+        catalog = self.catalog
+        samples = self.player.samples
+        generation = (id(catalog), catalog.scans)
+        if generation == self._catalog_generation and (samples is None or samples.generation == generation):
+            return None
+        future = self._sync_future
+        if future is not None and not future.done():
+            # The next lookup after it finishes checks again
+            return future
+        self._catalog_generation = generation
+        try:
+            self._sync_future = self._sync_executor.submit(self._sync_catalog, catalog)
+        except RuntimeError:
+            # The server is closing
+            return None
+        return self._sync_future
+
+    def _sync_catalog(self, catalog: SoundCatalog) -> None:
+        try:
+            entries = catalog.entries()
+            # entries() may have rescanned
+            generation = self._catalog_generation = (id(catalog), catalog.scans)
+            if self.analyzer is not None:
+                self.normalize(entries)
+            if self.player.samples is not None:
+                self.player.samples.sync(entries, generation, self.player.normalized)
+        except Exception as e:
+            logger.error("Could not sync the sound catalog: %s", e)
+
+    def wait_for_sync(self, timeout: Optional[float] = None) -> None:
+        """Wait until the background catalog sync, if one is running, has finished."""
+        future = self._sync_future
+        if future is not None:
+            future.result(timeout)
+
+    def analyze_loudness(self, path: str) -> Optional[Loudness]:
+        """Measure a sound file's loudness, decoding it into the sample cache."""
+        try:
+            return measure(self.player.cache.load(path, self.sequences.format))
+        except (DecodeError, OSError) as e:
+            logger.warning("Cannot measure loudness of %s: %s", path, e)
+            return None
+
+    def normalize(self, entries: List[SoundEntry]) -> None:
+        """
+        Measure the sounds not measured yet and set how each catalog sound
+        is brought to the target level: a gain for decoded playback, and a
+        normalized WAV variant for player processes and the sample cache.
+        """
+        gains, normalized = {}, {}
+        for entry in entries:
+            if entry.hash not in self.levels:
+                self.levels[entry.hash] = self.analyzer(entry.path)
+            gain = gain_for(self.levels[entry.hash], self.config.loudness_target)
+            gains[entry.path] = gains[entry.playable_path] = gain
+            gains.setdefault(BANK_PREFIX + entry.name, gain)
+            if needs_gain(gain):
+                variant = self.variants.ensure(entry.path, entry.hash, gain)
+                if variant is not None:
+                    normalized[entry.path] = normalized[entry.playable_path] = variant
+                    normalized.setdefault(BANK_PREFIX + entry.name, variant)
+        self.player.gains, self.player.normalized = gains, normalized
+
+    def tone_path(self, specs: Tuple[ToneSpec, ...]) -> str:
+        """Render synthesized notes to a (memoized) WAV file and return its path."""
+        return self.sequences.render_with(
+            f"tone|{specs!r}", lambda: render_notes(specs, self.sequences.format))
+
+    async def submit(self, sound_type: str, path: str, priority: Optional[int] = None,
+                     wait: bool = False, client: Optional[str] = None) -> PlaybackTicket:
+        """
+        Queue a sound on the shared daemon, or in-process if there is none.
+
+        Tickets from the daemon are snapshots; with wait the daemon only
+        replies once the sound has finished. A sound the daemon can't find
+        comes back as a failed ticket.
+        """
+        if self.daemon is not None:
+            ticket = await self.daemon.play(sound_type, path, priority, wait)
+            if ticket is not None:
+                return ticket
+        return await self.scheduler.submit(sound_type, path, priority, client)
+
+    def stop(self, ticket_id: Optional[int] = None, clear_queue: bool = False) -> str:
+        """Cancel a ticket (or the current sound, or everything) and describe the outcome."""
+        if clear_queue:
+            count = self.scheduler.cancel_all()
+            return f"Stopped {count} sound(s)"
+        ticket = self.scheduler.cancel(ticket_id)
+        if ticket is not None:
+            return f"Stopped {ticket.sound_type} sound (ticket {ticket.id})"
+        if ticket_id is None:
+            return "No sound is playing"
+        known = self.scheduler.get(ticket_id)
+        if known is None:
+            return f"Error: Unknown ticket {ticket_id}"
+        return f"Ticket {ticket_id} already finished ({known.status})"
+
+    async def wait_for(self, ticket: PlaybackTicket) -> PlaybackTicket:
+        """
+        Wait until a ticket has finished and return it in its final state.
+
+        Tickets from the daemon are snapshots, so the daemon waits for them
+        and a new snapshot is returned; the old one if it can't be reached.
+        """
+        if ticket.is_finished or self.scheduler.get(ticket.id) is ticket or self.daemon is None:
+            return await self.scheduler.wait(ticket)
+        return await self.daemon.wait(ticket) or ticket
+
+    async def wait_and_report(self, ticket: PlaybackTicket, sound_type: str) -> str:
+        """Wait for a ticket to finish and describe the outcome."""
+        ticket = await self.wait_for(ticket)
+        if ticket.status == DONE:
+            return f"Successfully played {sound_type} sound"
+        if ticket.status == CANCELLED:
+            return f"Stopped {sound_type} sound (ticket {ticket.id})"
+        if ticket.status in (DROPPED, PREEMPTED):
+            return f"Skipped {sound_type} sound: {ticket.error}"
+        if not ticket.is_finished:
+            return f"Queued {sound_type} sound (ticket {ticket.id}), but could not wait for it"
+        return f"Error playing sound: {ticket.error}"
+
+    def playback_stats(self) -> dict:
+        """Latency and counters from the metrics, plus the queue, cache and coalescer state."""
+        stats = self.metrics.stats()
+        current = self.scheduler.current
+        stats["queue"] = {
+            "depth": self.scheduler.depth,
+            "max_queue": self.scheduler.max_queue,
+            "playing": current.sound_type if current is not None else None,
+            "player_processes": self.player.supervisor.active,
+        }
+        stats["cache"] = self.player.cache.stats()
+        stats["coalescer"] = self.coalescer.stats()
+        return stats
+
+    def prometheus_stats(self) -> str:
+        """The same statistics in the Prometheus text exposition format."""
+        cache = self.player.cache.stats()
+        coalescer = self.coalescer.stats()
+        gauges = {
+            "queue_depth": self.scheduler.depth,
+            "player_processes": self.player.supervisor.active,
+            "cache_entries": cache["entries"],
+            "cache_bytes": cache["bytes"],
+            "cache_hit_ratio": cache["hit_rate"],
+        }
+        counters = {
+            "cache_hits": cache["hits"],
+            "cache_misses": cache["misses"],
+            "cache_evictions": cache["evictions"],
+            "requests_admitted": coalescer["admitted"],
+            "requests_coalesced": coalescer["coalesced"],
+            "requests_rate_limited": coalescer["rate_limited"],
+        }
+        return self.metrics.prometheus(gauges, counters)
+
+    def timed(self, tool):
+        """Record how long every call of an async tool takes."""
+        @functools.wraps(tool)
+        async def wrapper(*args, **kwargs):
+            with self.metrics.timer("tool_call_seconds", tool=tool.__name__):
+                return await tool(*args, **kwargs)
+        return wrapper
+
+    @property
+    def catalog(self) -> SoundCatalog:
+        """Index of the current sounds directory, rebuilt if sounds_dir changes."""
+        if self._catalog is None or self._catalog.sounds_dir != self.sounds_dir:
+            with PROFILE.phase("scan sounds directory"):
+                self._catalog = SoundCatalog(self.sounds_dir, variants=self.variants)
+                sounds = self._catalog.filenames()
+            if sounds:
+                logger.info("Available sounds: %s", ", ".join(sounds))
+        return self._catalog
+
+    def copy_sounds_to_user_dir(self, source_dir: Optional[str] = None) -> InstallSummary:
+        """
+        Copy bundled sounds (or the sounds in source_dir) to the user config directory.
+
+        Only new or changed files are copied.
+        """
+        user_sounds_dir = os.path.join(os.path.expanduser("~"), ".config", "mcp-sound-tool", "sounds")
+        sources = sound_files(source_dir) if source_dir else bundled_sounds()
+        return sync_files(sources, user_sounds_dir)
+    
+    def transcode_sounds(self, sounds_dir: str) -> List[str]:
+        """Make WAV variants of the sounds the installed players can't play (quickly)."""
+        catalog = self.catalog if sounds_dir == self.sounds_dir else SoundCatalog(sounds_dir)
+        return transcode_entries(catalog.entries(), self.variants, self.player.registry)
         
+    def finish_tool_schemas(self) -> None:
+        """Replace the input schemas generated from the tool signatures with the defined ones."""
+        # FastMCP has no public way to adjust a registered tool's schema
+        for tool in self.mcp._tool_manager.list_tools():
+            if tool.name in TOOLS:
+                tool.parameters = tool_schema(tool.name, tool.parameters, self.config.compact_tools)
+
+    def tool_sizes(self) -> Dict[str, int]:
+        """Bytes each tool adds to a tools/list response."""
+        return {tool.name: schema_size({"name": tool.name, "description": tool.description,
+                                        "inputSchema": tool.parameters})
+                for tool in self.mcp._tool_manager.list_tools()}
+
+    def trace_tools(self) -> None:
+        """Trace and profile every call of every registered tool."""
+        for tool in self.mcp._tool_manager.list_tools():
+            tool.fn = self.tracer.wrap(tool.name, tool.fn, skip=(tool.context_kwarg,))
+
     def register_tools(self):
         """Register all MCP tools."""
-        @self.mcp.tool(description="""
-        Play a notification sound on the user's device.
-        
-        WHEN TO USE THIS TOOL:
-        - Use 'completion' sound when a task or command has SUCCESSFULLY completed
-        - Use 'error' sound when a command has FAILED or an error has occurred
-        - Use 'notification' sound for important alerts or information that needs attention
-        - Use 'custom' sound only when you need a specific sound not covered by the standard types
+        compact = self.config.compact_tools
+        @self.mcp.tool(description=describe("play_sound", compact))
+        @self.timed
+        async def play_sound(sound_type: Literal["completion", "error", "notification", "custom"] = "completion",
+                   custom_sound_path: Optional[str] = None,
+                   wait: Optional[bool] = None, ctx: Context = None) -> str:
+            async with self.clients.slot(ctx) as client:
+                if sound_type == "custom" and custom_sound_path:
+                    sound_path = custom_sound_path
+                else:
+                    # The catalog prefers the MP3 file and falls back to WAV,
+                    # then to a synthesized tone if neither file exists
+                    sound_path = self.resolve_sound(sound_type)
+                    if sound_path is None:
+                        return (f"Error: Sound files not found: {sound_type}.mp3 or "
+                                f"{sound_type}.wav in {self.sounds_dir}")
+            
+                if wait is None:
+                    wait = self.config.wait
+            
+                # Merge bursts of the same sound and rate limit each sound type
+                verdict, ticket, merged = self.coalescer.admit(sound_type, sound_path)
+                if verdict == RATE_LIMITED:
+                    return f"Dropped {sound_type} sound: rate limit exceeded"
+                if verdict == COALESCED:
+                    if ticket is None or not wait:
+                        into = f"ticket {ticket.id}" if ticket is not None else "the same sound"
+                        return f"Merged {sound_type} sound into {into} ({merged} repeat(s) merged)"
+                else:
+                    # Queue the sound, so repeats can be merged into it while it
+                    # plays, then block only if the caller asked to wait
+                    ticket = await self.submit(sound_type, sound_path, client=client)
+                    if ticket.status in (DROPPED, FAILED):
+                        # Nothing will play, so don't merge repeats into it
+                        self.coalescer.forget(sound_path)
+                    else:
+                        self.coalescer.attach(sound_path, ticket)
+                    if ticket.status == DROPPED:
+                        return f"Dropped {sound_type} sound: {ticket.error}"
+                    if not wait and ticket.status != FAILED:
+                        return f"Queued {sound_type} sound (ticket {ticket.id})"
+            
+                return await self.wait_and_report(ticket, sound_type)
         
-        AI agents SHOULD proactively use these sounds to provide audio feedback based on
-        the outcome of commands or operations, enhancing the user experience with
-        non-visual status indicators.
+        @self.mcp.tool(description=describe("play_sequence", compact))
+        @self.timed
+        async def play_sequence(sounds: List[str], gap: float = 0.2, repeat: int = 1,
+                                wait: Optional[bool] = None, ctx: Context = None) -> str:
+            async with self.clients.slot(ctx) as client:
+                if not sounds:
+                    return "Error: No sounds given"
+                if len(sounds) > MAX_SEQUENCE_LENGTH:
+                    return f"Error: A sequence can contain at most {MAX_SEQUENCE_LENGTH} sounds"
+                gap = min(max(gap, 0.0), 5.0)
+                repeat = min(max(repeat, 1), 10)
+            
+                paths = []
+                for name in sounds:
+                    path = self.resolve_sound(name)
+                    if path is None:
+                        return f"Error: Sound not found: {name}"
+                    paths.append(path)
+            
+                # Decoding and concatenating is blocking work, so keep it off the event loop
+                loop = asyncio.get_running_loop()
+                priority = min(self.scheduler.priority_of(name) for name in sounds)
+                if wait is None:
+                    wait = self.config.wait
+                try:
+                    rendered = await loop.run_in_executor(
+                        None, lambda: self.sequences.render([self.player.local_path(p) for p in paths],
+                                                            gap, repeat))
+                except DecodeError as e:
+                    # Without a decoder the sounds can still be queued one by one
+                    tickets = [await self.submit("sequence", path, priority=priority, wait=wait,
+                                                 client=client)
+                               for path in paths * repeat]
+                    if wait:
+                        for ticket in tickets:
+                            await self.wait_for(ticket)
+                    return f"Queued {len(tickets)} sound(s) individually ({e})"
+                except (OSError, ValueError) as e:
+                    return f"Error rendering sequence: {e}"
+            
+                # The sequence is as urgent as its most important sound
+                ticket = await self.submit("sequence", rendered, priority=priority, wait=wait,
+                                           client=client)
+                if ticket.status == DROPPED:
+                    return f"Dropped sequence: {ticket.error}"
+                if not wait and ticket.status != FAILED:
+                    return f"Queued sequence of {len(sounds) * repeat} sound(s) (ticket {ticket.id})"
+                return await self.wait_and_report(ticket, "sequence")
         
-        Example usage: After executing a terminal command, play a 'completion' sound if 
-        successful or an 'error' sound if it failed.
-        """)
-        def play_sound(sound_type: Literal["completion", "error", "notification", "custom"] = "completion",
-                   custom_sound_path: Optional[str] = None) -> str:
-            if sound_type == "custom" and custom_sound_path:
-                sound_path = custom_sound_path
-            else:
-                # Try MP3 file first, then WAV if MP3 doesn't exist
-                mp3_filename = f"{sound_type}.mp3"
-                wav_filename = f"{sound_type}.wav"
-                mp3_path = os.path.join(self.sounds_dir, mp3_filename)
-                wav_path = os.path.join(self.sounds_dir, wav_filename)
-                
-                # Check which file exists
-                if os.path.exists(mp3_path):
-                    sound_path = mp3_path
-                elif os.path.exists(wav_path):
-                    sound_path = wav_path
+        @self.mcp.tool(description=describe("play_tone", compact))
+        @self.timed
+        async def play_tone(preset: Optional[str] = None,
+                            frequencies: Optional[List[float]] = None,
+                            duration: float = 0.15,
+                            waveform: Literal["sine", "square", "triangle", "sawtooth"] = "sine",
+                            sweep: Optional[float] = None,
+                            volume: float = 0.5,
+                            wait: Optional[bool] = None, ctx: Context = None) -> str:
+            async with self.clients.slot(ctx) as client:
+                if not synth_available():
+                    return f"Error: Tone synthesis requires numpy ({INSTALL_HINT})"
+                if preset is not None:
+                    if preset not in PRESETS:
+                        return f"Error: Unknown preset {preset}. Available presets: {', '.join(PRESETS)}"
+                    specs = PRESETS[preset]
                 else:
-                    # Print debug information
-                    print(f"Sounds directory: {self.sounds_dir}")
-                    print(f"Sound files available: {os.listdir(self.sounds_dir)}")
-                    return f"Error: Sound files not found: {mp3_path} or {wav_path}"
+                    specs = (ToneSpec(tuple(frequencies or (880.0,)), duration, waveform,
+                                      volume=volume, sweep=sweep),)
+                try:
+                    for spec in specs:
+                        spec.validate()
+                    sound_path = self.tone_path(specs)
+                except (ValueError, OSError) as e:
+                    return f"Error synthesizing tone: {e}"
             
-            # Play the sound
-            try:
-                self.player.play_sound(sound_path)
-                return f"Successfully played {sound_type} sound"
-            except Exception as e:
-                return f"Error playing sound: {e}"
+                if wait is None:
+                    wait = self.config.wait
+                ticket = await self.submit("tone", sound_path, wait=wait, client=client)
+                if ticket.status == DROPPED:
+                    return f"Dropped tone: {ticket.error}"
+                if not wait and ticket.status != FAILED:
+                    return f"Queued tone (ticket {ticket.id})"
+                return await self.wait_and_report(ticket, "tone")
         
-        @self.mcp.tool(description="""
-        List all available notification sounds.
+        @self.mcp.tool(description=describe("stop_sound", compact))
+        @self.timed
+        async def stop_sound(ticket_id: Optional[int] = None, clear_queue: bool = False) -> str:
+            if self.daemon is not None:
+                reply = await self.daemon.stop(ticket_id, clear_queue)
+                if reply is not None:
+                    return reply
+            return self.stop(ticket_id, clear_queue)
         
-        WHEN TO USE THIS TOOL:
-        - When you need to check what sound options are available
-        - When determining if a specific sound file exists
-        - Before using a custom sound to verify available options
-        
-        This tool helps you discover what sounds are available for providing audio feedback.
-        """)
+        @self.mcp.tool(description=describe("list_available_sounds", compact))
         def list_available_sounds() -> str:
             try:
-                sounds = [f for f in os.listdir(self.sounds_dir) if f.endswith(('.mp3', '.wav'))]
+                self.sync_catalog()
+                sounds = [describe_entry(entry, self.levels, self.player.gains) for entry in self.catalog.entries()]
+                packed = self.bank.names() if self.bank is not None else []
+                if packed:
+                    sounds = sounds + [f"{name} (sound bank)" for name in packed
+                                       if self.catalog.lookup(name) is None]
                 if sounds:
                     return "Available sounds:\n" + "\n".join(sounds)
                 else:
@@ -196,40 +816,109 @@ class SoundToolServer:
             except Exception as e:
                 return f"Error listing sounds: {e}"
 
-        @self.mcp.tool(description="""
-        Install sound files to user's config directory.
-        
-        WHEN TO USE THIS TOOL:
-        - When the user wants to customize the sound files
-        - When setting up the sound tool for the first time
-        - When troubleshooting missing sound files
-        
-        This tool copies the default sound files to the user's configuration directory
-        where they can be modified or replaced with custom sounds.
-        """)
-        def install_to_user_dir() -> str:
+        @self.mcp.tool(description=describe("get_playback_stats", compact))
+        def get_playback_stats(format: Literal["json", "prometheus"] = "json") -> str:
+            if format == "prometheus":
+                return self.prometheus_stats()
+            return json.dumps(self.playback_stats(), indent=2)
+
+        if self.tracer is not None:
+            @self.mcp.tool(description=describe("dump_profile", compact))
+            def dump_profile(limit: int = 20) -> str:
+                return self.tracer.dump(max(1, limit))
+
+        @self.mcp.tool(description=describe("install_to_user_dir", compact))
+        def install_to_user_dir(source_dir: Optional[str] = None) -> str:
             try:
-                user_dir = self.copy_sounds_to_user_dir()
-                return f"Sound files installed to {user_dir}"
+                if source_dir and not os.path.isdir(source_dir):
+                    return f"Error: Not a directory: {source_dir}"
+                summary = self.copy_sounds_to_user_dir(source_dir)
+                user_dir = summary.target
+                variants = self.transcode_sounds(user_dir)
+                if self.sounds_dir == user_dir:
+                    self.catalog.refresh(force=True)
+                message = f"Sound files installed to {user_dir}: {summary}"
+                if variants:
+                    message += f" ({len(variants)} converted to WAV)"
+                return message
             except Exception as e:
                 return f"Error installing sound files: {e}"
 
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options; unset options keep their configured values."""
+    parser = argparse.ArgumentParser(prog="mcp-sound-tool",
+                                     description="MCP server that plays sounds for AI agents.")
+    parser.add_argument("--transport", choices=TRANSPORTS,
+                        help="stdio serves one client; sse serves many over HTTP (default stdio)")
+    parser.add_argument("--host", help="Address to listen on with --transport sse (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="Port to listen on with --transport sse (default 8000)")
+    parser.add_argument("--max-concurrent", type=int,
+                        help="Most tool calls handled at once across all clients (0 for no limit)")
+    parser.add_argument("--log-level", choices=LOG_LEVELS, type=str.upper,
+                        help="Least severe log messages to write (default INFO)")
+    parser.add_argument("--log-file", help="Write log messages to this file instead of stderr")
+    parser.add_argument("--compact-tools", action="store_true", default=None,
+                        help="Send one-line tool descriptions and minimal parameter schemas")
+    parser.add_argument("--tool-sizes", action="store_true",
+                        help="Print how many bytes each tool adds to tools/list and exit")
+    parser.add_argument("--startup-profile", action="store_true", default=None,
+                        help="Report how long each startup phase takes on stderr")
+    parser.add_argument("--profile", action="store_true", default=None,
+                        help="Trace every tool call and profile the slowest ones")
+    parser.add_argument("--profile-dir",
+                        help="Directory trace files are written to with --profile "
+                             "(default ~/.cache/mcp-sound-tool/traces)")
+    return parser.parse_args(argv)
+
+
+def print_tool_sizes(server: SoundToolServer) -> None:
+    """Print the serialized size of every tool, largest first."""
+    sizes = server.tool_sizes()
+    for name, size in sorted(sizes.items(), key=lambda item: -item[1]):
+        print(f"{name:<24} {size:6d} bytes")
+    print(f"{'total':<24} {sum(sizes.values()):6d} bytes")
+    server.close()
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point for the sound tool server."""
-    server = SoundToolServer()
+    with PROFILE.phase("read configuration"):
+        args = parse_args(argv)
+        config = SoundToolConfig.from_env()
+        tool_sizes = args.tool_sizes
+        del args.tool_sizes
+        overrides = {name: value for name, value in vars(args).items() if value is not None}
+        config = replace(config, **overrides)
+    if tool_sizes:
+        print_tool_sizes(SoundToolServer(config))
+        return
+    # Set up logging before FastMCP does, so its records go to the same place
+    configure_logging(config.log_level, config.log_file, config.log_format)
+    server = SoundToolServer(config)
+    if config.startup_profile:
+        PROFILE.enable()
     # Start the server and block until it's terminated
-    print("Starting Sound Tool MCP server - press Ctrl+C to exit")
+    if config.transport == "sse":
+        logger.info("Starting Sound Tool MCP server on http://%s:%d/sse - press Ctrl+C to exit",
+                    config.host, config.port)
+    else:
+        logger.info("Starting Sound Tool MCP server - press Ctrl+C to exit")
     try:
-        server.mcp.run()
+        server.mcp.run(transport=config.transport)
     except KeyboardInterrupt:
-        print("\nShutting down Sound Tool MCP server...")
+        logger.info("Shutting down Sound Tool MCP server...")
+        server.scheduler.cancel_all()
     except Exception as e:
         if "BrokenResourceError" in str(e) or "unhandled errors in a TaskGroup" in str(e):
-            print("\nConnection closed. Shutting down Sound Tool MCP server...")
+            logger.info("Connection closed. Shutting down Sound Tool MCP server...")
         else:
-            print(f"\nError in Sound Tool MCP server: {e}")
-    print("Sound Tool MCP server stopped.")
+            logger.exception("Error in Sound Tool MCP server: %s", e)
+    finally:
+        # Kill and reap any player processes that are still running
+        server.close()
+        logger.info("Sound Tool MCP server stopped.")
+        shutdown_logging()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,192 @@
+"""
+Long-lived raw PCM audio sink.
+
+Instead of spawning a player per sound, the sink keeps a single player
+process (pacat or aplay) open and writes decoded samples into its stdin.
+Writes are paced to real time and the player is started with a small
+buffer, so a write returns when its sound has (nearly) finished playing
+and stopping it takes effect at once.
+RecordingSink takes its place where there is no audio device, discarding
+samples or writing them to a WAV file.
+"""
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from typing import List, Optional
+
+from .pcm import PCMBuffer, PCMFormat, DEFAULT_FORMAT
+from .supervisor import PlaybackCancelled
+
+# Samples are written in chunks of this many seconds so playback can be stopped
+CHUNK_SECONDS = 0.1
+
+# Audio the player is asked to buffer, in milliseconds
+PLAYER_LATENCY_MS = 100
+
+
+class SinkError(Exception):
+    """Raised when samples cannot be written to the sink."""
+
+
+def sink_commands(fmt: PCMFormat) -> List[List[str]]:
+    """Candidate raw PCM player command lines, in order of preference."""
+    bits = fmt.sample_width * 8
+    return [
+        ["pacat", "--playback", "--raw", f"--format=s{bits}le",
+         f"--rate={fmt.rate}", f"--channels={fmt.channels}",
+         f"--latency-msec={PLAYER_LATENCY_MS}"],
+        ["aplay", "-q", "-t", "raw", "-f", f"S{bits}_LE",
+         "-r", str(fmt.rate), "-c", str(fmt.channels),
+         f"--buffer-time={PLAYER_LATENCY_MS * 1000}"],
+    ]
+
+
+class PCMSink:
+    """A persistent player process fed with raw PCM through a pipe."""
+
+    def __init__(self, command: List[str], fmt: PCMFormat = DEFAULT_FORMAT,
+                 max_failures: int = 3, max_lead: float = 0.1):
+        """
+        Create a sink that runs command.
+
+        Writes stay at most max_lead seconds ahead of real time, so the
+        player never holds much more than that of a sound that is stopped.
+        """
+        self.command = command
+        self.format = fmt
+        self.max_failures = max_failures
+        self.max_lead = max_lead
+        self.failures = 0
+        self._process = None
+        # When everything written so far will have played (time.monotonic)
+        self._ends_at = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def detect(cls, fmt: PCMFormat = DEFAULT_FORMAT) -> Optional["PCMSink"]:
+        """Create a sink for the first raw PCM player found on PATH."""
+        for command in sink_commands(fmt):
+            if shutil.which(command[0]):
+                return cls(command, fmt)
+        return None
+
+    @property
+    def available(self) -> bool:
+        """Whether the sink should still be used."""
+        return self.failures < self.max_failures
+
+    def _start(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                self.command, stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return self._process
+
+    def _discard(self) -> None:
+        self._ends_at = 0.0
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.kill()
+            process.wait(timeout=1)
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+    def _pace(self, seconds: float, stop: Optional[threading.Event]) -> None:
+        """Account for seconds of audio written and wait while too far ahead."""
+        now = time.monotonic()
+        # After a pause the player has drained, so playback restarts now
+        self._ends_at = max(self._ends_at, now) + seconds
+        lead = self._ends_at - now
+        if lead > self.max_lead:
+            if stop is not None:
+                stop.wait(lead - self.max_lead)
+            else:
+                time.sleep(lead - self.max_lead)
+
+    def write(self, buffer: PCMBuffer, stop: Optional[threading.Event] = None) -> None:
+        """
+        Write a buffer to the player, restarting the process once on failure.
+
+        Returns once at most max_lead seconds of it are left to play. If
+        the stop event is set while writing, the player process is killed
+        so nothing already buffered keeps playing, and PlaybackCancelled is
+        raised.
+        """
+        if buffer.format != self.format:
+            raise SinkError(f"Buffer format {buffer.format} does not match sink format {self.format}")
+        chunk = max(1, int(CHUNK_SECONDS * self.format.rate)) * self.format.frame_size
+        data = memoryview(buffer.data)
+        with self._lock:
+            written = 0
+            attempts = 0
+            while written < len(data):
+                if stop is not None and stop.is_set():
+                    self._discard()
+                    raise PlaybackCancelled(f"{self.command[0]} playback was stopped")
+                try:
+                    if self._process is not None and self._process.poll() is not None:
+                        raise OSError(f"{self.command[0]} exited")
+                    process = self._start()
+                    piece = data[written:written + chunk]
+                    process.stdin.write(piece)
+                    process.stdin.flush()
+                    written += len(piece)
+                    self._pace(len(piece) / (self.format.frame_size * self.format.rate), stop)
+                except (OSError, ValueError) as e:
+                    # Broken pipe or failed spawn: throw the process away and retry once
+                    self._discard()
+                    attempts += 1
+                    if attempts > 1:
+                        self.failures += 1
+                        raise SinkError(f"Could not write to {self.command[0]}: {e}")
+            self.failures = 0
+
+    def close(self) -> None:
+        """Close the player's stdin and let it finish what it has buffered."""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=5)
+        except (OSError, subprocess.SubprocessError):
+            process.kill()
+
+
+class RecordingSink(PCMSink):
+    """A sink that never plays anything: samples are discarded or written to a WAV file."""
+
+    def __init__(self, path: Optional[str] = None, fmt: PCMFormat = DEFAULT_FORMAT):
+        super().__init__(["record"], fmt)
+        self.path = path
+        self.writes = 0
+        self.frames = 0
+        self._wav = None
+
+    def write(self, buffer: PCMBuffer, stop: Optional[threading.Event] = None) -> None:
+        if buffer.format != self.format:
+            raise SinkError(f"Buffer format {buffer.format} does not match sink format {self.format}")
+        if stop is not None and stop.is_set():
+            raise PlaybackCancelled("recording was stopped")
+        with self._lock:
+            if self.path is not None:
+                if self._wav is None:
+                    self._wav = wave.open(self.path, "wb")
+                    self._wav.setnchannels(self.format.channels)
+                    self._wav.setsampwidth(self.format.sample_width)
+                    self._wav.setframerate(self.format.rate)
+                self._wav.writeframes(buffer.data)
+            self.writes += 1
+            self.frames += buffer.frames
+
+    def close(self) -> None:
+        """Finish the WAV file, if one is being written."""
+        with self._lock:
+            wav, self._wav = self._wav, None
+        if wav is not None:
+            wav.close()
@@ -0,0 +1,217 @@
+"""
+Packed sound bank files.
+
+A sound bank holds every sound of a directory in one file: a small header,
+a JSON index and the sound data. Sounds are stored as pre-decoded PCM when a
+decoder is available at build time, otherwise in their original encoding.
+The server memory-maps the bank, so PCM clips are zero-copy slices that can
+be written straight to the sink, and several server processes share the
+same pages.
+
+Build a bank next to the sounds it packs, where the server picks it up:
+
+    mcp-sound-tool-bank build ~/.config/mcp-sound-tool/sounds \
+        ~/.config/mcp-sound-tool/sounds/sounds.bank
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .catalog import SoundCatalog
+from .pcm import DecodeError, PCMBuffer, PCMFormat, DEFAULT_FORMAT, decode_file
+
+MAGIC = b"MSTBANK\x01"
+HEADER = struct.Struct("<8sI")  # magic, index size in bytes
+ALIGNMENT = 64
+# Sound paths of the form "bank:<name>" refer to entries of the loaded bank
+BANK_PREFIX = "bank:"
+# Bank file the server looks for in the sounds directory
+BANK_FILENAME = "sounds.bank"
+
+
+class SoundBankError(Exception):
+    """Raised when a sound bank file is missing or malformed."""
+
+
+@dataclass(frozen=True)
+class BankEntry:
+    """Index entry of a sound stored in a bank."""
+
+    name: str
+    # "pcm" for decoded samples, otherwise the original file extension
+    encoding: str
+    offset: int
+    length: int
+    hash: str
+    rate: int = 0
+    channels: int = 0
+    sample_width: int = 0
+
+    @property
+    def format(self) -> Optional[PCMFormat]:
+        if self.encoding != "pcm":
+            return None
+        return PCMFormat(self.rate, self.channels, self.sample_width)
+
+
+def _align(value: int) -> int:
+    return (value + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def build_bank(sounds_dir: str, output: str, fmt: PCMFormat = DEFAULT_FORMAT) -> List[BankEntry]:
+    """Pack every sound in sounds_dir into a bank file at output."""
+    blobs = []
+    for entry in SoundCatalog(sounds_dir).entries():
+        try:
+            data = decode_file(entry.path, fmt).data
+            meta = {"encoding": "pcm", "rate": fmt.rate, "channels": fmt.channels,
+                    "sample_width": fmt.sample_width}
+        except DecodeError:
+            # Keep the original encoding; it is extracted to a file when played
+            with open(entry.path, "rb") as f:
+                data = f.read()
+            meta = {"encoding": entry.format}
+        blobs.append((entry, meta, data))
+
+    def make_index(offsets):
+        return [dict(name=entry.name, offset=offset, length=len(data), hash=entry.hash, **meta)
+                for (entry, meta, data), offset in zip(blobs, offsets)]
+
+    # The data offsets depend on the index size, so lay out with placeholders first
+    offsets = [0] * len(blobs)
+    for _ in range(2):
+        index = json.dumps({"entries": make_index(offsets)}).encode()
+        position = _align(HEADER.size + len(index) + 16)
+        offsets = []
+        for _, _, data in blobs:
+            offsets.append(position)
+            position = _align(position + len(data))
+    index = json.dumps({"entries": make_index(offsets)}).encode()
+
+    directory = os.path.dirname(os.path.abspath(output))
+    fd, partial = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(index)))
+            f.write(index)
+            for (_, _, data), offset in zip(blobs, offsets):
+                f.seek(offset)
+                f.write(data)
+        os.replace(partial, output)
+    except BaseException:
+        os.unlink(partial)
+        raise
+    return [BankEntry(**item) for item in make_index(offsets)]
+
+
+class SoundBank:
+    """A memory-mapped, read-only sound bank."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._extract_dir = None
+        self._extracted: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SoundBankError(f"Cannot open sound bank {path}: {e}")
+        try:
+            magic, index_size = HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC:
+                raise SoundBankError(f"{path} is not a sound bank")
+            index = json.loads(bytes(self._mmap[HEADER.size:HEADER.size + index_size]))
+            self.entries = {item["name"]: BankEntry(**item) for item in index["entries"]}
+        except (struct.error, ValueError, KeyError, TypeError) as e:
+            self._mmap.close()
+            raise SoundBankError(f"Malformed sound bank {path}: {e}")
+
+    def names(self) -> List[str]:
+        return sorted(self.entries)
+
+    def get(self, name: str) -> Optional[BankEntry]:
+        return self.entries.get(name)
+
+    def data(self, entry: BankEntry) -> memoryview:
+        """Zero-copy view of an entry's bytes."""
+        return memoryview(self._mmap)[entry.offset:entry.offset + entry.length]
+
+    def buffer(self, name: str) -> Optional[PCMBuffer]:
+        """PCM buffer backed directly by the mapped file, for PCM entries."""
+        entry = self.entries.get(name)
+        if entry is None or entry.encoding != "pcm":
+            return None
+        return PCMBuffer(self.data(entry), entry.format)
+
+    def extract(self, name: str) -> str:
+        """Path of a playable file for an entry, written on first use."""
+        from .sequence import write_wav
+        with self._lock:
+            path = self._extracted.get(name)
+            if path is not None and os.path.exists(path):
+                return path
+            entry = self.entries[name]
+            if self._extract_dir is None:
+                self._extract_dir = tempfile.mkdtemp(prefix="mcp-sound-bank-")
+            if entry.encoding == "pcm":
+                path = os.path.join(self._extract_dir, f"{entry.hash[:16]}.wav")
+                write_wav(path, self.buffer(name))
+            else:
+                path = os.path.join(self._extract_dir, f"{entry.hash[:16]}.{entry.encoding}")
+                with open(path, "wb") as f:
+                    f.write(self.data(entry))
+            self._extracted[name] = path
+            return path
+
+    def close(self) -> None:
+        """Unmap the bank and remove extracted files."""
+        import shutil
+        if self._extract_dir is not None:
+            shutil.rmtree(self._extract_dir, ignore_errors=True)
+            self._extract_dir = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A buffer is still being played; the mapping goes away with the process
+            pass
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point for building and inspecting sound banks."""
+    parser = argparse.ArgumentParser(prog="mcp-sound-tool-bank",
+                                     description="Build and inspect sound bank files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Pack a sounds directory into a bank file")
+    build.add_argument("sounds_dir")
+    build.add_argument("output")
+    build.add_argument("--rate", type=int, default=DEFAULT_FORMAT.rate)
+    build.add_argument("--channels", type=int, default=DEFAULT_FORMAT.channels)
+    show = commands.add_parser("list", help="List the sounds in a bank file")
+    show.add_argument("bank")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        entries = build_bank(args.sounds_dir, args.output, PCMFormat(args.rate, args.channels))
+        for entry in entries:
+            print(f"{entry.name}: {entry.encoding}, {entry.length} bytes")
+        print(f"Wrote {len(entries)} sound(s) to {args.output}")
+    else:
+        try:
+            bank = SoundBank(args.bank)
+        except SoundBankError as e:
+            parser.exit(1, f"Error: {e}\n")
+        for name in bank.names():
+            entry = bank.get(name)
+            print(f"{name}: {entry.encoding}, {entry.length} bytes")
+        bank.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Startup timing for the --startup-profile option.
+
+IDEs restart MCP servers often, so the time until a server can answer
+"initialize" matters. Startup work is recorded as named phases; work that is
+deferred until first use (resolving the sounds directory, scanning it) is
+recorded when it finally happens.
+"""
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+# Set when the package is first imported, before any heavy imports
+IMPORT_STARTED = time.perf_counter()
+
+
+class StartupProfile:
+    """Durations of startup phases, optionally reported to a stream."""
+
+    def __init__(self, origin: float = IMPORT_STARTED):
+        self.origin = origin
+        self.phases: List[Tuple[str, float]] = []
+        self.enabled = False
+        self.stream: Optional[TextIO] = None
+        self._reported = False
+
+    def record(self, name: str, started: float, ended: Optional[float] = None) -> None:
+        """Record a phase that ran from started to ended (perf_counter values)."""
+        duration = (ended if ended is not None else time.perf_counter()) - started
+        self.phases.append((name, duration))
+        if self.enabled and self._reported:
+            # Deferred work reported as it happens, after the startup summary
+            self._write(f"startup profile: {name} (deferred) {duration * 1000:.1f} ms")
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started)
+
+    def report(self) -> str:
+        """Summary of the phases so far and the total time since import."""
+        lines = [f"  {name:<24} {duration * 1000:8.1f} ms" for name, duration in self.phases]
+        total = (time.perf_counter() - self.origin) * 1000
+        lines.append(f"  {'total since import':<24} {total:8.1f} ms")
+        return "startup profile:\n" + "\n".join(lines)
+
+    def enable(self, stream: Optional[TextIO] = None) -> None:
+        """Print the summary now and deferred phases as they happen."""
+        self.enabled = True
+        self.stream = stream
+        self._write(self.report())
+        self._reported = True
+
+    def _write(self, text: str) -> None:
+        # stdout carries the stdio protocol, so report on stderr
+        print(text, file=self.stream or sys.stderr, flush=True)
+
+
+# Profile of this process
+PROFILE = StartupProfile()
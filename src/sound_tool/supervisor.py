@@ -0,0 +1,90 @@
+"""
+Supervision of audio player processes.
+
+Every player process is tracked while it runs so it can be killed when it
+exceeds its maximum duration, when the user stops playback, or when the
+server shuts down. Killed processes are always reaped.
+"""
+import os
+import subprocess
+import threading
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from .metrics import PlaybackMetrics
+
+
+class PlaybackTimeout(Exception):
+    """Raised when a player runs longer than its allowed duration."""
+
+
+class PlaybackCancelled(Exception):
+    """Raised when a player is stopped before it finishes."""
+
+
+class PlaybackSupervisor:
+    """Run player processes with timeouts and allow them to be stopped."""
+
+    def __init__(self, metrics: Optional["PlaybackMetrics"] = None):
+        # Records how long starting each player process takes
+        self.metrics = metrics
+        self._processes = set()
+        self._stopped = set()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> int:
+        """Number of player processes currently running."""
+        return len(self._processes)
+
+    def run(self, argv: List[str], timeout: Optional[float] = None) -> None:
+        """
+        Run a player to completion.
+
+        Raises PlaybackTimeout if it runs longer than timeout seconds,
+        PlaybackCancelled if it was stopped, and CalledProcessError if it
+        exits with a non-zero status.
+        """
+        started = time.perf_counter()
+        process = subprocess.Popen(argv, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+        if self.metrics is not None:
+            self.metrics.observe("spawn_seconds", time.perf_counter() - started,
+                                 player=os.path.basename(argv[0]))
+        with self._lock:
+            self._processes.add(process)
+        try:
+            try:
+                returncode = process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self._kill(process)
+                raise PlaybackTimeout(f"{argv[0]} exceeded the maximum duration of {timeout:g}s")
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+                stopped = process in self._stopped
+                self._stopped.discard(process)
+        if stopped:
+            raise PlaybackCancelled(f"{argv[0]} was stopped")
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, argv)
+
+    @staticmethod
+    def _kill(process: subprocess.Popen) -> None:
+        try:
+            process.kill()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def stop_all(self) -> int:
+        """Kill every running player. Returns how many were stopped."""
+        with self._lock:
+            processes = list(self._processes)
+            self._stopped.update(processes)
+        for process in processes:
+            self._kill(process)
+        return len(processes)
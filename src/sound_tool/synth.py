@@ -0,0 +1,115 @@
+"""
+Procedural synthesis of tone cues.
+
+Beeps, chirps and chords are generated with NumPy from a small set of
+parameters, so cues can be played without any sound files. Rendered buffers
+are memoized by their parameters, so repeating a cue costs nothing.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from .numpy_support import INSTALL_HINT, np, numpy_available
+from .pcm import PCMBuffer, PCMFormat, DEFAULT_FORMAT
+from .sequence import concatenate
+
+WAVEFORMS = ("sine", "square", "triangle", "sawtooth")
+
+# Silence between the notes of a preset, in seconds
+NOTE_GAP = 0.03
+
+
+def synth_available() -> bool:
+    """Whether NumPy is installed so tones can be synthesized."""
+    return numpy_available()
+
+
+@dataclass(frozen=True)
+class ToneSpec:
+    """Parameters of a single synthesized note."""
+
+    # One frequency for a beep, several for a chord (Hz)
+    frequencies: Tuple[float, ...] = (880.0,)
+    duration: float = 0.15
+    waveform: str = "sine"
+    # Linear fade in and fade out (seconds)
+    attack: float = 0.005
+    release: float = 0.05
+    volume: float = 0.5
+    # Glide every frequency linearly by this factor over the note (a chirp)
+    sweep: Optional[float] = None
+
+    def validate(self) -> None:
+        """Raise ValueError if any parameter is out of range."""
+        if not self.frequencies or not all(20 <= f <= 20000 for f in self.frequencies):
+            raise ValueError("Frequencies must be between 20 and 20000 Hz")
+        if not 0 < self.duration <= 5:
+            raise ValueError("Duration must be between 0 and 5 seconds")
+        if self.waveform not in WAVEFORMS:
+            raise ValueError(f"Waveform must be one of: {', '.join(WAVEFORMS)}")
+        if not 0 <= self.volume <= 1:
+            raise ValueError("Volume must be between 0 and 1")
+        if self.sweep is not None and not 0.1 <= self.sweep <= 10:
+            raise ValueError("Sweep factor must be between 0.1 and 10")
+
+
+PRESETS: Dict[str, Tuple[ToneSpec, ...]] = {
+    "beep": (ToneSpec((880.0,), 0.15),),
+    "chirp": (ToneSpec((600.0,), 0.2, sweep=3.0),),
+    "chord": (ToneSpec((523.25, 659.25, 783.99), 0.4, release=0.2),),
+    "completion": (ToneSpec((659.25,), 0.1), ToneSpec((880.0,), 0.18, release=0.1)),
+    "error": (ToneSpec((220.0,), 0.15, "square", volume=0.3),
+              ToneSpec((174.61,), 0.25, "square", volume=0.3, release=0.1)),
+    "notification": (ToneSpec((987.77,), 0.08), ToneSpec((1318.51,), 0.12)),
+}
+
+
+def _wave(phase, waveform: str):
+    if waveform == "sine":
+        return np.sin(phase)
+    saw = 2.0 * ((phase / (2 * np.pi)) % 1.0) - 1.0
+    if waveform == "sawtooth":
+        return saw
+    if waveform == "triangle":
+        return 2.0 * np.abs(saw) - 1.0
+    return np.where(np.sin(phase) >= 0, 1.0, -1.0)
+
+
+@lru_cache(maxsize=128)
+def synthesize(spec: ToneSpec, fmt: PCMFormat = DEFAULT_FORMAT) -> PCMBuffer:
+    """Render a note to PCM. Results are memoized by (spec, fmt)."""
+    if not numpy_available():
+        raise RuntimeError(f"Tone synthesis requires numpy: {INSTALL_HINT}")
+    if fmt.sample_width != 2:
+        raise ValueError("Tone synthesis only supports 16-bit PCM")
+    spec.validate()
+
+    frames = int(spec.duration * fmt.rate)
+    t = np.arange(frames, dtype=np.float64) / fmt.rate
+    signal = np.zeros(frames)
+    for frequency in spec.frequencies:
+        if spec.sweep is None:
+            phase = 2 * np.pi * frequency * t
+        else:
+            # Integral of a frequency rising linearly from f to f * sweep
+            end = frequency * spec.sweep
+            phase = 2 * np.pi * (frequency * t + (end - frequency) * t * t / (2 * spec.duration))
+        signal += _wave(phase, spec.waveform)
+    signal /= len(spec.frequencies)
+
+    envelope = np.ones(frames)
+    attack = min(int(spec.attack * fmt.rate), frames)
+    release = min(int(spec.release * fmt.rate), frames - attack)
+    if attack:
+        envelope[:attack] = np.linspace(0.0, 1.0, attack, endpoint=False)
+    if release:
+        envelope[frames - release:] = np.linspace(1.0, 0.0, release)
+
+    samples = (signal * envelope * spec.volume * 32767).astype("<i2")
+    samples = np.repeat(samples[:, None], fmt.channels, axis=1)
+    return PCMBuffer(samples.tobytes(), fmt)
+
+
+def render_notes(specs: Tuple[ToneSpec, ...], fmt: PCMFormat = DEFAULT_FORMAT) -> PCMBuffer:
+    """Render several notes back to back with a short gap between them."""
+    return concatenate([synthesize(spec, fmt) for spec in specs], NOTE_GAP, 1, fmt)
@@ -1,79 +1,254 @@
 """
 Model Context Protocol (MCP) tool definitions for sound-tool
 
-This file defines the schema and usage guidance for sound playing tools
-that can be called by AI agents
+This file is the single source of the descriptions the server sends with
+tools/list. They stay in every agent's context for the whole session, so
+besides the full descriptions, which explain when to use each tool, there
+is a compact form: one line per tool, and parameter schemas reduced to
+types, enums and defaults.
 """
+import inspect
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple
 
-play_sound_tool_definition = {
-    "name": "play_sound",
-    "description": """
-    Play a notification sound on the user's device.
-    
-    Use this tool to provide audio feedback to the user:
-    - Use 'completion' when a task or command has successfully completed
-    - Use 'error' when an error or failure has occurred
-    - Use 'notification' for important information or alerts
-    - Use 'custom' when you need to play a specific sound file
-    
-    AI agents should proactively use these sounds to improve user experience by
-    providing audio cues for important events.
-    """,
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "sound_type": {
-                "type": "string",
-                "enum": ["completion", "error", "notification", "custom"],
-                "description": "The type of sound to play. Default is 'completion'."
-            },
-            "custom_sound_path": {
-                "type": "string",
-                "description": "Path to a custom sound file (only used if sound_type is 'custom')."
-            }
+from .synth import PRESETS
+
+SERVER_DESCRIPTION = """
+This MCP server provides audio feedback capabilities for AI interactions.
+
+IMPORTANT USAGE GUIDELINES:
+- AI agents should play sounds to provide audio feedback based on command outcomes
+- Use 'completion' sounds when successfully completing a task or command
+- Use 'error' sounds when a command fails or an error occurs
+- Use 'notification' sounds for important alerts or information
+
+These sounds enhance the user experience by providing clear audio cues
+about the status of operations without requiring the user to read text.
+"""
+
+SERVER_DESCRIPTION_COMPACT = (
+    "Plays sounds as audio feedback on command outcomes: "
+    "completion on success, error on failure, notification for alerts."
+)
+
+
+@dataclass(frozen=True)
+class ToolDefinition:
+    """What a tool is for, and what each of its parameters means."""
+
+    name: str
+    # One line, used on its own in compact mode
+    summary: str
+    # When to use the tool and how it behaves, added in full mode
+    guidance: str = ""
+    # Parameter descriptions, only sent in full mode
+    parameters: Dict[str, str] = field(default_factory=dict)
+    # Allowed values of free-form parameters, sent in both modes
+    enums: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    def description(self, compact: bool = False) -> str:
+        if compact or not self.guidance:
+            return self.summary
+        return self.summary + "\n\n" + inspect.cleandoc(self.guidance)
+
+
+_WAIT = "Wait until the sound has finished playing (default: the server's setting)"
+
+TOOLS: Dict[str, ToolDefinition] = {definition.name: definition for definition in (
+    ToolDefinition(
+        "play_sound",
+        "Play a notification sound on the user's device.",
+        """
+        WHEN TO USE THIS TOOL:
+        - Use 'completion' sound when a task or command has SUCCESSFULLY completed
+        - Use 'error' sound when a command has FAILED or an error has occurred
+        - Use 'notification' sound for important alerts or information that needs attention
+        - Use 'custom' sound only when you need a specific sound not covered by the standard types
+
+        AI agents SHOULD proactively use these sounds to provide audio feedback based on
+        the outcome of commands or operations, enhancing the user experience with
+        non-visual status indicators.
+
+        Example usage: After executing a terminal command, play a 'completion' sound if
+        successful or an 'error' sound if it failed.
+
+        Sounds are queued and the tool returns immediately with a ticket ID.
+        Set wait to true to wait until the sound has finished playing.
+        """,
+        {
+            "sound_type": "The kind of outcome to signal; 'custom' plays custom_sound_path",
+            "custom_sound_path": "Sound file to play when sound_type is 'custom'",
+            "wait": _WAIT,
+        },
+    ),
+    ToolDefinition(
+        "play_sequence",
+        "Play several sounds back to back as a single cue.",
+        """
+        WHEN TO USE THIS TOOL:
+        - When summarizing several outcomes at once, e.g. three 'completion'
+          sounds and one 'error' sound after a batch of commands
+        - Instead of calling play_sound several times in a row
+        """,
+        {
+            "sounds": "Sound names ('completion', 'error', 'notification'), synthesized "
+                      "tones such as 'tone:beep', or paths to sound files",
+            "gap": "Silence between sounds in seconds",
+            "repeat": "How many times to play the whole sequence",
+            "wait": _WAIT,
+        },
+    ),
+    ToolDefinition(
+        "play_tone",
+        "Play a synthesized tone; no sound files are needed.",
+        """
+        WHEN TO USE THIS TOOL:
+        - When you want a distinct cue that none of the sound files provide
+        - When no sound files are installed
+
+        Use a preset or describe the tone with the other parameters.
+        """,
+        {
+            "preset": "A ready-made tone; the other tone parameters are ignored",
+            "frequencies": "One frequency in Hz for a beep, several for a chord",
+            "duration": "Length of the tone in seconds",
+            "waveform": "Shape of the wave",
+            "sweep": "Factor the frequencies glide by over the tone, for a rising "
+                     "(above 1) or falling (below 1) chirp",
+            "volume": "Volume from 0 to 1",
+            "wait": _WAIT,
         },
-        "required": []
-    },
-    "returns": {
-        "type": "string",
-        "description": "A message indicating the result of the operation"
-    }
-}
-
-list_sounds_tool_definition = {
-    "name": "list_available_sounds",
-    "description": """
-    List all available notification sounds.
-    
-    Use this tool when you need to check what sound options are available to play.
-    This is helpful when determining what custom sounds might be available.
-    """,
-    "parameters": {
-        "type": "object",
-        "properties": {},
-        "required": []
-    },
-    "returns": {
-        "type": "string",
-        "description": "A string listing all available sound files"
-    }
-}
-
-install_tool_definition = {
-    "name": "install_to_user_dir",
-    "description": """
-    Install sound files to user's config directory.
-    
-    This tool should be used when the user wants to install the default sound files
-    to their config directory for customization.
-    """,
-    "parameters": {
-        "type": "object",
-        "properties": {},
-        "required": []
-    },
-    "returns": {
-        "type": "string",
-        "description": "A message indicating the result of the operation"
-    }
-} 
\ No newline at end of file
+        {"preset": tuple(PRESETS)},
+    ),
+    ToolDefinition(
+        "stop_sound",
+        "Stop a sound that is playing or waiting to be played.",
+        """
+        WHEN TO USE THIS TOOL:
+        - When a long sound is playing and the user wants silence
+        - When a queued sound is no longer relevant
+        """,
+        {
+            "ticket_id": "Ticket ID returned by a play tool; without one, the sound "
+                         "that is playing now is stopped",
+            "clear_queue": "Also drop every queued sound",
+        },
+    ),
+    ToolDefinition(
+        "list_available_sounds",
+        "List all available notification sounds.",
+        """
+        WHEN TO USE THIS TOOL:
+        - When you need to check what sound options are available
+        - When determining if a specific sound file exists
+        - Before using a custom sound to verify available options
+
+        With loudness normalization on, each sound is listed with its
+        measured level and the gain it is played with.
+        """,
+    ),
+    ToolDefinition(
+        "get_playback_stats",
+        "Report playback statistics.",
+        """
+        WHEN TO USE THIS TOOL:
+        - When sounds seem slow, late or missing
+        - When monitoring the sound tool
+
+        Returns latency percentiles for each stage of playback (tool call,
+        lookup, queue wait, decoding, player start-up and playback per
+        backend), the queue depth, the cache hit rate, how many sounds were
+        dropped or merged, and how often each backend failed.
+        """,
+        {"format": "'prometheus' for the Prometheus text format"},
+    ),
+    ToolDefinition(
+        "dump_profile",
+        "Report the slowest tool calls and where their time went.",
+        """
+        WHEN TO USE THIS TOOL:
+        - When a tool call was slow and you need to know why
+
+        Only available when the server runs with profiling on. Returns the
+        slowest calls so far and the functions they spent the most time in,
+        and writes a trace of every call that chrome://tracing or Perfetto
+        can open.
+        """,
+        {"limit": "Number of functions to list"},
+    ),
+    ToolDefinition(
+        "install_to_user_dir",
+        "Install sound files to user's config directory.",
+        """
+        WHEN TO USE THIS TOOL:
+        - When the user wants to customize the sound files
+        - When setting up the sound tool for the first time
+        - When troubleshooting missing sound files
+
+        This tool copies the default sound files to the user's configuration directory
+        where they can be modified or replaced with custom sounds. Only new or
+        changed files are copied. Sounds the installed audio players can't play
+        natively are also converted to WAV.
+        """,
+        {"source_dir": "Directory of a sound pack to install instead of the bundled sounds"},
+    ),
+)}
+
+
+def describe(name: str, compact: bool = False) -> str:
+    """Description of a tool."""
+    return TOOLS[name].description(compact)
+
+
+def server_description(compact: bool = False) -> str:
+    return SERVER_DESCRIPTION_COMPACT if compact else inspect.cleandoc(SERVER_DESCRIPTION)
+
+
+def _compact_property(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a property schema to its type, enum, items and non-null default."""
+    variants = [v for v in schema.get("anyOf", ()) if v.get("type") != "null"]
+    if len(variants) == 1:
+        # Optional[X] parameters: the null branch only restates the default
+        schema = {**variants[0], **{k: v for k, v in schema.items() if k != "anyOf"}}
+    return {key: value for key, value in schema.items()
+            if key in ("type", "enum", "items", "anyOf")
+            or (key == "default" and value is not None)}
+
+
+def _add_enum(schema: Dict[str, Any], values: list) -> None:
+    # Optional parameters keep accepting null; the enum goes on the other branch
+    for variant in schema.get("anyOf", ()):
+        if variant.get("type") != "null":
+            variant["enum"] = values
+            return
+    schema["enum"] = values
+
+
+def tool_schema(name: str, schema: Dict[str, Any], compact: bool = False) -> Dict[str, Any]:
+    """
+    Input schema generated from a tool's signature, finished from its definition.
+
+    Titles, which only restate the parameter names, are dropped. Full mode
+    adds the parameter descriptions; compact mode keeps only types, enums
+    and defaults.
+    """
+    definition = TOOLS[name]
+    properties = {}
+    for parameter, property_schema in schema.get("properties", {}).items():
+        property_schema = {k: v for k, v in property_schema.items() if k != "title"}
+        if compact:
+            property_schema = _compact_property(property_schema)
+        elif parameter in definition.parameters:
+            property_schema["description"] = definition.parameters[parameter]
+        if parameter in definition.enums:
+            _add_enum(property_schema, list(definition.enums[parameter]))
+        properties[parameter] = property_schema
+    result = {key: value for key, value in schema.items() if key not in ("title", "properties")}
+    result["properties"] = properties
+    return result
+
+
+def schema_size(tool: Dict[str, Any]) -> int:
+    """Bytes a tool takes up in a tools/list response (compact JSON, UTF-8)."""
+    return len(json.dumps(tool, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
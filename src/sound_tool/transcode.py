@@ -0,0 +1,108 @@
+"""
+Transcoded variants of sound files.
+
+aplay and winsound only play WAV, so with those players the bundled MP3
+files either fail or need a slower player. When sounds are installed, every
+sound the fastest available player cannot play natively is transcoded to
+WAV once and stored in a variants directory, keyed by the content hash of
+the original file. The catalog then serves the variant instead of the
+original. With loudness normalization, variants with the gain applied are
+stored alongside them, named after the hash and the gain.
+"""
+import logging
+import math
+import os
+import platform
+import tempfile
+from typing import Callable, List, Optional
+
+from .backends import BackendRegistry, file_format
+from .config import cache_dir
+from .loudness import apply_gain, needs_gain
+from .pcm import DecodeError, PCMBuffer, PCMFormat, DEFAULT_FORMAT, decode_file
+from .sequence import write_wav
+
+VARIANT_FORMAT = "wav"
+
+logger = logging.getLogger(__name__)
+
+
+def default_variants_dir() -> str:
+    """Variants directory under the user's cache directory."""
+    return cache_dir("variants")
+
+
+def needs_variant(sound_file: str, registry: BackendRegistry, system: Optional[str] = None) -> bool:
+    """Whether sound_file plays faster (or at all) after transcoding to WAV."""
+    if file_format(sound_file) == VARIANT_FORMAT:
+        return False
+    system = system or platform.system()
+    if system == "Windows":
+        # winsound only plays WAV files
+        return True
+    if system != "Linux":
+        # afplay plays every format we ship
+        return False
+    wav_player = registry.select("variant." + VARIANT_FORMAT)
+    if wav_player is None:
+        return False
+    native_player = registry.select(sound_file)
+    return native_player is None or wav_player.priority < native_player.priority
+
+
+class VariantCache:
+    """Directory of WAV variants named after the content hash of their source."""
+
+    def __init__(self, directory: Optional[str] = None, fmt: PCMFormat = DEFAULT_FORMAT,
+                 decoder: Callable[[str, PCMFormat], PCMBuffer] = decode_file):
+        self.directory = directory or default_variants_dir()
+        self.format = fmt
+        self.decoder = decoder
+
+    def path_for(self, digest: str, gain: float = 1.0) -> str:
+        if needs_gain(gain):
+            digest = f"{digest}{20 * math.log10(gain):+.1f}dB"
+        return os.path.join(self.directory, f"{digest}.{VARIANT_FORMAT}")
+
+    def lookup(self, digest: str) -> Optional[str]:
+        """Path of the variant of a file with this content hash, if it exists."""
+        path = self.path_for(digest)
+        return path if os.path.exists(path) else None
+
+    def ensure(self, sound_file: str, digest: str, gain: float = 1.0) -> Optional[str]:
+        """
+        Transcode sound_file, scaled by gain, unless its variant already exists.
+
+        Returns the variant path, or None if the file cannot be decoded here.
+        """
+        target = self.path_for(digest, gain)
+        if os.path.exists(target):
+            return target
+        try:
+            buffer = apply_gain(self.decoder(sound_file, self.format), gain)
+        except DecodeError as e:
+            logger.warning("Cannot transcode %s: %s", sound_file, e)
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        # Write under a temporary name so a player never sees a partial file
+        fd, partial = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        os.close(fd)
+        try:
+            write_wav(partial, buffer)
+            os.replace(partial, target)
+        except BaseException:
+            os.unlink(partial)
+            raise
+        return target
+
+
+def transcode_entries(entries, variants: VariantCache, registry: BackendRegistry,
+                      system: Optional[str] = None) -> List[str]:
+    """Create variants for catalog entries that need one. Returns their paths."""
+    created = []
+    for entry in entries:
+        if needs_variant(entry.path, registry, system):
+            path = variants.ensure(entry.path, entry.hash)
+            if path is not None:
+                created.append(path)
+    return created
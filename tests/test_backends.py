@@ -0,0 +1,71 @@
+"""
+Tests for the BackendRegistry class.
+"""
+from unittest.mock import patch, MagicMock
+
+from src.sound_tool.backends import Backend, BackendRegistry
+
+FAST_MP3 = Backend("fastmp3", ("fastmp3",), frozenset({"mp3"}), priority=1)
+
+
+class TestBackendRegistry:
+    """Test cases for the BackendRegistry class."""
+
+    @patch('shutil.which')
+    def test_probe_runs_once(self, mock_which):
+        """Test that installed players are probed once and then remembered."""
+        mock_which.side_effect = lambda name: "/usr/bin/aplay" if name == "aplay" else None
+        registry = BackendRegistry()
+
+        for _ in range(5):
+            registry.select("test.wav")
+
+        assert mock_which.call_count == len(registry._backends)
+        assert [b.name for b in registry.available] == ["aplay"]
+
+    @patch('shutil.which', return_value="/usr/bin/player")
+    def test_select_by_format_and_priority(self, mock_which):
+        """Test that the fastest backend supporting the format is selected."""
+        registry = BackendRegistry()
+
+        assert registry.select("test.wav").name == "paplay"
+        assert registry.select("test.MP3").name == "mpg123"
+        assert registry.select("test.xyz") is None
+
+    @patch('shutil.which')
+    def test_paplay_is_last_resort_for_mp3(self, mock_which):
+        """Test that paplay is tried for MP3 after every dedicated decoder."""
+        mock_which.side_effect = lambda name: "/usr/bin/paplay" if name == "paplay" else None
+        registry = BackendRegistry()
+
+        assert [b.name for b in registry.candidates("test.mp3")] == ["paplay-mp3"]
+
+        mock_which.side_effect = lambda name: "/usr/bin/" + name
+        registry.probe()
+        assert registry.candidates("test.mp3")[-1].name == "paplay-mp3"
+        assert registry.select("test.mp3").name == "mpg123"
+
+    @patch('shutil.which', return_value="/usr/bin/player")
+    def test_register_reprobes(self, mock_which):
+        """Test that registering a backend makes it selectable."""
+        registry = BackendRegistry()
+        registry.probe()
+
+        registry.register(FAST_MP3)
+
+        assert registry.select("test.mp3") is FAST_MP3
+
+    @patch('shutil.which', return_value="/usr/bin/player")
+    @patch('src.sound_tool.backends._entry_points')
+    def test_load_entry_points(self, mock_entry_points, mock_which):
+        """Test that backends published through entry points are registered."""
+        entry_point = MagicMock()
+        entry_point.load.return_value = lambda: [FAST_MP3]
+        broken = MagicMock()
+        broken.load.side_effect = ImportError("missing module")
+        mock_entry_points.return_value = [entry_point, broken]
+        registry = BackendRegistry()
+
+        registry.load_entry_points()
+
+        assert registry.select("test.mp3") is FAST_MP3
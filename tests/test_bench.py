@@ -0,0 +1,53 @@
+"""
+Tests for the tool-call benchmarks and the recording sink.
+"""
+import wave
+
+from src.sound_tool.bench import BenchResult, main, run
+from src.sound_tool.pcm import PCMBuffer
+from src.sound_tool.sink import RecordingSink
+
+
+class TestRecordingSink:
+    """Test cases for the RecordingSink class."""
+
+    def test_writes_wav(self, tmp_path):
+        """Test that written buffers end up in a WAV file in the sink format."""
+        path = tmp_path / "out.wav"
+        sink = RecordingSink(str(path))
+        sink.write(PCMBuffer(b"\x01\x00" * 200, sink.format))
+        sink.write(PCMBuffer(b"\x02\x00" * 200, sink.format))
+        sink.close()
+
+        with wave.open(str(path), "rb") as wav:
+            assert wav.getframerate() == sink.format.rate
+            assert wav.getnframes() == 200
+        assert (sink.writes, sink.frames) == (2, 200)
+
+
+class TestBench:
+    """Test cases for the benchmark runner."""
+
+    def test_scenarios_play_every_call(self):
+        """Test that calls go through the MCP session and are played by the null sink."""
+        burst, custom = run(["burst", "custom_paths"], calls=20)
+
+        assert (burst.calls, burst.errors, burst.played) == (20, 0, 20)
+        assert (custom.calls, custom.errors, custom.played) == (20, 0, 20)
+        assert 0 < burst.percentile(0.5) <= burst.percentile(0.99)
+        assert burst.calls_per_second > 0
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        result = BenchResult("test", [0.004, 0.001, 0.003, 0.002], seconds=1.0)
+
+        assert result.percentile(0.5) == 0.002
+        assert result.percentile(0.99) == 0.004
+
+    def test_main_json(self, capsys):
+        """Test that --json prints one result object per scenario."""
+        main(["--calls", "5", "--json", "warm_catalog"])
+
+        out = capsys.readouterr().out
+        assert '"scenario": "warm_catalog"' in out
+        assert '"calls": 5' in out
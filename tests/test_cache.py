@@ -0,0 +1,79 @@
+"""
+Tests for the SampleCache class.
+"""
+from unittest.mock import MagicMock
+
+from src.sound_tool.cache import SampleCache
+from src.sound_tool.pcm import PCMBuffer
+
+
+def make_decoder(nbytes=100):
+    """Return a mock decoder producing buffers of a fixed size."""
+    return MagicMock(side_effect=lambda path, fmt: PCMBuffer(b"\x00" * nbytes, fmt))
+
+
+class TestSampleCache:
+    """Test cases for the SampleCache class."""
+
+    def test_hit_after_miss(self, tmp_path):
+        """Test that a second load is served from memory."""
+        path = tmp_path / "completion.mp3"
+        path.write_bytes(b"completion")
+        decoder = make_decoder()
+        cache = SampleCache(decoder=decoder)
+
+        first = cache.load(str(path))
+        second = cache.load(str(path))
+
+        assert first is second
+        decoder.assert_called_once()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_identical_files_share_buffer(self, tmp_path):
+        """Test that files with the same content are decoded only once."""
+        (tmp_path / "error.mp3").write_bytes(b"same")
+        (tmp_path / "notification.mp3").write_bytes(b"same")
+        decoder = make_decoder()
+        cache = SampleCache(decoder=decoder)
+
+        cache.load(str(tmp_path / "error.mp3"))
+        cache.load(str(tmp_path / "notification.mp3"))
+
+        decoder.assert_called_once()
+        assert cache.stats()["entries"] == 1
+
+    def test_lru_eviction_by_bytes(self, tmp_path):
+        """Test that the least recently used buffer is evicted when over budget."""
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.mp3"
+            path.write_bytes(name.encode())
+            paths.append(str(path))
+        decoder = make_decoder(100)
+        cache = SampleCache(max_bytes=250, decoder=decoder)
+
+        cache.load(paths[0])
+        cache.load(paths[1])
+        cache.load(paths[0])  # a is now more recent than b
+        cache.load(paths[2])  # evicts b
+
+        assert cache.size == 200
+        assert cache.evictions == 1
+        cache.load(paths[0])
+        assert decoder.call_count == 3
+        cache.load(paths[1])
+        assert decoder.call_count == 4
+
+    def test_changed_file_is_decoded_again(self, tmp_path):
+        """Test that rewriting a file invalidates its cached hash."""
+        path = tmp_path / "custom.mp3"
+        path.write_bytes(b"v1")
+        decoder = make_decoder()
+        cache = SampleCache(decoder=decoder)
+
+        cache.load(str(path))
+        path.write_bytes(b"version 2")
+        cache.load(str(path))
+
+        assert decoder.call_count == 2
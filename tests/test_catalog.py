@@ -0,0 +1,89 @@
+"""
+Tests for the SoundCatalog class.
+"""
+import os
+from unittest.mock import patch
+
+from src.sound_tool.catalog import SoundCatalog
+
+BUNDLED_SOUNDS = os.path.join(os.path.dirname(__file__), "..", "src", "sound_tool", "sounds")
+
+
+class TestSoundCatalog:
+    """Test cases for the SoundCatalog class."""
+
+    def test_index_bundled_sounds(self):
+        """Test that bundled sounds are indexed with size, duration and hash."""
+        catalog = SoundCatalog(BUNDLED_SOUNDS)
+
+        entry = catalog.lookup("completion")
+
+        assert entry is not None
+        assert entry.format == "mp3"
+        assert entry.size == os.path.getsize(entry.path)
+        assert 1.5 < entry.duration < 2.5
+        assert len(entry.hash) == 64
+        assert catalog.filenames() == ["completion.mp3", "error.mp3", "notification.mp3"]
+
+    def test_mp3_preferred_over_wav(self, tmp_path):
+        """Test that the MP3 file wins when both formats exist."""
+        (tmp_path / "error.wav").write_bytes(b"wav")
+        (tmp_path / "error.mp3").write_bytes(b"mp3")
+
+        catalog = SoundCatalog(str(tmp_path))
+
+        assert catalog.lookup("error").format == "mp3"
+        assert catalog.lookup("missing") is None
+
+    def test_lookups_served_from_memory(self, tmp_path):
+        """Test that repeated lookups don't rescan the directory."""
+        (tmp_path / "completion.mp3").write_bytes(b"mp3")
+        catalog = SoundCatalog(str(tmp_path), refresh_interval=60)
+        catalog.lookup("completion")
+
+        with patch('os.scandir') as mock_scandir, patch('os.stat') as mock_stat:
+            for _ in range(10):
+                catalog.lookup("completion")
+
+        mock_scandir.assert_not_called()
+        mock_stat.assert_not_called()
+        assert catalog.scans == 1
+
+    def test_refresh_on_directory_change(self, tmp_path):
+        """Test that new files are picked up and unchanged entries are reused."""
+        (tmp_path / "completion.mp3").write_bytes(b"mp3")
+        catalog = SoundCatalog(str(tmp_path), refresh_interval=0)
+        before = catalog.lookup("completion")
+
+        (tmp_path / "notification.wav").write_bytes(b"wav")
+        # Make sure the directory mtime moves even on coarse-grained filesystems
+        stat = os.stat(tmp_path)
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert catalog.lookup("notification") is not None
+        assert catalog.lookup("completion") is before
+        assert catalog.scans == 2
+
+    def test_refresh_on_file_overwritten_in_place(self, tmp_path):
+        """Test that a file rewritten without touching the directory is indexed again."""
+        path = tmp_path / "completion.wav"
+        path.write_bytes(b"wav")
+        catalog = SoundCatalog(str(tmp_path), refresh_interval=0)
+        before = catalog.lookup("completion")
+        dir_stat = os.stat(tmp_path)
+
+        path.write_bytes(b"a longer wav")
+        os.utime(tmp_path, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+        after = catalog.lookup("completion")
+
+        assert after.size == len(b"a longer wav")
+        assert after.hash != before.hash
+        assert catalog.scans == 2
+        assert catalog.lookup("completion") is after
+
+    def test_missing_directory(self, tmp_path):
+        """Test that a missing directory gives an empty catalog."""
+        catalog = SoundCatalog(str(tmp_path / "missing"))
+
+        assert catalog.filenames() == []
+        assert catalog.lookup("completion") is None
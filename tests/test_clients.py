@@ -0,0 +1,53 @@
+"""
+Tests for client identification and concurrency limits.
+"""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from src.sound_tool.clients import ClientLimiter, client_key
+from src.sound_tool.server import main
+
+
+class TestClientLimiter:
+    """Test cases for the ClientLimiter class."""
+
+    def test_limits_concurrent_calls(self):
+        """Test that no more than max_concurrent calls run at once."""
+        limiter = ClientLimiter(max_concurrent=2)
+        peak = []
+
+        async def call():
+            async with limiter.slot():
+                peak.append(limiter.active)
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            await asyncio.gather(*(call() for _ in range(6)))
+
+        asyncio.run(scenario())
+        assert max(peak) == 2
+        assert limiter.active == 0
+
+    def test_client_key(self):
+        """Test that clients are told apart by client ID or session."""
+        assert client_key(None) is None
+        assert client_key(MagicMock(client_id="cursor-1")) == "cursor-1"
+
+        session = object()
+        ctx = MagicMock(client_id=None, session=session)
+        assert client_key(ctx) == f"session-{id(session):x}"
+
+
+class TestMain:
+    """Test cases for the command line options of main."""
+
+    @patch('src.sound_tool.server.SoundToolServer')
+    def test_sse_transport(self, mock_server):
+        """Test that --transport sse runs the SSE transport with the given options."""
+        main(["--transport", "sse", "--port", "9000", "--max-concurrent", "4"])
+
+        config = mock_server.call_args[0][0]
+        assert (config.transport, config.host, config.port, config.max_concurrent) == \
+            ("sse", "127.0.0.1", 9000, 4)
+        mock_server.return_value.mcp.run.assert_called_once_with(transport="sse")
+        mock_server.return_value.close.assert_called_once()
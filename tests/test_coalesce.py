@@ -0,0 +1,119 @@
+"""
+Tests for the EventCoalescer and TokenBucket classes.
+"""
+import asyncio
+import threading
+
+from src.sound_tool.coalesce import (
+    EventCoalescer, TokenBucket, ADMITTED, COALESCED, RATE_LIMITED,
+)
+from src.sound_tool.config import SoundToolConfig
+from src.sound_tool.server import SoundToolServer
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """Test cases for the TokenBucket class."""
+
+    def test_burst_then_refill(self):
+        """Test that a bucket allows a burst and refills over time."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock)
+
+        assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+        clock.now += 0.5
+        assert bucket.take()
+        assert not bucket.take()
+
+
+class TestEventCoalescer:
+    """Test cases for the EventCoalescer class."""
+
+    def test_repeats_within_window_are_merged(self):
+        """Test that identical requests inside the window merge into the first."""
+        clock = FakeClock()
+        coalescer = EventCoalescer(window=0.5, rate=0, clock=clock)
+
+        assert coalescer.admit("completion", "completion.mp3")[0] == ADMITTED
+        coalescer.attach("completion.mp3", 7)
+        clock.now += 0.1
+        assert coalescer.admit("completion", "completion.mp3") == (COALESCED, 7, 1)
+        assert coalescer.admit("completion", "completion.mp3") == (COALESCED, 7, 2)
+        assert coalescer.admit("error", "error.mp3")[0] == ADMITTED
+
+        clock.now += 1
+        assert coalescer.admit("completion", "completion.mp3")[0] == ADMITTED
+        assert coalescer.stats()["coalesced"] == 2
+
+    def test_forget(self):
+        """Test that a forgotten request no longer absorbs repeats."""
+        coalescer = EventCoalescer(window=0.5, rate=0, clock=FakeClock())
+        coalescer.admit("completion", "completion.mp3")
+
+        coalescer.forget("completion.mp3")
+
+        assert coalescer.admit("completion", "completion.mp3")[0] == ADMITTED
+
+    def test_rate_limit_per_type(self):
+        """Test that each sound type has its own token bucket."""
+        clock = FakeClock()
+        coalescer = EventCoalescer(window=0, rate=1, burst=2, clock=clock)
+
+        verdicts = [coalescer.admit("completion", f"{i}.mp3")[0] for i in range(3)]
+        assert verdicts == [ADMITTED, ADMITTED, RATE_LIMITED]
+        assert coalescer.admit("error", "error.mp3")[0] == ADMITTED
+
+        stats = coalescer.stats()
+        assert stats["rate_limited"] == 1
+        assert stats["per_type"]["completion"][RATE_LIMITED] == 1
+
+    def test_merged_requests_do_not_use_tokens(self):
+        """Test that merged repeats don't count against the rate limit."""
+        clock = FakeClock()
+        coalescer = EventCoalescer(window=1, rate=1, burst=1, clock=clock)
+
+        coalescer.admit("completion", "completion.mp3")
+        for _ in range(10):
+            assert coalescer.admit("completion", "completion.mp3")[0] == COALESCED
+        clock.now += 1.5
+        assert coalescer.admit("completion", "completion.mp3")[0] == ADMITTED
+
+
+class TestServerCoalescing:
+    """Test cases for coalescing play_sound calls in the server."""
+
+    def test_repeats_of_dropped_sound_are_not_merged(self, tmp_path):
+        """Test that a sound dropped from a full queue doesn't absorb its repeats."""
+        sound = tmp_path / "custom.wav"
+        sound.write_bytes(b"RIFF")
+        server = SoundToolServer(SoundToolConfig(use_sink=False, queue_size=1, rate_limit=0))
+        release = threading.Event()
+        server.scheduler.play_func = lambda path: release.wait(5)
+        arguments = {"sound_type": "custom", "custom_sound_path": str(sound)}
+
+        async def scenario():
+            await server.scheduler.submit("error", "playing.wav")
+            await asyncio.sleep(0.05)
+            await server.scheduler.submit("error", "queued.wav")
+            results = [(await server.mcp.call_tool("play_sound", arguments))[0].text
+                       for _ in range(2)]
+            release.set()
+            await server.scheduler.join()
+            return results
+
+        try:
+            results = asyncio.run(scenario())
+        finally:
+            server.close()
+
+        assert results == ["Dropped custom sound: playback queue is full"] * 2
+
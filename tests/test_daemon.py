@@ -0,0 +1,172 @@
+"""
+Tests for the shared playback daemon.
+"""
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+from src.sound_tool.config import SoundToolConfig
+from src.sound_tool.daemon import DaemonClient, PlaybackDaemon
+from src.sound_tool.pcm import PCMBuffer
+from src.sound_tool.playback import DONE, FAILED, PlaybackScheduler
+from src.sound_tool.sequence import write_wav
+from src.sound_tool.server import SoundToolServer
+from src.sound_tool.soundbank import BANK_FILENAME, build_bank
+
+
+def make_server(played):
+    """A stand-in for SoundToolServer with a real scheduler."""
+    server = MagicMock()
+    server.scheduler = PlaybackScheduler(played.append, priorities={})
+    server.stop.return_value = "No sound is playing"
+    return server
+
+
+class TestPlaybackDaemon:
+    """Test cases for PlaybackDaemon and DaemonClient."""
+
+    def test_play_and_stop(self, tmp_path):
+        """Test that play requests are queued on the daemon and answered."""
+        played = []
+        server = make_server(played)
+        path = str(tmp_path / "daemon.sock")
+        completion, error = tmp_path / "completion.mp3", tmp_path / "error.mp3"
+        completion.write_bytes(b"ID3")
+        error.write_bytes(b"ID3")
+
+        async def scenario():
+            daemon = PlaybackDaemon(server, path)
+            await daemon.start()
+            client = DaemonClient(path)
+            queued = await client.play("completion", str(completion))
+            finished = await client.play("error", str(error), priority=0, wait=True)
+            stopped = await client.stop(clear_queue=True)
+            client.close()
+            await daemon.close()
+            return queued, finished, stopped
+
+        queued, finished, stopped = asyncio.run(scenario())
+
+        assert queued.id == 1
+        assert queued.finished.is_set()
+        assert finished.id == 2
+        assert finished.status == DONE
+        assert played == [str(completion), str(error)]
+        assert stopped == "No sound is playing"
+        server.stop.assert_called_once_with(None, True)
+
+    def test_bank_sound_and_missing_file(self, tmp_path):
+        """Test that bank sounds are resolved by the daemon and missing files fail."""
+        sounds = tmp_path / "sounds"
+        sounds.mkdir()
+        write_wav(str(sounds / "completion.wav"), PCMBuffer(b"\x01\x00\x01\x00" * 441))
+        build_bank(str(sounds), str(sounds / BANK_FILENAME))
+        server = SoundToolServer(SoundToolConfig(record_sink="null"))
+        server.sounds_dir = str(sounds)
+        path = str(tmp_path / "daemon.sock")
+
+        async def scenario():
+            daemon = PlaybackDaemon(server, path)
+            await daemon.start()
+            client = DaemonClient(path)
+            played = await client.play("completion", "bank:completion", wait=True)
+            missing = await client.play("custom", str(tmp_path / "missing.wav"), wait=True)
+            unknown = await client.play("custom", "bank:unknown", wait=True)
+            client.close()
+            await daemon.close()
+            return played, missing, unknown
+
+        try:
+            played, missing, unknown = asyncio.run(scenario())
+        finally:
+            server.close()
+
+        assert played.status == DONE
+        assert server.player.sink.writes == 1
+        assert missing.status == FAILED and "Sound file not found" in missing.error
+        assert unknown.status == FAILED
+
+    def test_daemon_not_running(self, tmp_path):
+        """Test that the client reports an unreachable daemon with None."""
+        client = DaemonClient(str(tmp_path / "missing.sock"))
+
+        async def scenario():
+            return await client.play("completion", "/sounds/completion.mp3"), await client.ping()
+
+        assert asyncio.run(scenario()) == (None, False)
+
+    def test_stale_socket_replaced(self, tmp_path):
+        """Test that a socket file left by a crashed daemon is replaced."""
+        path = tmp_path / "daemon.sock"
+        path.write_bytes(b"")
+        server = make_server([])
+
+        async def scenario():
+            daemon = PlaybackDaemon(server, str(path))
+            await daemon.start()
+            client = DaemonClient(str(path))
+            alive = await client.ping()
+            client.close()
+            await daemon.close()
+            return alive
+
+        assert asyncio.run(scenario())
+        assert not path.exists()
+
+    def test_merged_repeat_waits_on_daemon_ticket(self, tmp_path):
+        """Test that a repeat merged into a daemon ticket waits for the daemon to play it."""
+        release, local_release = threading.Event(), threading.Event()
+        played = []
+        daemon_server = make_server(played)
+        daemon_server.scheduler.play_func = lambda path: release.wait(5) and played.append(path)
+        completion = tmp_path / "completion.mp3"
+        completion.write_bytes(b"ID3")
+        path = str(tmp_path / "daemon.sock")
+        server = SoundToolServer(SoundToolConfig(daemon=True, daemon_socket=path, use_sink=False))
+
+        async def scenario():
+            daemon = PlaybackDaemon(daemon_server, path)
+            await daemon.start()
+            # A local ticket with the same ID as the daemon's, which never finishes
+            server.scheduler.play_func = lambda path: local_release.wait(5)
+            local = await server.scheduler.submit("custom", "/never/played.mp3")
+            arguments = {"sound_type": "custom", "custom_sound_path": str(completion), "wait": True}
+            first = asyncio.ensure_future(server.mcp.call_tool("play_sound", arguments))
+            await asyncio.sleep(0.1)
+            second = asyncio.ensure_future(server.mcp.call_tool("play_sound", arguments))
+            await asyncio.sleep(0.1)
+            waiting = not second.done()
+            release.set()
+            results = [(await first)[0].text, (await second)[0].text]
+            local_release.set()
+            await server.scheduler.wait(local)
+            server.daemon.close()
+            await daemon.close()
+            return local, waiting, results
+
+        try:
+            local, waiting, results = asyncio.run(scenario())
+        finally:
+            server.close()
+
+        assert waiting and local.id == 1
+        assert results == ["Successfully played custom sound"] * 2
+        assert played == [str(completion)]
+
+    @patch('src.sound_tool.server.FastMCP')
+    def test_server_falls_back_to_in_process(self, mock_fastmcp, tmp_path):
+        """Test that the server plays sounds itself when the daemon is down."""
+        config = SoundToolConfig(daemon=True, daemon_socket=str(tmp_path / "missing.sock"))
+        server = SoundToolServer(config)
+        server.scheduler.play_func = MagicMock()
+
+        async def scenario():
+            ticket = await server.submit("completion", "/sounds/completion.mp3", wait=False)
+            await server.scheduler.wait(ticket)
+            return ticket
+
+        ticket = asyncio.run(scenario())
+        server.close()
+
+        assert ticket.status == DONE
+        server.scheduler.play_func.assert_called_once_with("/sounds/completion.mp3")
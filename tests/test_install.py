@@ -0,0 +1,60 @@
+"""
+Tests for incremental sound installation.
+"""
+import os
+from unittest.mock import patch
+
+from src.sound_tool.install import bundled_sounds, is_current, sound_files, sync_files
+
+
+class TestSyncFiles:
+    """Test cases for sync_files."""
+
+    def make_pack(self, tmp_path):
+        pack = tmp_path / "pack"
+        pack.mkdir()
+        (pack / "completion.mp3").write_bytes(b"a" * 100)
+        (pack / "error.wav").write_bytes(b"b" * 50)
+        (pack / "readme.txt").write_text("not a sound")
+        return pack
+
+    def test_copies_only_changes(self, tmp_path):
+        """Test that a second sync skips unchanged files and copies changed ones."""
+        pack = self.make_pack(tmp_path)
+        target = str(tmp_path / "installed")
+
+        summary = sync_files(sound_files(str(pack)), target)
+        assert (summary.copied, summary.skipped, summary.bytes_copied) == (2, 0, 150)
+        assert sorted(os.listdir(target)) == ["completion.mp3", "error.wav"]
+
+        (pack / "error.wav").write_bytes(b"c" * 60)
+        summary = sync_files(sound_files(str(pack)), target)
+        assert (summary.copied, summary.skipped, summary.bytes_copied) == (1, 1, 60)
+        assert open(os.path.join(target, "error.wav"), "rb").read() == b"c" * 60
+
+    def test_same_content_different_mtime(self, tmp_path):
+        """Test that files with equal content are skipped even if their mtime differs."""
+        source = tmp_path / "a.wav"
+        target = tmp_path / "b.wav"
+        source.write_bytes(b"same")
+        target.write_bytes(b"same")
+        os.utime(target, ns=(0, 0))
+
+        assert is_current(str(source), str(target))
+
+    def test_failed_copy_leaves_no_partial_file(self, tmp_path):
+        """Test that a failed copy is reported and leaves the target untouched."""
+        pack = self.make_pack(tmp_path)
+        target = tmp_path / "installed"
+
+        with patch("shutil.copy2", side_effect=OSError("disk full")):
+            summary = sync_files(sound_files(str(pack)), str(target))
+
+        assert summary.failed == 2
+        assert "disk full" in str(summary)
+        assert os.listdir(target) == []
+
+    def test_bundled_sounds(self):
+        """Test that the bundled sounds are found."""
+        names = [os.path.basename(path) for path in bundled_sounds()]
+        assert names == ["completion.mp3", "error.mp3", "notification.mp3"]
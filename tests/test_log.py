@@ -0,0 +1,73 @@
+"""
+Tests for the non-blocking logging setup.
+"""
+import json
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from src.sound_tool.log import PACKAGE_LOGGER, configure_logging, shutdown_logging
+from src.sound_tool.server import main
+
+
+@pytest.fixture
+def package_logger():
+    """The package logger, with its level restored after the test."""
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    level = logger.level
+    yield logger
+    shutdown_logging()
+    logger.setLevel(level)
+
+
+class TestConfigureLogging:
+    """Test cases for configure_logging."""
+
+    def test_text_format_with_extras(self, tmp_path, package_logger):
+        """Test that queued records reach the log file with extra fields appended."""
+        log_file = tmp_path / "sound.log"
+        configure_logging("INFO", str(log_file))
+
+        logging.getLogger(PACKAGE_LOGGER + ".server").warning(
+            "Playback failed: %s", "boom", extra={"sound": "error.mp3"})
+        package_logger.debug("Not written below INFO")
+        shutdown_logging()
+
+        text = log_file.read_text()
+        assert "WARNING" in text
+        assert "Playback failed: boom sound=error.mp3" in text
+        assert "Not written" not in text
+
+    def test_json_format(self, tmp_path, package_logger):
+        """Test that the JSON format writes one object per record."""
+        log_file = tmp_path / "sound.log"
+        configure_logging("DEBUG", str(log_file), "json")
+
+        package_logger.debug("Queued %s", "success", extra={"ticket": 3})
+        shutdown_logging()
+
+        entry = json.loads(log_file.read_text().splitlines()[0])
+        assert entry["level"] == "DEBUG"
+        assert entry["message"] == "Queued success"
+        assert entry["ticket"] == 3
+
+    def test_unknown_format(self):
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError):
+            configure_logging(log_format="xml")
+
+
+class TestMainLogging:
+    """Test cases for the logging options of main."""
+
+    @patch('src.sound_tool.server.SoundToolServer')
+    def test_log_file_option(self, mock_server, tmp_path, package_logger):
+        """Test that --log-file sends the server's messages to the file, not stdout."""
+        log_file = tmp_path / "server.log"
+
+        main(["--log-file", str(log_file), "--log-level", "info"])
+
+        config = mock_server.call_args[0][0]
+        assert (config.log_file, config.log_level) == (str(log_file), "INFO")
+        assert "Sound Tool MCP server stopped." in log_file.read_text()
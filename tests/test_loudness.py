@@ -0,0 +1,156 @@
+"""
+Tests for loudness analysis and normalization.
+"""
+import math
+import threading
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.sound_tool.config import SoundToolConfig
+from src.sound_tool.loudness import Loudness, apply_gain, gain_for, measure
+from src.sound_tool.pcm import PCMBuffer, PCMFormat
+from src.sound_tool.server import SoundToolServer
+
+MONO = PCMFormat(rate=8000, channels=1)
+
+
+def sine(amplitude, seconds=0.5, silence=0.0, rate=8000):
+    """Samples of a 440 Hz sine followed by silence."""
+    t = np.arange(int(seconds * rate)) / rate
+    tone = amplitude * 32767 * np.sin(2 * math.pi * 440 * t)
+    return np.concatenate([tone, np.zeros(int(silence * rate))]).astype("<i2")
+
+
+def write_wav(path, samples, rate=44100):
+    """Write mono samples as a stereo WAV file in the default PCM format."""
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(np.repeat(samples, 2).tobytes())
+
+
+class TestMeasure:
+    """Test cases for measure."""
+
+    def test_sine_level(self):
+        """Test that a full-scale sine measures about -3 dBFS."""
+        loudness = measure(PCMBuffer(sine(1.0).tobytes(), MONO))
+
+        assert loudness.dbfs == pytest.approx(-3.0, abs=0.1)
+        assert loudness.peak == pytest.approx(1.0, abs=0.01)
+
+    def test_trailing_silence_is_gated(self):
+        """Test that silence after a short cue doesn't make it measure quieter."""
+        short = measure(PCMBuffer(sine(0.5).tobytes(), MONO))
+        padded = measure(PCMBuffer(sine(0.5, silence=2.0).tobytes(), MONO))
+
+        assert padded.dbfs == pytest.approx(short.dbfs, abs=0.1)
+
+    def test_silence(self):
+        """Test that a silent or empty buffer has no loudness."""
+        assert measure(PCMBuffer(bytes(1600), MONO)) is None
+        assert measure(PCMBuffer(b"", MONO)) is None
+
+
+class TestGain:
+    """Test cases for gain_for and apply_gain."""
+
+    def test_loud_clip_is_lowered(self):
+        """Test that a clip above the target is turned down to it."""
+        assert gain_for(Loudness(dbfs=-10.0, peak=1.0), -20.0) == pytest.approx(10 ** (-10 / 20))
+
+    def test_boost_is_limited(self):
+        """Test that quiet clips are raised at most max_gain_db and without clipping."""
+        assert gain_for(Loudness(dbfs=-50.0, peak=0.01), -20.0) == pytest.approx(10 ** (12 / 20))
+        assert gain_for(Loudness(dbfs=-30.0, peak=0.5), -20.0) == pytest.approx(2.0)
+        assert gain_for(None) == 1.0
+
+    def test_apply_gain(self):
+        """Test that apply_gain scales samples and saturates instead of wrapping."""
+        buffer = PCMBuffer(np.array([1000, -1000, 30000], dtype="<i2").tobytes(), MONO)
+
+        result = np.frombuffer(apply_gain(buffer, 2.0).data, dtype="<i2")
+
+        assert result.tolist() == [2000, -2000, 32767]
+        assert apply_gain(buffer, 1.0) is buffer
+
+
+class TestNormalization:
+    """Test cases for normalizing catalog sounds."""
+
+    def test_measured_once_off_the_lookup(self, tmp_path):
+        """Test that lookups don't measure and each file is measured once across rescans."""
+        sounds = tmp_path / "sounds"
+        sounds.mkdir()
+        write_wav(sounds / "completion.wav", sine(0.5, rate=44100))
+        server = SoundToolServer(SoundToolConfig(normalize_loudness=True, use_sink=False,
+                                                 variants_dir=str(tmp_path / "variants")))
+        server.sounds_dir = str(sounds)
+        calls = []
+        server.analyzer = lambda path: calls.append(path) or Loudness(dbfs=-9.0, peak=0.5)
+        # Hold up the sync thread, so anything measured so far was measured inline
+        release = threading.Event()
+        server._sync_executor.submit(release.wait)
+        try:
+            server.resolve_sound("completion")
+            measured_inline = list(calls)
+            release.set()
+            server.wait_for_sync()
+            server.catalog.refresh(force=True)
+            server.sync_catalog()
+            server.wait_for_sync()
+        finally:
+            server.close()
+
+        assert measured_inline == []
+        assert len(calls) == 1
+
+    def test_server_gains_and_listing(self, tmp_path):
+        """Test that the server plays sounds at the target level and lists their loudness."""
+        sounds = tmp_path / "sounds"
+        sounds.mkdir()
+        write_wav(sounds / "completion.wav", sine(1.0, rate=44100))
+        write_wav(sounds / "error.wav", sine(0.05, rate=44100))
+        server = SoundToolServer(SoundToolConfig(normalize_loudness=True, loudness_target=-20.0,
+                                                 use_sink=False,
+                                                 variants_dir=str(tmp_path / "variants")))
+        server.sounds_dir = str(sounds)
+        try:
+            loud = server.resolve_sound("completion")
+            quiet = server.resolve_sound("error")
+            server.wait_for_sync()
+            listing = server.mcp._tool_manager.get_tool("list_available_sounds").fn()
+        finally:
+            server.close()
+
+        assert 20 * math.log10(server.player.gains[loud]) == pytest.approx(-17.0, abs=0.2)
+        assert 20 * math.log10(server.player.gains[quiet]) == pytest.approx(9.0, abs=0.2)
+        assert "completion.wav (-3.0 dBFS, gain -17.0 dB)" in listing
+
+    def test_player_process_plays_normalized_variant(self, tmp_path):
+        """Test that player processes get a WAV with the gain already applied."""
+        sounds = tmp_path / "sounds"
+        sounds.mkdir()
+        write_wav(sounds / "completion.wav", sine(1.0, rate=44100))
+        server = SoundToolServer(SoundToolConfig(normalize_loudness=True, loudness_target=-20.0,
+                                                 use_sink=False,
+                                                 variants_dir=str(tmp_path / "variants")))
+        server.sounds_dir = str(sounds)
+        played = []
+        server.player.play_sound = played.append
+        try:
+            path = server.resolve_sound("completion")
+            server.wait_for_sync()
+            server.player.play(path)
+        finally:
+            server.close()
+
+        assert played and played[0] != path
+        with wave.open(played[0], "rb") as f:
+            samples = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2")
+        assert measure(PCMBuffer(samples.tobytes(), PCMFormat(44100, 2))).dbfs == \
+            pytest.approx(-20.0, abs=0.2)
@@ -0,0 +1,94 @@
+"""
+Tests for playback metrics and the get_playback_stats tool.
+"""
+import asyncio
+import json
+import subprocess
+from unittest.mock import patch
+
+from src.sound_tool.backends import Backend, BackendRegistry
+from src.sound_tool.config import SoundToolConfig
+from src.sound_tool.metrics import Histogram, PlaybackMetrics
+from src.sound_tool.server import SoundPlayer, SoundToolServer
+
+
+class TestHistogram:
+    """Test cases for the Histogram class."""
+
+    def test_quantiles(self):
+        """Test that quantiles are interpolated within their bucket."""
+        histogram = Histogram((0.01, 0.1, 1.0))
+        for _ in range(99):
+            histogram.observe(0.005)
+        histogram.observe(0.5)
+
+        assert histogram.count == 100
+        assert histogram.counts == [99, 0, 1, 0]
+        assert 0 < histogram.quantile(0.5) <= 0.01
+        assert 0.1 < histogram.quantile(0.999) <= 0.5
+        assert histogram.summary()["max_ms"] == 500.0
+
+
+class TestPlaybackMetrics:
+    """Test cases for the PlaybackMetrics class."""
+
+    def test_prometheus_format(self):
+        """Test that histograms, counters and extra values are rendered for Prometheus."""
+        metrics = PlaybackMetrics(buckets=(0.1, 1.0))
+        metrics.observe("playback_seconds", 0.05, backend="sink")
+        metrics.observe("playback_seconds", 0.5, backend="sink")
+        metrics.count("backend_failures", backend="aplay")
+
+        text = metrics.prometheus(gauges={"queue_depth": 3})
+
+        assert "mcp_sound_tool_queue_depth 3" in text
+        assert 'mcp_sound_tool_backend_failures_total{backend="aplay"} 1' in text
+        assert '# TYPE mcp_sound_tool_playback_seconds histogram' in text
+        assert 'mcp_sound_tool_playback_seconds_bucket{backend="sink",le="0.1"} 1' in text
+        assert 'mcp_sound_tool_playback_seconds_bucket{backend="sink",le="+Inf"} 2' in text
+        assert 'mcp_sound_tool_playback_seconds_count{backend="sink"} 2' in text
+
+    @patch('shutil.which', return_value="/usr/bin/player")
+    @patch('platform.system', return_value="Linux")
+    @patch('os.path.exists', return_value=True)
+    def test_backend_failures_and_playback(self, mock_exists, mock_system, mock_which):
+        """Test that failed backends are counted and the one that played is timed."""
+        registry = BackendRegistry([Backend("aplay", ("aplay",), frozenset({"wav"}), 10),
+                                    Backend("ffplay", ("ffplay",), frozenset({"wav"}), 20)])
+        player = SoundPlayer(registry=registry)
+
+        with patch.object(player.supervisor, 'run',
+                          side_effect=[subprocess.CalledProcessError(1, "aplay"), None]):
+            player.play_sound("test.wav")
+
+        assert player.metrics.counter("backend_failures", backend="aplay") == 1
+        assert player.metrics.histogram("playback_seconds", backend="ffplay").count == 1
+
+
+class TestPlaybackStatsTool:
+    """Test cases for the get_playback_stats tool."""
+
+    def test_reports_queue_and_tool_latency(self):
+        """Test that a played sound shows up in the tool call, queue and ticket statistics."""
+        server = SoundToolServer(SoundToolConfig(use_sink=False))
+        server.scheduler.play_func = lambda path: None
+
+        async def scenario():
+            await server.mcp.call_tool("play_sound", {"sound_type": "custom",
+                                                      "custom_sound_path": "test.wav",
+                                                      "wait": True})
+            result = await server.mcp.call_tool("get_playback_stats", {})
+            prometheus = await server.mcp.call_tool("get_playback_stats", {"format": "prometheus"})
+            return json.loads(result[0].text), prometheus[0].text
+
+        try:
+            stats, prometheus = asyncio.run(scenario())
+        finally:
+            server.close()
+
+        assert stats["latency"]["tool_call_seconds{tool=play_sound}"]["count"] == 1
+        assert stats["latency"]["queue_wait_seconds"]["count"] == 1
+        assert stats["counters"]["tickets{status=done}"] == 1
+        assert stats["queue"]["depth"] == 0
+        assert stats["coalescer"]["admitted"] == 1
+        assert "mcp_sound_tool_requests_admitted_total 1" in prometheus
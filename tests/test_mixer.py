@@ -0,0 +1,133 @@
+"""
+Tests for the Mixer class.
+"""
+import asyncio
+import time
+import wave
+
+import pytest
+from unittest.mock import MagicMock
+
+np = pytest.importorskip("numpy")
+
+from src.sound_tool.config import SoundToolConfig
+from src.sound_tool.mixer import Mixer
+from src.sound_tool.pcm import DEFAULT_FORMAT, PCMBuffer, PCMFormat
+from src.sound_tool.server import SoundToolServer
+
+MONO = PCMFormat(rate=8000, channels=1)
+
+
+def make_sink():
+    """Return a fake sink that records written buffers."""
+    sink = MagicMock()
+    sink.format = MONO
+    sink.written = []
+    sink.write.side_effect = lambda buffer, *args: sink.written.append(buffer)
+    return sink
+
+
+def clip(value, frames):
+    """Return a constant mono clip."""
+    return PCMBuffer(np.full(frames, value, dtype="<i2").tobytes(), MONO)
+
+
+class TestMixer:
+    """Test cases for the Mixer class."""
+
+    def test_voices_are_summed_with_gain(self):
+        """Test that overlapping voices are added together with per-voice gain."""
+        mixer = Mixer(make_sink(), block_frames=4)
+        mixer._thread = MagicMock()  # mix manually instead of on the thread
+        mixer._thread.is_alive.return_value = True
+        mixer.add(clip(1000, 6))
+        mixer.add(clip(1000, 2), gain=0.5)
+
+        first = mixer.mix_block()
+        second = mixer.mix_block()
+
+        assert first[:, 0].tolist() == [1500, 1500, 1000, 1000]
+        assert second[:, 0].tolist() == [1000, 1000]
+        assert mixer.mix_block() is None
+
+    def test_limiter_prevents_clipping(self):
+        """Test that loud overlaps are scaled down instead of wrapping around."""
+        mixer = Mixer(make_sink(), block_frames=4)
+        mixer._thread = MagicMock()
+        mixer._thread.is_alive.return_value = True
+        for _ in range(3):
+            mixer.add(clip(30000, 4))
+
+        block = mixer.mix_block()
+
+        assert block.max() == 32767
+        assert mixer.limited_blocks == 1
+
+    def test_max_voices_stops_oldest(self):
+        """Test that adding a voice over the limit stops the oldest one."""
+        mixer = Mixer(make_sink(), max_voices=2)
+        mixer._thread = MagicMock()
+        mixer._thread.is_alive.return_value = True
+        first = mixer.add(clip(1, 10))
+        mixer.add(clip(1, 10))
+        mixer.add(clip(1, 10))
+
+        assert first.done.is_set()
+        assert mixer.active == 2
+        assert mixer.stop_all() == 2
+
+    def test_mixing_thread_feeds_sink(self):
+        """Test that the mixing thread writes every voice to the sink and finishes it."""
+        sink = make_sink()
+        mixer = Mixer(sink, block_frames=256, max_lead=10)
+        try:
+            voice = mixer.add(clip(100, 1000))
+            assert voice.done.wait(5)
+        finally:
+            mixer.close()
+
+        total = sum(buffer.frames for buffer in sink.written)
+        assert total == 1000
+
+
+class TestMixedPlayback:
+    """Test cases for playing sounds through the mixer from the server."""
+
+    @pytest.fixture
+    def server(self, tmp_path):
+        with wave.open(str(tmp_path / "completion.wav"), "wb") as f:
+            f.setnchannels(DEFAULT_FORMAT.channels)
+            f.setsampwidth(DEFAULT_FORMAT.sample_width)
+            f.setframerate(DEFAULT_FORMAT.rate)
+            f.writeframes(bytes(DEFAULT_FORMAT.frame_size * DEFAULT_FORMAT.rate * 2))
+        server = SoundToolServer(SoundToolConfig(mix=True, record_sink="null", coalesce_window=0))
+        server.sounds_dir = str(tmp_path)
+        yield server
+        server.close()
+
+    def call(self, server, *calls):
+        async def scenario():
+            results = []
+            for name, arguments in calls:
+                result = await server.mcp.call_tool(name, arguments)
+                results.append(result[0].text)
+                await asyncio.sleep(0.1)
+            return results
+        return asyncio.run(scenario())
+
+    def test_stop_mixed_voice(self, server):
+        """Test that stop_sound stops a sound that is being mixed."""
+        queued, stopped = self.call(server, ("play_sound", {"wait": False}), ("stop_sound", {}))
+
+        assert queued == "Queued completion sound (ticket 1)"
+        assert stopped == "Stopped completion sound (ticket 1)"
+        assert server.player.mixer.active == 0
+
+    def test_wait_lasts_until_mixed_voice_ends(self, server):
+        """Test that waiting for a mixed sound returns once it has been heard."""
+        started = time.monotonic()
+        played, = self.call(server, ("play_sound", {"wait": True}))
+
+        assert played == "Successfully played completion sound"
+        assert time.monotonic() - started >= 1.8
+
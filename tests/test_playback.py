@@ -0,0 +1,302 @@
+"""
+Tests for the PlaybackScheduler class.
+"""
+import asyncio
+import threading
+import pytest
+
+from src.sound_tool.playback import (
+    PlaybackScheduler, parse_priorities, CANCELLED, DONE, DROPPED, FAILED, PREEMPTED,
+)
+
+
+class TestPlaybackScheduler:
+    """Test cases for the PlaybackScheduler class."""
+
+    def test_submit_returns_before_playback(self):
+        """Test that submit returns while the sound is still playing."""
+        release = threading.Event()
+        played = []
+
+        def slow_play(path):
+            release.wait(5)
+            played.append(path)
+
+        async def scenario():
+            scheduler = PlaybackScheduler(slow_play)
+            ticket = await scheduler.submit("completion", "completion.mp3")
+            assert not ticket.is_finished
+            release.set()
+            await scheduler.wait(ticket)
+            await scheduler.shutdown()
+            return ticket
+
+        ticket = asyncio.run(scenario())
+        assert ticket.status == DONE
+        assert played == ["completion.mp3"]
+
+    def test_drop_oldest_when_full(self):
+        """Test that the oldest queued sound is dropped when the queue is full."""
+        release = threading.Event()
+
+        async def scenario():
+            scheduler = PlaybackScheduler(lambda path: release.wait(5), max_queue=1,
+                                          drop_policy="drop_oldest", priorities={})
+            playing = await scheduler.submit("completion", "a.mp3")
+            await asyncio.sleep(0.05)  # let the worker pick up the first ticket
+            queued = await scheduler.submit("error", "b.mp3")
+            newest = await scheduler.submit("notification", "c.mp3")
+            release.set()
+            await scheduler.join()
+            await scheduler.shutdown()
+            return playing, queued, newest
+
+        playing, queued, newest = asyncio.run(scenario())
+        assert playing.status == DONE
+        assert queued.status == DROPPED
+        assert newest.status == DONE
+
+    def test_drop_newest_when_full(self):
+        """Test that new sounds are rejected when the queue is full."""
+        release = threading.Event()
+
+        async def scenario():
+            scheduler = PlaybackScheduler(lambda path: release.wait(5), max_queue=1,
+                                          drop_policy="drop_newest", priorities={})
+            await scheduler.submit("completion", "a.mp3")
+            await asyncio.sleep(0.05)
+            queued = await scheduler.submit("error", "b.mp3")
+            rejected = await scheduler.submit("notification", "c.mp3")
+            release.set()
+            await scheduler.join()
+            await scheduler.shutdown()
+            return queued, rejected
+
+        queued, rejected = asyncio.run(scenario())
+        assert queued.status == DONE
+        assert rejected.status == DROPPED
+        assert "queue is full" in rejected.error
+
+    def test_failed_playback(self):
+        """Test that exceptions from the player mark the ticket as failed."""
+        def broken_play(path):
+            raise RuntimeError("no audio device")
+
+        async def scenario():
+            scheduler = PlaybackScheduler(broken_play)
+            ticket = await scheduler.submit("error", "error.mp3")
+            await scheduler.wait(ticket)
+            await scheduler.shutdown()
+            return ticket
+
+        ticket = asyncio.run(scenario())
+        assert ticket.status == FAILED
+        assert ticket.error == "no audio device"
+
+    def test_invalid_drop_policy(self):
+        """Test that unknown drop policies are rejected."""
+        with pytest.raises(ValueError):
+            PlaybackScheduler(lambda path: None, drop_policy="shuffle")
+
+    def test_cancel_queued_and_playing(self):
+        """Test cancelling the playing ticket and a queued one."""
+        release = threading.Event()
+        played = []
+
+        def play(path):
+            release.wait(5)
+            played.append(path)
+
+        async def scenario():
+            scheduler = PlaybackScheduler(play, stop_func=release.set, priorities={})
+            playing = await scheduler.submit("completion", "a.mp3")
+            queued = await scheduler.submit("error", "b.mp3")
+            await asyncio.sleep(0.05)
+            assert scheduler.cancel(queued.id) is queued
+            assert scheduler.cancel() is playing
+            await scheduler.join()
+            await scheduler.shutdown()
+            return playing, queued
+
+        playing, queued = asyncio.run(scenario())
+        assert playing.status == CANCELLED
+        assert queued.status == CANCELLED
+        assert played == ["a.mp3"]
+
+    def test_cancelled_tickets_free_queue_space(self):
+        """Test that cancelled queued tickets neither count as queued nor cause drops."""
+        release = threading.Event()
+
+        async def scenario():
+            scheduler = PlaybackScheduler(lambda path: release.wait(5), max_queue=1,
+                                          drop_policy="drop_newest", priorities={})
+            await scheduler.submit("completion", "a.mp3")
+            await asyncio.sleep(0.05)  # let the worker pick up the first ticket
+            cancelled = await scheduler.submit("completion", "b.mp3")
+            scheduler.cancel(cancelled.id)
+            depth = scheduler.depth
+            queued = await scheduler.submit("completion", "c.mp3")
+            release.set()
+            await scheduler.join()
+            await scheduler.shutdown()
+            return depth, queued
+
+        depth, queued = asyncio.run(scenario())
+        assert depth == 0
+        assert queued.status == DONE
+
+    def test_higher_priority_plays_first(self):
+        """Test that queued sounds are played in priority order."""
+        release = threading.Event()
+        played = []
+
+        def play(path):
+            release.wait(5)
+            played.append(path)
+
+        async def scenario():
+            scheduler = PlaybackScheduler(play, preempt=False)
+            await scheduler.submit("custom", "first.mp3")
+            await asyncio.sleep(0.05)
+            await scheduler.submit("completion", "completion.mp3")
+            await scheduler.submit("notification", "notification.mp3")
+            await scheduler.submit("error", "error.mp3")
+            release.set()
+            await scheduler.join()
+            await scheduler.shutdown()
+
+        asyncio.run(scenario())
+        assert played == ["first.mp3", "error.mp3", "notification.mp3", "completion.mp3"]
+
+    def test_preemption(self):
+        """Test that an error preempts a playing completion sound."""
+        release = threading.Event()
+
+        def play(path):
+            if path == "completion.mp3":
+                release.wait(5)
+
+        async def scenario():
+            scheduler = PlaybackScheduler(play, stop_func=release.set)
+            completion = await scheduler.submit("completion", "completion.mp3")
+            await asyncio.sleep(0.05)
+            error = await scheduler.submit("error", "error.mp3")
+            await scheduler.wait(error)
+            await scheduler.shutdown()
+            return completion, error
+
+        completion, error = asyncio.run(scenario())
+        assert completion.status == PREEMPTED
+        assert error.status == DONE
+
+    def test_handed_off_sounds(self):
+        """Test that mixed sounds overlap but stay playing until done, and stop one by one."""
+        class Handle:
+            def __init__(self):
+                self.done = threading.Event()
+
+            def stop(self):
+                self.done.set()
+
+        handles = {}
+
+        def play(path):
+            handles[path] = Handle()
+            return handles[path]
+
+        async def scenario():
+            scheduler = PlaybackScheduler(play)
+            first = await scheduler.submit("custom", "first.wav")
+            second = await scheduler.submit("custom", "second.wav")
+            await asyncio.sleep(0.05)
+            assert [t.id for t in scheduler.playing] == [first.id, second.id]
+            assert scheduler.cancel(first.id) is first
+            error = await scheduler.submit("error", "error.wav")
+            await asyncio.sleep(0.05)
+            handles["error.wav"].done.set()
+            await scheduler.join()
+            await scheduler.shutdown()
+            return first, second, error
+
+        first, second, error = asyncio.run(scenario())
+        assert first.status == CANCELLED
+        assert second.status == PREEMPTED
+        assert error.status == DONE
+        assert all(handle.done.is_set() for handle in handles.values())
+
+    def test_full_queue_keeps_important_sounds(self):
+        """Test that a full queue drops the lowest-priority sound, not an error."""
+        release = threading.Event()
+
+        async def scenario():
+            scheduler = PlaybackScheduler(lambda path: release.wait(5), max_queue=1,
+                                          drop_policy="drop_newest", preempt=False)
+            await scheduler.submit("custom", "a.mp3")
+            await asyncio.sleep(0.05)
+            completion = await scheduler.submit("completion", "b.mp3")
+            error = await scheduler.submit("error", "c.mp3")
+            custom = await scheduler.submit("custom", "d.mp3")
+            release.set()
+            await scheduler.join()
+            await scheduler.shutdown()
+            return completion, error, custom
+
+        completion, error, custom = asyncio.run(scenario())
+        assert completion.status == DROPPED
+        assert error.status == DONE
+        assert custom.status == DROPPED
+
+    def test_stale_low_priority_dropped(self):
+        """Test that low-priority sounds waiting too long are dropped."""
+        release = threading.Event()
+        now = [0.0]
+
+        async def scenario():
+            scheduler = PlaybackScheduler(lambda path: release.wait(5), preempt=False,
+                                          stale_after=2, clock=lambda: now[0])
+            await scheduler.submit("completion", "a.mp3")
+            await asyncio.sleep(0.05)
+            stale = await scheduler.submit("completion", "b.mp3")
+            error = await scheduler.submit("error", "c.mp3")
+            now[0] = 10.0
+            release.set()
+            await scheduler.join()
+            await scheduler.shutdown()
+            return stale, error
+
+        stale, error = asyncio.run(scenario())
+        assert stale.status == DROPPED
+        assert "stale" in stale.error
+        assert error.status == DONE
+
+    def test_clients_take_turns(self):
+        """Test that equal-priority sounds from different clients interleave."""
+        release = threading.Event()
+        played = []
+
+        def play(path):
+            release.wait(5)
+            played.append(path)
+
+        async def scenario():
+            scheduler = PlaybackScheduler(play, priorities={})
+            await scheduler.submit("custom", "first.mp3", client="a")
+            await asyncio.sleep(0.05)  # let the worker pick up the first ticket
+            for name in ("a1", "a2", "a3"):
+                await scheduler.submit("custom", f"{name}.mp3", client="a")
+            await scheduler.submit("custom", "b1.mp3", client="b")
+            release.set()
+            await scheduler.join()
+            await scheduler.shutdown()
+
+        asyncio.run(scenario())
+        assert played == ["first.mp3", "a1.mp3", "b1.mp3", "a2.mp3", "a3.mp3"]
+
+    def test_parse_priorities(self):
+        """Test parsing priority overrides from configuration."""
+        assert parse_priorities("error=0, completion=5,") == {"error": 0, "completion": 5}
+
+    def test_parse_priorities_skips_invalid_entries(self, caplog):
+        """Test that a typo in the priorities skips that entry instead of failing."""
+        assert parse_priorities("error=0,completion=high,=3,custom") == {"error": 0}
+        assert "Ignoring invalid sound priority 'completion=high'" in caplog.text
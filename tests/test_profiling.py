@@ -0,0 +1,118 @@
+"""
+Tests for per-call profiling and tracing.
+"""
+import asyncio
+import json
+import time
+
+from src.sound_tool.config import SoundToolConfig
+from src.sound_tool.metrics import PlaybackMetrics
+from src.sound_tool.profiling import Tracer
+from src.sound_tool.transcode import VariantCache
+from src.sound_tool.server import SoundToolServer, parse_args
+
+
+def busy(seconds):
+    """Spin for a while so the call shows up in the profile."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestTracer:
+    """Test cases for the Tracer class."""
+
+    def test_keeps_profiles_of_slowest_calls(self, tmp_path):
+        """Test that only the slowest calls' profiles are kept and reported."""
+        tracer = Tracer(str(tmp_path), slowest=2)
+        tool = tracer.wrap("play", busy)
+        for seconds in (0.001, 0.02, 0.002, 0.01):
+            tool(seconds=seconds)
+
+        calls = tracer.slowest_calls()
+        report = tracer.dump(limit=5)
+
+        assert [name for name, _ in calls] == ["play", "play"]
+        assert calls[0][1] >= 0.02 and calls[1][1] >= 0.01
+        assert "busy (test_profiling.py:" in report
+        assert "Trace written to" in report
+
+    def test_async_calls_and_skipped_arguments(self, tmp_path):
+        """Test that async tools are traced with their arguments, minus skipped ones."""
+        tracer = Tracer(str(tmp_path), slowest=0)
+
+        async def play_sound(sound_type, ctx=None):
+            return sound_type
+
+        tool = tracer.wrap("play_sound", play_sound, skip=("ctx",))
+
+        assert asyncio.run(tool(sound_type="error", ctx=object())) == "error"
+        event = tracer.trace()["traceEvents"][-1]
+        assert event["name"] == "play_sound" and event["ph"] == "X" and event["cat"] == "tool"
+        assert event["args"] == {"sound_type": "error"}
+        assert tracer.slowest_calls() == []
+
+    def test_metrics_become_trace_events(self, tmp_path):
+        """Test that metrics write spans and instant events to a Chrome trace file."""
+        metrics = PlaybackMetrics()
+        metrics.tracer = Tracer(str(tmp_path))
+        with metrics.timer("lookup_seconds"):
+            pass
+        metrics.count("backend_failures", backend="aplay")
+
+        path = metrics.tracer.write_trace()
+
+        with open(path) as f:
+            events = json.load(f)["traceEvents"]
+        phases = {event["name"]: event["ph"] for event in events}
+        assert phases == {"thread_name": "M", "lookup_seconds": "X", "backend_failures": "i"}
+
+    def test_default_trace_dir(self, tmp_path, monkeypatch):
+        """Test that traces go next to the WAV variants in the user's cache directory."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert Tracer().trace_dir == str(tmp_path / "mcp-sound-tool" / "traces")
+        assert VariantCache().directory == str(tmp_path / "mcp-sound-tool" / "variants")
+
+
+class TestProfilingOption:
+    """Test cases for the profile setting."""
+
+    def test_off_by_default(self):
+        """Test that tools are neither wrapped nor dump_profile registered by default."""
+        server = SoundToolServer(SoundToolConfig(use_sink=False))
+        try:
+            names = {tool.name for tool in server.mcp._tool_manager.list_tools()}
+        finally:
+            server.close()
+
+        assert server.tracer is None and server.metrics.tracer is None
+        assert "dump_profile" not in names
+
+    def test_dump_profile_tool(self, tmp_path):
+        """Test that tool calls are traced and dump_profile reports them."""
+        server = SoundToolServer(SoundToolConfig(use_sink=False, profile=True,
+                                                 profile_dir=str(tmp_path)))
+
+        async def scenario():
+            await server.mcp.call_tool("list_available_sounds", {})
+            result = await server.mcp.call_tool("dump_profile", {"limit": 5})
+            return result[0].text
+
+        try:
+            report = asyncio.run(scenario())
+        finally:
+            server.close()
+
+        assert "list_available_sounds" in report
+        trace_file = report.splitlines()[-1].split(" to ", 1)[1]
+        with open(trace_file) as f:
+            names = {event["name"] for event in json.load(f)["traceEvents"]}
+        assert {"list_available_sounds", "dump_profile"} <= names
+
+    def test_command_line(self):
+        """Test that --profile and --profile-dir map onto the config."""
+        args = parse_args(["--profile", "--profile-dir", "/tmp/traces"])
+
+        assert args.profile is True
+        assert args.profile_dir == "/tmp/traces"
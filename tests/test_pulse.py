@@ -0,0 +1,230 @@
+"""
+Tests for the PulseAudio sample cache, using a stand-in pactl.
+"""
+import os
+import stat
+import sys
+import threading
+import time
+import wave
+from unittest.mock import patch
+
+import pytest
+
+from src.sound_tool.catalog import SoundCatalog
+from src.sound_tool.config import SoundToolConfig
+from src.sound_tool.pulse import PulseSampleCache
+from src.sound_tool.server import SoundToolServer
+
+# Keeps uploaded sample names as files in $FAKE_PACTL_DIR and logs every call
+FAKE_PACTL = """#!{python}
+import os, sys
+state = os.environ["FAKE_PACTL_DIR"]
+with open(os.path.join(state, "calls.log"), "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+command, args = sys.argv[1], sys.argv[2:]
+if command == "upload-sample":
+    open(os.path.join(state, args[1]), "w").close()
+elif command == "remove-sample":
+    os.remove(os.path.join(state, args[0]))
+elif command == "play-sample" and not os.path.exists(os.path.join(state, args[0])):
+    sys.exit(1)
+"""
+
+
+@pytest.fixture
+def pactl(tmp_path, monkeypatch):
+    """Path of a stand-in pactl and a function returning the calls made to it."""
+    state = tmp_path / "pulse"
+    state.mkdir()
+    script = tmp_path / "pactl"
+    script.write_text(FAKE_PACTL.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("FAKE_PACTL_DIR", str(state))
+
+    def calls():
+        log = state / "calls.log"
+        return log.read_text().splitlines() if log.exists() else []
+    return str(script), state, calls
+
+
+def write_wav(path, seconds):
+    """Write a silent 8 kHz mono WAV file lasting the given number of seconds."""
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(8000)
+        f.writeframes(bytes(2 * int(seconds * 8000)))
+
+
+@pytest.fixture
+def sounds_dir(tmp_path):
+    directory = tmp_path / "sounds"
+    directory.mkdir()
+    write_wav(directory / "completion.wav", 0.01)
+    write_wav(directory / "error.wav", 0.02)
+    return directory
+
+
+class TestPulseSampleCache:
+    """Test cases for the PulseSampleCache class."""
+
+    def test_upload_once_and_play(self, pactl, sounds_dir):
+        """Test that sounds are uploaded once and then played by sample name."""
+        script, state, calls = pactl
+        catalog = SoundCatalog(str(sounds_dir))
+        samples = PulseSampleCache(script)
+
+        assert samples.sync(catalog.entries(), generation=1) == 2
+        assert samples.sync(catalog.entries(), generation=1) == 0
+        assert samples.play(str(sounds_dir / "error.wav"))
+        assert not samples.play(str(sounds_dir / "unknown.wav"))
+
+        log = calls()
+        assert [line.split()[0] for line in log].count("upload-sample") == 2
+        assert log[-1].startswith("play-sample mcp-sound-tool-")
+
+    def test_reupload_changed_catalog(self, pactl, sounds_dir):
+        """Test that changed files are uploaded again and removed ones are unloaded."""
+        script, state, calls = pactl
+        catalog = SoundCatalog(str(sounds_dir))
+        samples = PulseSampleCache(script)
+        samples.sync(catalog.entries(), generation=1)
+        old = set(samples.samples)
+
+        write_wav(sounds_dir / "error.wav", 0.03)
+        os.remove(sounds_dir / "completion.wav")
+        catalog.refresh(force=True)
+        uploaded = samples.sync(catalog.entries(), generation=2)
+
+        assert uploaded == 1
+        assert len(samples.samples) == 1
+        assert not set(samples.samples) & old
+        assert sorted(os.listdir(state)) == sorted(["calls.log"] + samples.samples)
+
+    def test_upload_from_other_source(self, pactl, sounds_dir, tmp_path):
+        """Test that a sound is uploaded from the file given in its place, under its own name."""
+        script, state, calls = pactl
+        catalog = SoundCatalog(str(sounds_dir))
+        samples = PulseSampleCache(script)
+        samples.sync(catalog.entries(), generation=1)
+        plain = set(samples.samples)
+        normalized = tmp_path / "normalized.wav"
+        normalized.write_bytes(b"RIFF quieter error")
+
+        samples.sync(catalog.entries(), generation=2,
+                     sources={str(sounds_dir / "error.wav"): str(normalized)})
+
+        uploads = [line for line in calls() if line.startswith("upload-sample")]
+        assert uploads[-1].startswith(f"upload-sample {normalized} ")
+        assert len(set(samples.samples) - plain) == 1
+        assert samples.play(str(sounds_dir / "error.wav"))
+
+    def test_play_waits_for_the_sound(self, pactl, sounds_dir):
+        """Test that playing a sample lasts as long as the sound, unless stopped."""
+        script, state, calls = pactl
+        write_wav(sounds_dir / "notification.wav", 0.5)
+        (sounds_dir / "broken.wav").write_bytes(b"RIFF broken")
+        catalog = SoundCatalog(str(sounds_dir))
+        samples = PulseSampleCache(script)
+        samples.sync(catalog.entries(), generation=1)
+        path = str(sounds_dir / "notification.wav")
+
+        started = time.monotonic()
+        assert samples.play(path)
+        played = time.monotonic() - started
+        stop = threading.Event()
+        threading.Timer(0.05, stop.set).start()
+        started = time.monotonic()
+        assert samples.play(path, stop)
+        stopped = time.monotonic() - started
+
+        assert played >= 0.5 and stopped < 0.4
+        assert not samples.play(path, max_duration=0.1)
+        assert not samples.play(str(sounds_dir / "broken.wav"))
+        assert len(samples.samples) == 3
+
+    def test_server_lost_samples(self, pactl, sounds_dir):
+        """Test that a failed play-sample makes the next sync upload everything again."""
+        script, state, calls = pactl
+        catalog = SoundCatalog(str(sounds_dir))
+        samples = PulseSampleCache(script)
+        samples.sync(catalog.entries(), generation=1)
+        for name in samples.samples:
+            os.remove(state / name)
+
+        assert not samples.play(str(sounds_dir / "error.wav"))
+        assert samples.sync(catalog.entries(), generation=1) == 2
+        assert samples.play(str(sounds_dir / "error.wav"))
+
+    def test_unavailable(self, tmp_path):
+        """Test that nothing is uploaded when pactl is not installed."""
+        samples = PulseSampleCache(str(tmp_path / "missing-pactl"))
+
+        assert not samples.available
+        assert samples.sync([], generation=1) == 0
+        assert samples.generation == 1
+
+
+class TestServerSamples:
+    """Test cases for playing catalog sounds from the sample cache."""
+
+    @patch('platform.system', return_value="Linux")
+    def test_upload_does_not_block_lookup(self, mock_system, pactl, sounds_dir):
+        """Test that lookups return while samples upload and play falls back meanwhile."""
+        script, state, calls = pactl
+        server = SoundToolServer(SoundToolConfig(pulse_samples=True, use_sink=False))
+        server.player.samples.pactl = script
+        server.sounds_dir = str(sounds_dir)
+        release = threading.Event()
+        sync = server.player.samples.sync
+        server.player.samples.sync = lambda *args: release.wait(5) and sync(*args)
+        try:
+            path = server.resolve_sound("completion")
+            with patch.object(server.player, 'play_sound') as mock_play_sound:
+                server.player.play(path)
+            release.set()
+            server.wait_for_sync()
+        finally:
+            server.close()
+
+        mock_play_sound.assert_called_once_with(path)
+        assert [line.split()[0] for line in calls()].count("upload-sample") == 2
+
+    @patch('platform.system', return_value="Linux")
+    def test_play_sound_uses_sample(self, mock_system, pactl, sounds_dir):
+        """Test that the server uploads the catalog on first use and plays samples."""
+        script, state, calls = pactl
+        server = SoundToolServer(SoundToolConfig(pulse_samples=True, use_sink=False))
+        server.player.samples.pactl = script
+        server.sounds_dir = str(sounds_dir)
+        try:
+            path = server.resolve_sound("completion")
+            server.wait_for_sync()
+            with patch.object(server.player, 'play_sound') as mock_play_sound:
+                server.player.play(path)
+            server.resolve_sound("error")
+        finally:
+            server.close()
+
+        mock_play_sound.assert_not_called()
+        log = [line.split()[0] for line in calls()]
+        assert log.count("upload-sample") == 2
+        assert log.count("play-sample") == 1
+        assert log.count("remove-sample") == 2
+        assert server.metrics.histogram("playback_seconds", backend="pulse_sample").count == 1
+
+    @patch('platform.system', return_value="Linux")
+    def test_unavailable_server_syncs_once(self, mock_system, tmp_path, sounds_dir):
+        """Test that lookups don't keep scheduling syncs when there is no sound server."""
+        server = SoundToolServer(SoundToolConfig(pulse_samples=True, use_sink=False))
+        server.player.samples.pactl = str(tmp_path / "missing-pactl")
+        server.sounds_dir = str(sounds_dir)
+        try:
+            server.resolve_sound("completion")
+            server.wait_for_sync()
+            pending = [server.sync_catalog() for _ in range(5)]
+        finally:
+            server.close()
+
+        assert pending == [None] * 5
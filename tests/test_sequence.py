@@ -0,0 +1,116 @@
+"""
+Tests for sequence rendering.
+"""
+import os
+import threading
+import wave
+from unittest.mock import patch
+
+from src.sound_tool.cache import SampleCache
+from src.sound_tool.pcm import PCMBuffer, PCMFormat
+from src.sound_tool.sequence import SequenceRenderer, concatenate, write_wav
+
+MONO = PCMFormat(rate=1000, channels=1)
+
+
+class TestConcatenate:
+    """Test cases for concatenate."""
+
+    def test_gaps_and_repeat(self):
+        """Test that buffers are joined with silence and repeated."""
+        a = PCMBuffer(b"\x01\x00" * 2, MONO)
+        b = PCMBuffer(b"\x02\x00", MONO)
+
+        result = concatenate([a, b], gap=0.001, repeat=2, fmt=MONO)
+
+        # a, gap, b, gap, a, gap, b -> 2 + 1 + 1 + 1 + 2 + 1 + 1 frames
+        assert result.frames == 9
+        assert result.data[:6] == b"\x01\x00\x01\x00\x00\x00"
+
+
+class TestSequenceRenderer:
+    """Test cases for the SequenceRenderer class."""
+
+    def make_sounds(self, tmp_path):
+        paths = []
+        for value, name in ((1, "completion.wav"), (2, "error.wav")):
+            path = tmp_path / name
+            write_wav(str(path), PCMBuffer(bytes([value, 0]) * 10, MONO))
+            paths.append(str(path))
+        return paths
+
+    def test_render_single_wav(self, tmp_path):
+        """Test that a sequence is rendered into one playable WAV file."""
+        paths = self.make_sounds(tmp_path)
+        renderer = SequenceRenderer(SampleCache(), MONO, directory=str(tmp_path))
+
+        rendered = renderer.render(paths + paths[:1], gap=0.01, repeat=1)
+
+        with wave.open(rendered, "rb") as wav:
+            assert wav.getframerate() == 1000
+            # three 10-frame clips and two 10-frame gaps
+            assert wav.getnframes() == 50
+
+    def test_render_is_memoized(self, tmp_path):
+        """Test that rendering the same sequence twice reuses the file."""
+        paths = self.make_sounds(tmp_path)
+        renderer = SequenceRenderer(SampleCache(), MONO, directory=str(tmp_path))
+
+        first = renderer.render(paths, gap=0.1, repeat=2)
+        with patch('src.sound_tool.sequence.write_wav', side_effect=write_wav) as mock_write:
+            second = renderer.render(paths, gap=0.1, repeat=2)
+            other = renderer.render(paths, gap=0.1, repeat=3)
+
+        assert first == second
+        assert other != first
+        mock_write.assert_called_once()
+
+    def test_close_removes_temporary_directory(self, tmp_path):
+        """Test that rendered files are cleaned up on close."""
+        paths = self.make_sounds(tmp_path)
+        renderer = SequenceRenderer(SampleCache(), MONO)
+        directory = renderer.directory
+
+        renderer.render(paths)
+        renderer.close()
+
+        assert not os.path.exists(directory)
+
+    def test_concurrent_identical_renders(self, tmp_path):
+        """Test that the same sequence rendered from two threads at once succeeds in both."""
+        self.make_sounds(tmp_path)
+        renderer = SequenceRenderer(SampleCache(), MONO, directory=str(tmp_path))
+        barrier = threading.Barrier(2)
+        results, errors = [], []
+
+        def render():
+            barrier.wait()
+            try:
+                results.append(renderer.render_with("same", lambda: PCMBuffer(b"\x01\x00" * 5000, MONO)))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=render) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(set(results)) == 1 and os.path.exists(results[0])
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+
+    def test_files_in_use_are_not_evicted(self, tmp_path):
+        """Test that eviction skips rendered files that are still queued for playback."""
+        pinned = set()
+        renderer = SequenceRenderer(SampleCache(), MONO, directory=str(tmp_path), max_files=1,
+                                    in_use=pinned.__contains__)
+        first = renderer.render_with("first", lambda: PCMBuffer(b"\x01\x00", MONO))
+        pinned.add(first)
+
+        second = renderer.render_with("second", lambda: PCMBuffer(b"\x02\x00", MONO))
+        assert os.path.exists(first) and os.path.exists(second)
+
+        pinned.clear()
+        renderer.render_with("third", lambda: PCMBuffer(b"\x03\x00", MONO))
+        assert not os.path.exists(first) and not os.path.exists(second)
@@ -0,0 +1,107 @@
+"""
+Tests for PCM decoding and the persistent PCMSink.
+"""
+import threading
+import time
+import wave
+import pytest
+from unittest.mock import patch
+
+from src.sound_tool.pcm import PCMBuffer, PCMFormat, DecodeError, decode_file
+from src.sound_tool.sink import PCMSink, SinkError
+from src.sound_tool.supervisor import PlaybackCancelled
+
+MONO = PCMFormat(rate=8000, channels=1)
+
+
+def write_wav(path, fmt=PCMFormat(), frames=100):
+    """Write a silent WAV file in the given format."""
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(fmt.channels)
+        wav.setsampwidth(fmt.sample_width)
+        wav.setframerate(fmt.rate)
+        wav.writeframes(b"\x00" * fmt.frame_size * frames)
+
+
+class TestDecodeFile:
+    """Test cases for decode_file."""
+
+    def test_decode_matching_wav(self, tmp_path):
+        """Test that WAV files in the target format are read directly."""
+        path = tmp_path / "beep.wav"
+        write_wav(path, frames=441)
+
+        buffer = decode_file(str(path))
+
+        assert buffer.frames == 441
+        assert buffer.duration == pytest.approx(0.01)
+
+    @patch('shutil.which', return_value=None)
+    def test_no_decoder_available(self, mock_which, tmp_path):
+        """Test that a DecodeError is raised when no decoder is installed."""
+        path = tmp_path / "beep.mp3"
+        path.write_bytes(b"ID3")
+
+        with pytest.raises(DecodeError):
+            decode_file(str(path))
+
+
+class TestPCMSink:
+    """Test cases for the PCMSink class."""
+
+    def test_write_keeps_process_open(self):
+        """Test that consecutive writes reuse a single player process."""
+        sink = PCMSink(["cat"])
+        try:
+            sink.write(PCMBuffer(b"\x00" * 1024))
+            first = sink._process
+            sink.write(PCMBuffer(b"\x00" * 1024))
+            assert sink._process is first
+        finally:
+            sink.close()
+
+    def test_write_is_paced_to_real_time(self):
+        """Test that a write returns only when little of the sound is left to play."""
+        sink = PCMSink(["cat"], MONO, max_lead=0.1)
+        started = time.monotonic()
+        try:
+            sink.write(PCMBuffer(b"\x00" * MONO.frame_size * 4000, MONO))
+        finally:
+            sink.close()
+
+        assert time.monotonic() - started >= 0.35
+
+    def test_stop_interrupts_write(self):
+        """Test that setting the stop event ends a long write promptly."""
+        sink = PCMSink(["cat"], MONO)
+        stop = threading.Event()
+        threading.Timer(0.1, stop.set).start()
+        started = time.monotonic()
+        try:
+            with pytest.raises(PlaybackCancelled):
+                sink.write(PCMBuffer(b"\x00" * MONO.frame_size * 80000, MONO), stop)
+        finally:
+            sink.close()
+
+        assert time.monotonic() - started < 1.0
+        assert sink._process is None
+
+    def test_write_failure_after_restart(self):
+        """Test that a player that keeps exiting raises SinkError."""
+        sink = PCMSink(["true"], max_failures=1)
+
+        with pytest.raises(SinkError):
+            sink.write(PCMBuffer(b"\x00" * (1 << 20)))
+        assert not sink.available
+
+    def test_format_mismatch(self):
+        """Test that buffers in a different format are rejected."""
+        sink = PCMSink(["cat"])
+
+        with pytest.raises(SinkError):
+            sink.write(PCMBuffer(b"\x00" * 4, PCMFormat(rate=22050)))
+
+    @patch('shutil.which', return_value=None)
+    def test_detect_without_players(self, mock_which):
+        """Test that detect returns None when no raw PCM player is installed."""
+        assert PCMSink.detect() is None
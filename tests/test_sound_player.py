@@ -9,23 +9,24 @@ from unittest.mock import patch, MagicMock
 
 # Import the SoundPlayer class
 from src.sound_tool.server import SoundPlayer
+from src.sound_tool.sink import SinkError
+from src.sound_tool.supervisor import PlaybackTimeout
 
 
 class TestSoundPlayer:
     """Test cases for the SoundPlayer class."""
 
-    def test_play_sound_file_not_found(self, capfd):
+    def test_play_sound_file_not_found(self, caplog):
         """Test behavior when sound file is not found."""
         # Call with non-existent file
-        SoundPlayer.play_sound("nonexistent_file.mp3")
+        SoundPlayer().play_sound("nonexistent_file.mp3")
         
-        # Capture output and check error message
-        out, _ = capfd.readouterr()
-        assert "Error: Sound file not found" in out
+        # Check the error was logged
+        assert "Sound file not found" in caplog.text
 
     @patch('os.path.exists')
     @patch('platform.system')
-    @patch('subprocess.run')
+    @patch('src.sound_tool.supervisor.PlaybackSupervisor.run')
     def test_play_sound_macos(self, mock_run, mock_system, mock_exists):
         """Test playing sound on macOS."""
         # Mock platform as macOS
@@ -33,10 +34,10 @@ class TestSoundPlayer:
         mock_exists.return_value = True
         
         # Call play_sound
-        SoundPlayer.play_sound("test.mp3")
+        SoundPlayer().play_sound("test.mp3")
         
         # Verify afplay was called with correct arguments
-        mock_run.assert_called_once_with(["afplay", "test.mp3"], check=True)
+        mock_run.assert_called_once_with(["afplay", "test.mp3"], timeout=30.0)
 
     @patch('os.path.exists')
     @patch('platform.system')
@@ -52,53 +53,74 @@ class TestSoundPlayer:
             winsound_mock = sys.modules['winsound']
             
             # Call play_sound
-            SoundPlayer.play_sound("test.mp3")
+            SoundPlayer().play_sound("test.mp3")
             
             # Verify PlaySound was called with correct arguments
             winsound_mock.PlaySound.assert_called_once_with("test.mp3", winsound_mock.SND_FILENAME)
 
+    @patch('shutil.which')
     @patch('os.path.exists')
     @patch('platform.system')
-    @patch('subprocess.run')
-    def test_play_sound_linux_first_player(self, mock_run, mock_system, mock_exists):
+    @patch('src.sound_tool.supervisor.PlaybackSupervisor.run')
+    def test_play_sound_linux_first_player(self, mock_run, mock_system, mock_exists, mock_which):
         """Test playing sound on Linux with first player available."""
-        # Mock platform as Linux
+        # Mock platform as Linux with every player installed
         mock_system.return_value = "Linux"
         mock_exists.return_value = True
+        mock_which.side_effect = lambda name: f"/usr/bin/{name}"
         
-        # Make first player (paplay) succeed
+        # Make first capable player succeed
         mock_run.side_effect = [None, subprocess.SubprocessError]
         
         # Call play_sound
-        SoundPlayer.play_sound("test.mp3")
+        SoundPlayer().play_sound("test.wav")
         
         # Verify paplay was called
-        mock_run.assert_called_once_with(["paplay", "test.mp3"], check=True)
+        mock_run.assert_called_once_with(["paplay", "test.wav"], timeout=30.0)
 
+    @patch('shutil.which')
     @patch('os.path.exists')
     @patch('platform.system')
-    @patch('subprocess.run')
-    def test_play_sound_linux_fallback(self, mock_run, mock_system, mock_exists):
+    @patch('src.sound_tool.supervisor.PlaybackSupervisor.run')
+    def test_play_sound_linux_fallback(self, mock_run, mock_system, mock_exists, mock_which):
         """Test playing sound on Linux with fallback to second player."""
-        # Mock platform as Linux
+        # Mock platform as Linux with every player installed
         mock_system.return_value = "Linux"
         mock_exists.return_value = True
+        mock_which.side_effect = lambda name: f"/usr/bin/{name}"
         
         # Make first player fail, second succeed
         mock_run.side_effect = [subprocess.SubprocessError, None]
         
         # Call play_sound
-        SoundPlayer.play_sound("test.mp3")
+        SoundPlayer().play_sound("test.wav")
         
         # Verify both players were tried in order
         assert mock_run.call_count == 2
-        mock_run.assert_any_call(["paplay", "test.mp3"], check=True)
-        mock_run.assert_any_call(["aplay", "test.mp3"], check=True)
+        mock_run.assert_any_call(["paplay", "test.wav"], timeout=30.0)
+        mock_run.assert_any_call(["aplay", "-q", "test.wav"], timeout=30.0)
 
+    @patch('shutil.which')
     @patch('os.path.exists')
     @patch('platform.system')
-    @patch('subprocess.run')
-    def test_play_sound_error(self, mock_run, mock_system, mock_exists, capfd):
+    @patch('src.sound_tool.supervisor.PlaybackSupervisor.run')
+    def test_play_sound_linux_skips_incapable_players(self, mock_run, mock_system, mock_exists, mock_which):
+        """Test that MP3 files skip players that can't decode them or aren't installed."""
+        # Only paplay, aplay and mpg321 are installed
+        mock_system.return_value = "Linux"
+        mock_exists.return_value = True
+        mock_which.side_effect = lambda name: f"/usr/bin/{name}" if name in ("paplay", "aplay", "mpg321") else None
+        
+        # Call play_sound
+        SoundPlayer().play_sound("test.mp3")
+        
+        # Verify only the MP3-capable installed player was spawned
+        mock_run.assert_called_once_with(["mpg321", "-q", "test.mp3"], timeout=30.0)
+
+    @patch('os.path.exists')
+    @patch('platform.system')
+    @patch('src.sound_tool.supervisor.PlaybackSupervisor.run')
+    def test_play_sound_error(self, mock_run, mock_system, mock_exists, caplog):
         """Test error handling when playing sound."""
         # Mock platform as macOS
         mock_system.return_value = "Darwin"
@@ -108,8 +130,64 @@ class TestSoundPlayer:
         mock_run.side_effect = Exception("Test error")
         
         # Call play_sound
-        SoundPlayer.play_sound("test.mp3")
+        SoundPlayer().play_sound("test.mp3")
+        
+        # Verify error message was logged
+        assert "Error playing sound: Test error" in caplog.text
+
+    @patch('os.path.exists')
+    @patch('platform.system')
+    @patch('src.sound_tool.supervisor.PlaybackSupervisor.run')
+    def test_play_sound_timeout_propagates(self, mock_run, mock_system, mock_exists):
+        """Test that timeouts are raised instead of trying the next player."""
+        mock_system.return_value = "Darwin"
+        mock_exists.return_value = True
+        mock_run.side_effect = PlaybackTimeout("afplay exceeded the maximum duration of 5s")
+        
+        with pytest.raises(PlaybackTimeout):
+            SoundPlayer(max_duration=5).play_sound("test.mp3")
         
-        # Verify error message was printed
-        out, _ = capfd.readouterr()
-        assert "Error playing sound: Test error" in out 
\ No newline at end of file
+        mock_run.assert_called_once_with(["afplay", "test.mp3"], timeout=5)
+
+    @patch('os.path.exists')
+    @patch('src.sound_tool.cache.SampleCache.load')
+    def test_play_through_sink(self, mock_load, mock_exists):
+        """Test that decoded audio is written to the sink when one is available."""
+        mock_exists.return_value = True
+        sink = MagicMock()
+        player = SoundPlayer(sink)
+
+        with patch.object(SoundPlayer, 'play_sound') as mock_play_sound:
+            player.play("test.mp3")
+
+        sink.write.assert_called_once_with(mock_load.return_value.trimmed.return_value, player._stop)
+        mock_load.return_value.trimmed.assert_called_once_with(30.0)
+        mock_play_sound.assert_not_called()
+
+    @patch('os.path.exists')
+    @patch('src.sound_tool.cache.SampleCache.load')
+    def test_play_sink_fallback(self, mock_load, mock_exists):
+        """Test falling back to a player process when the sink fails."""
+        mock_exists.return_value = True
+        sink = MagicMock()
+        sink.write.side_effect = SinkError("broken pipe")
+        player = SoundPlayer(sink)
+
+        with patch.object(SoundPlayer, 'play_sound') as mock_play_sound:
+            player.play("test.mp3")
+
+        mock_play_sound.assert_called_once_with("test.mp3")
+
+    @patch('os.path.exists')
+    @patch('src.sound_tool.cache.SampleCache.load')
+    def test_play_through_mixer(self, mock_load, mock_exists):
+        """Test that sounds are handed to the mixer without waiting for them."""
+        mock_exists.return_value = True
+        sink = MagicMock()
+        mixer = MagicMock()
+        player = SoundPlayer(sink, mixer=mixer)
+
+        player.play("test.mp3")
+
+        mixer.add.assert_called_once_with(mock_load.return_value.trimmed.return_value, 1.0)
+        sink.write.assert_not_called()
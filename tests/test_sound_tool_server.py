@@ -28,7 +28,7 @@ class TestSoundToolServer:
         # Verify FastMCP was created with proper name and description
         mock_fastmcp.assert_called_once()
         name_arg = mock_fastmcp.call_args[1].get('name')
-        description_arg = mock_fastmcp.call_args[1].get('description')
+        description_arg = mock_fastmcp.call_args[1].get('instructions')
         
         assert name_arg == "Sound Tool 🔊"
         assert description_arg is not None
@@ -37,32 +37,26 @@ class TestSoundToolServer:
 
     @patch('os.path.expanduser')
     @patch('src.sound_tool.server.FastMCP')
-    def test_copy_sounds_to_user_dir(self, mock_fastmcp, mock_expanduser):
+    def test_copy_sounds_to_user_dir(self, mock_fastmcp, mock_expanduser, tmp_path):
         """Test copying sounds to user directory."""
         # Setup mocks
-        mock_expanduser.return_value = "/mock/home"
+        mock_expanduser.return_value = str(tmp_path)
         
-        with patch('os.path.exists') as mock_exists, \
-             patch('os.makedirs') as mock_makedirs, \
-             patch('os.listdir') as mock_listdir, \
-             patch('shutil.copy') as mock_copy:
-            
-            # Setup the server
-            server = SoundToolServer()
-            server.sounds_dir = "/mock/sounds"
-            
-            # Configure mocks for copy_sounds_to_user_dir
-            mock_listdir.return_value = ["completion.mp3", "error.mp3", "notification.mp3"]
-            
-            # Call the method
-            user_dir = server.copy_sounds_to_user_dir()
-            
-            # Verify directory was created
-            mock_makedirs.assert_called_once()
-            assert "/.config/mcp-sound-tool/sounds" in user_dir
-            
-            # Verify files were copied
-            assert mock_copy.call_count >= 1
+        # Setup the server
+        server = SoundToolServer()
+        
+        # Call the method
+        summary = server.copy_sounds_to_user_dir()
+        
+        # Verify the bundled sounds were copied
+        assert "/.config/mcp-sound-tool/sounds" in summary.target
+        assert summary.copied == 3
+        assert sorted(os.listdir(summary.target)) == ["completion.mp3", "error.mp3", "notification.mp3"]
+        
+        # Verify unchanged files are not copied again
+        summary = server.copy_sounds_to_user_dir()
+        assert summary.copied == 0
+        assert summary.skipped == 3
 
     @patch('os.path.expanduser')
     @patch('src.sound_tool.server.FastMCP')
@@ -0,0 +1,100 @@
+"""
+Tests for packed sound banks.
+"""
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.sound_tool.pcm import PCMBuffer, PCMFormat
+from src.sound_tool.sequence import write_wav
+from src.sound_tool.server import SoundPlayer
+from src.sound_tool.soundbank import ALIGNMENT, SoundBank, SoundBankError, build_bank
+
+MONO = PCMFormat(rate=1000, channels=1)
+
+
+def make_sounds(tmp_path):
+    write_wav(str(tmp_path / "completion.wav"), PCMBuffer(b"\x01\x00" * 10, MONO))
+    write_wav(str(tmp_path / "error.wav"), PCMBuffer(b"\x02\x00" * 20, MONO))
+    (tmp_path / "notification.mp3").write_bytes(b"ID3not really an mp3")
+    return tmp_path
+
+
+class TestSoundBank:
+    """Test cases for building and reading sound banks."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that decoded sounds come back as zero-copy PCM buffers."""
+        sounds = make_sounds(tmp_path)
+        bank_path = str(tmp_path / "sounds.bank")
+        entries = build_bank(str(sounds), bank_path, MONO)
+
+        bank = SoundBank(bank_path)
+        assert bank.names() == ["completion", "error", "notification"]
+        assert all(entry.offset % ALIGNMENT == 0 for entry in entries)
+
+        buffer = bank.buffer("error")
+        assert isinstance(buffer.data, memoryview)
+        assert buffer.format == MONO
+        assert bytes(buffer.data) == b"\x02\x00" * 20
+        bank.close()
+
+    def test_undecodable_sound_kept_encoded(self, tmp_path):
+        """Test that sounds without a decoder are stored and extracted as-is."""
+        sounds = make_sounds(tmp_path)
+        bank_path = str(tmp_path / "sounds.bank")
+        # Without ffmpeg or mpg123 the fake MP3 cannot be decoded
+        build_bank(str(sounds), bank_path, MONO)
+
+        bank = SoundBank(bank_path)
+        assert bank.get("notification").encoding == "mp3"
+        assert bank.buffer("notification") is None
+        path = bank.extract("notification")
+        assert path.endswith(".mp3")
+        with open(path, "rb") as f:
+            assert f.read() == b"ID3not really an mp3"
+        assert bank.extract("notification") == path
+        bank.close()
+
+    def test_invalid_file(self, tmp_path):
+        """Test that a file that is not a bank is rejected."""
+        path = tmp_path / "sounds.bank"
+        path.write_bytes(b"not a sound bank at all")
+        with pytest.raises(SoundBankError):
+            SoundBank(str(path))
+
+
+class TestSoundPlayerBank:
+    """Test cases for playing sounds from a bank."""
+
+    def test_pcm_entry_written_to_sink(self, tmp_path):
+        """Test that PCM entries go straight from the mapping to the sink."""
+        sounds = make_sounds(tmp_path)
+        bank_path = str(tmp_path / "sounds.bank")
+        build_bank(str(sounds), bank_path, MONO)
+        bank = SoundBank(bank_path)
+        sink = MagicMock(available=True, format=MONO)
+        player = SoundPlayer(sink=sink, bank=bank)
+
+        player.play("bank:completion")
+
+        buffer, stop = sink.write.call_args[0]
+        assert isinstance(buffer.data, memoryview)
+        assert isinstance(stop, threading.Event)
+        bank.close()
+
+    def test_encoded_entry_played_from_file(self, tmp_path):
+        """Test that encoded entries are extracted and played by a player process."""
+        sounds = make_sounds(tmp_path)
+        bank_path = str(tmp_path / "sounds.bank")
+        build_bank(str(sounds), bank_path, MONO)
+        bank = SoundBank(bank_path)
+        player = SoundPlayer(bank=bank)
+        player.play_sound = MagicMock()
+
+        player.play("bank:notification")
+
+        played = player.play_sound.call_args[0][0]
+        assert played == bank.extract("notification")
+        bank.close()
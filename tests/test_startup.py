@@ -0,0 +1,46 @@
+"""
+Tests for startup profiling and deferred startup work.
+"""
+import io
+from unittest.mock import patch
+
+from src.sound_tool.server import SoundToolServer
+from src.sound_tool.startup import StartupProfile
+
+
+class TestStartupProfile:
+    """Test cases for the StartupProfile class."""
+
+    def test_report_and_deferred_phases(self):
+        """Test that phases are reported, and later phases as they happen."""
+        profile = StartupProfile()
+        with profile.phase("create MCP server"):
+            pass
+        stream = io.StringIO()
+
+        profile.enable(stream)
+        with profile.phase("scan sounds directory"):
+            pass
+
+        output = stream.getvalue()
+        assert "create MCP server" in output
+        assert "total since import" in output
+        assert "scan sounds directory (deferred)" in output
+
+
+class TestDeferredStartup:
+    """Test cases for work SoundToolServer defers until first use."""
+
+    @patch('src.sound_tool.server.FastMCP')
+    def test_sounds_directory_scanned_on_first_use(self, mock_fastmcp):
+        """Test that no directory is listed until a sound is needed."""
+        with patch('os.path.exists', return_value=True), \
+             patch('os.listdir', return_value=[]) as mock_listdir, \
+             patch('src.sound_tool.backends.BackendRegistry.load_entry_points') as mock_load:
+            server = SoundToolServer()
+            assert mock_listdir.call_count == 0
+            mock_load.assert_not_called()
+
+            assert server.sounds_dir
+            assert mock_listdir.call_count > 0
+        server.close()
@@ -0,0 +1,60 @@
+"""
+Tests for the PlaybackSupervisor class.
+"""
+import subprocess
+import threading
+import time
+import pytest
+
+from src.sound_tool.supervisor import PlaybackCancelled, PlaybackSupervisor, PlaybackTimeout
+
+
+class TestPlaybackSupervisor:
+    """Test cases for the PlaybackSupervisor class."""
+
+    def test_run_to_completion(self):
+        """Test that a successful player returns normally and is untracked."""
+        supervisor = PlaybackSupervisor()
+
+        supervisor.run(["true"], timeout=5)
+
+        assert supervisor.active == 0
+
+    def test_non_zero_exit(self):
+        """Test that a failing player raises CalledProcessError."""
+        supervisor = PlaybackSupervisor()
+
+        with pytest.raises(subprocess.CalledProcessError):
+            supervisor.run(["false"], timeout=5)
+
+    def test_timeout_kills_player(self):
+        """Test that a player exceeding its duration is killed and reaped."""
+        supervisor = PlaybackSupervisor()
+        start = time.monotonic()
+
+        with pytest.raises(PlaybackTimeout):
+            supervisor.run(["sleep", "10"], timeout=0.2)
+
+        assert time.monotonic() - start < 5
+        assert supervisor.active == 0
+
+    def test_stop_all(self):
+        """Test that stop_all cancels a running player."""
+        supervisor = PlaybackSupervisor()
+        errors = []
+
+        def play():
+            try:
+                supervisor.run(["sleep", "10"], timeout=20)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=play)
+        thread.start()
+        while supervisor.active == 0:
+            time.sleep(0.01)
+        assert supervisor.stop_all() == 1
+        thread.join(5)
+
+        assert len(errors) == 1
+        assert isinstance(errors[0], PlaybackCancelled)
@@ -0,0 +1,51 @@
+"""
+Tests for tone synthesis.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.sound_tool.pcm import PCMFormat
+from src.sound_tool.synth import PRESETS, ToneSpec, render_notes, synthesize
+
+MONO = PCMFormat(rate=8000, channels=1)
+
+
+class TestSynthesize:
+    """Test cases for synthesize and render_notes."""
+
+    def test_duration_and_channels(self):
+        """Test that a note has the requested length in the requested format."""
+        buffer = synthesize(ToneSpec((440.0,), 0.25), PCMFormat(rate=8000, channels=2))
+
+        assert buffer.frames == 2000
+        samples = np.frombuffer(buffer.data, dtype="<i2").reshape(-1, 2)
+        assert (samples[:, 0] == samples[:, 1]).all()
+
+    def test_envelope_and_volume(self):
+        """Test that notes fade in from silence and stay within the volume."""
+        buffer = synthesize(ToneSpec((440.0,), 0.1, "square", volume=0.5), MONO)
+        samples = np.frombuffer(buffer.data, dtype="<i2")
+
+        assert samples[0] == 0
+        assert np.abs(samples).max() <= 0.5 * 32767 + 1
+        assert samples[-1] == 0
+
+    def test_memoized_by_parameters(self):
+        """Test that equal parameters return the same rendered buffer."""
+        spec = ToneSpec((523.25, 659.25), 0.2, "triangle", sweep=2.0)
+
+        assert synthesize(spec, MONO) is synthesize(ToneSpec((523.25, 659.25), 0.2, "triangle", sweep=2.0), MONO)
+        assert synthesize(spec, MONO) is not synthesize(ToneSpec((523.25,), 0.2), MONO)
+
+    def test_invalid_parameters(self):
+        """Test that out-of-range parameters are rejected."""
+        with pytest.raises(ValueError):
+            synthesize(ToneSpec((5.0,)), MONO)
+        with pytest.raises(ValueError):
+            synthesize(ToneSpec(waveform="noise"), MONO)
+
+    def test_presets_render(self):
+        """Test that every preset renders to a non-empty buffer."""
+        for name, specs in PRESETS.items():
+            assert render_notes(specs, MONO).frames > 0, name
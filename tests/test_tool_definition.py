@@ -0,0 +1,84 @@
+"""
+Tests for the shared tool definitions and compact tool schemas.
+"""
+import asyncio
+
+from src.sound_tool.config import SoundToolConfig
+from src.sound_tool.server import SoundToolServer, main
+from src.sound_tool.tool_definition import TOOLS, tool_schema
+
+# Most bytes all tools together may add to tools/list in compact mode
+COMPACT_BUDGET = 2500
+
+
+def list_tools(config: SoundToolConfig):
+    server = SoundToolServer(config)
+    try:
+        return {tool.name: tool for tool in asyncio.run(server.mcp.list_tools())}, server.tool_sizes()
+    finally:
+        server.close()
+
+
+class TestToolSchema:
+    """Test cases for tool_schema."""
+
+    def test_full_schema(self):
+        """Test that full schemas drop titles and describe every parameter."""
+        schema = {"title": "play_toneArguments", "type": "object", "properties": {
+            "preset": {"anyOf": [{"type": "string"}, {"type": "null"}], "default": None,
+                       "title": "Preset"},
+        }}
+
+        result = tool_schema("play_tone", schema)
+
+        preset = result["properties"]["preset"]
+        assert "title" not in result and "title" not in preset
+        assert preset["description"] == TOOLS["play_tone"].parameters["preset"]
+        assert preset["anyOf"][0]["enum"][0] == "beep"
+        assert preset["anyOf"][1] == {"type": "null"}
+
+    def test_compact_schema(self):
+        """Test that compact schemas keep only types, enums and real defaults."""
+        schema = {"type": "object", "properties": {
+            "waveform": {"default": "sine", "enum": ["sine", "square"], "title": "Waveform",
+                         "type": "string"},
+            "wait": {"anyOf": [{"type": "boolean"}, {"type": "null"}], "default": None,
+                     "title": "Wait"},
+        }}
+
+        result = tool_schema("play_tone", schema, compact=True)
+
+        assert result["properties"] == {
+            "waveform": {"default": "sine", "enum": ["sine", "square"], "type": "string"},
+            "wait": {"type": "boolean"},
+        }
+
+
+class TestCompactTools:
+    """Test cases for the compact_tools setting."""
+
+    def test_every_tool_has_a_definition(self):
+        """Test that every registered tool is described by the shared definitions."""
+        tools, _ = list_tools(SoundToolConfig(profile=True))
+
+        assert set(tools) == set(TOOLS)
+        assert all(tool.description == TOOLS[name].description() for name, tool in tools.items())
+
+    def test_compact_is_smaller(self):
+        """Test that compact mode stays within its byte budget and keeps enums."""
+        _, full_sizes = list_tools(SoundToolConfig())
+        tools, compact_sizes = list_tools(SoundToolConfig(compact_tools=True))
+
+        assert sum(compact_sizes.values()) <= COMPACT_BUDGET
+        assert all(compact_sizes[name] < full_sizes[name] for name in full_sizes)
+        sound_type = tools["play_sound"].inputSchema["properties"]["sound_type"]
+        assert sound_type["enum"] == ["completion", "error", "notification", "custom"]
+        assert "\n" not in tools["play_sound"].description
+
+    def test_tool_sizes_option(self, capsys):
+        """Test that --tool-sizes prints the size of every tool and a total."""
+        main(["--tool-sizes", "--compact-tools"])
+
+        out = capsys.readouterr().out
+        assert "play_sound" in out
+        assert out.splitlines()[-1].startswith("total")
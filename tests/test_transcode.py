@@ -0,0 +1,75 @@
+"""
+Tests for transcoded sound variants.
+"""
+from unittest.mock import MagicMock, patch
+
+from src.sound_tool.backends import Backend, BackendRegistry
+from src.sound_tool.catalog import SoundCatalog
+from src.sound_tool.pcm import DecodeError, PCMBuffer, PCMFormat
+from src.sound_tool.transcode import VariantCache, needs_variant, transcode_entries
+
+MONO = PCMFormat(rate=1000, channels=1)
+
+
+def registry_with(*commands):
+    """A registry where only the given players are installed."""
+    registry = BackendRegistry()
+    with patch("shutil.which", side_effect=lambda cmd: cmd if cmd in commands else None):
+        registry.probe()
+    return registry
+
+
+class TestNeedsVariant:
+    """Test cases for needs_variant."""
+
+    def test_mp3_with_only_aplay(self):
+        """Test that MP3 files get a variant when no MP3 player is installed."""
+        assert needs_variant("error.mp3", registry_with("aplay"), system="Linux")
+
+    def test_mp3_player_faster_than_wav_player(self):
+        """Test that no variant is made when the MP3 player beats the WAV players."""
+        registry = BackendRegistry()
+        registry.register(Backend("fastmp3", ("fastmp3",), frozenset({"mp3"}), 1))
+        with patch("shutil.which", side_effect=lambda cmd: cmd if cmd in ("aplay", "fastmp3") else None):
+            registry.probe()
+        assert not needs_variant("error.mp3", registry, system="Linux")
+
+    def test_wav_and_platforms(self):
+        """Test WAV files, Windows and macOS."""
+        registry = registry_with("aplay")
+        assert not needs_variant("error.wav", registry, system="Linux")
+        assert needs_variant("error.mp3", registry, system="Windows")
+        assert not needs_variant("error.mp3", registry, system="Darwin")
+
+
+class TestVariantCache:
+    """Test cases for the VariantCache class."""
+
+    def test_transcode_once_and_serve_from_catalog(self, tmp_path):
+        """Test that variants are made once and served by the catalog."""
+        sounds = tmp_path / "sounds"
+        sounds.mkdir()
+        (sounds / "error.mp3").write_bytes(b"fake mp3")
+        decoder = MagicMock(return_value=PCMBuffer(b"\x01\x00" * 10, MONO))
+        variants = VariantCache(str(tmp_path / "variants"), MONO, decoder)
+        catalog = SoundCatalog(str(sounds), variants=variants)
+        assert catalog.lookup("error").playable_path.endswith("error.mp3")
+
+        registry = registry_with("aplay")
+        created = transcode_entries(catalog.entries(), variants, registry, system="Linux")
+        transcode_entries(catalog.entries(), variants, registry, system="Linux")
+
+        assert decoder.call_count == 1
+        catalog.refresh(force=True)
+        entry = catalog.lookup("error")
+        assert entry.variant == created[0]
+        assert entry.playable_path == created[0]
+        assert created[0].endswith(entry.hash + ".wav")
+
+    def test_undecodable_file(self, tmp_path):
+        """Test that files that can't be decoded keep playing from the original."""
+        decoder = MagicMock(side_effect=DecodeError("no decoder"))
+        variants = VariantCache(str(tmp_path), MONO, decoder)
+
+        assert variants.ensure("error.mp3", "abc") is None
+        assert variants.lookup("abc") is None